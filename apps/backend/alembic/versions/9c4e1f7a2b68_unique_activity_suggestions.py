@@ -0,0 +1,46 @@
+"""Unique activity suggestion per user
+
+Revision ID: 9c4e1f7a2b68
+Revises: 50b8a4156bf7
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4e1f7a2b68"
+down_revision: Union[str, None] = "50b8a4156bf7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the oldest of duplicated suggestions
+    op.execute(
+        """
+        DELETE FROM activity_suggestions
+        WHERE user_id IS NOT NULL
+          AND activity_id IS NOT NULL
+          AND id NOT IN (
+            SELECT MIN(id) FROM activity_suggestions
+            WHERE user_id IS NOT NULL AND activity_id IS NOT NULL
+            GROUP BY user_id, activity_id
+          )
+        """
+    )
+    # Batch mode rebuilds the table on SQLite, which cannot add constraints
+    with op.batch_alter_table("activity_suggestions") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_activity_suggestions_user_activity", ["user_id", "activity_id"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("activity_suggestions") as batch_op:
+        batch_op.drop_constraint(
+            "uq_activity_suggestions_user_activity", type_="unique"
+        )
@@ -1,8 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from ...db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...db.database import get_db, get_session_factory
 from ...api.deps import get_current_active_user
+from ...core.cache import ResponseCache, invalidate_response_caches
 from ...models.models import User, Activity
 from ...schemas.schemas import (
     ActivityCreate,
@@ -13,9 +15,11 @@ from ...schemas.schemas import (
 
 router = APIRouter()
 
+categories_cache = ResponseCache("activity_categories", ttl=300)
+
 
 @router.get("/", response_model=List[ActivitySchema], summary="Get activities list")
-def get_activities(
+async def get_activities(
     skip: int = Query(
         0, ge=0, description="Number of activities to skip (for pagination)"
     ),
@@ -29,7 +33,7 @@ def get_activities(
         pattern="^(beginner|intermediate|advanced)$",
     ),
     published_only: bool = Query(True, description="Only show published activities"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Retrieve a paginated list of learning activities.
@@ -47,25 +51,25 @@ def get_activities(
 
     Returns an array of activity objects with complete information.
     """
-    query = db.query(Activity)
+    query = select(Activity)
 
     if published_only:
-        query = query.filter(Activity.is_published == True)
+        query = query.where(Activity.is_published == True)
 
     if category:
-        query = query.filter(Activity.category == category)
+        query = query.where(Activity.category == category)
 
     if difficulty:
-        query = query.filter(Activity.difficulty_level == difficulty)
+        query = query.where(Activity.difficulty_level == difficulty)
 
-    activities = query.offset(skip).limit(limit).all()
-    return activities
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
 
 
 @router.get(
     "/{activity_id}", response_model=ActivitySchema, summary="Get activity by ID"
 )
-def get_activity(activity_id: int, db: Session = Depends(get_db)):
+async def get_activity(activity_id: int, db: AsyncSession = Depends(get_db)):
     """
     Retrieve detailed information about a specific activity.
 
@@ -74,17 +78,17 @@ def get_activity(activity_id: int, db: Session = Depends(get_db)):
 
     - **activity_id**: The unique identifier of the activity
     """
-    activity = db.query(Activity).filter(Activity.id == activity_id).first()
+    activity = await db.get(Activity, activity_id)
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
     return activity
 
 
 @router.post("/", response_model=ActivitySchema, summary="Create new activity")
-def create_activity(
+async def create_activity(
     activity: ActivityCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Create a new learning activity.
@@ -109,19 +113,20 @@ def create_activity(
     """
     db_activity = Activity(**activity.dict(), creator_id=current_user.id)
     db.add(db_activity)
-    db.commit()
-    db.refresh(db_activity)
+    await db.commit()
+    await db.refresh(db_activity)
+    invalidate_response_caches()
     return db_activity
 
 
 @router.put("/{activity_id}", response_model=ActivitySchema)
-def update_activity(
+async def update_activity(
     activity_id: int,
     activity_update: ActivityUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    activity = db.query(Activity).filter(Activity.id == activity_id).first()
+    activity = await db.get(Activity, activity_id)
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
 
@@ -134,18 +139,19 @@ def update_activity(
     for field, value in update_data.items():
         setattr(activity, field, value)
 
-    db.commit()
-    db.refresh(activity)
+    await db.commit()
+    await db.refresh(activity)
+    invalidate_response_caches()
     return activity
 
 
 @router.delete("/{activity_id}")
-def delete_activity(
+async def delete_activity(
     activity_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    activity = db.query(Activity).filter(Activity.id == activity_id).first()
+    activity = await db.get(Activity, activity_id)
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
 
@@ -153,13 +159,16 @@ def delete_activity(
     if activity.creator_id != current_user.id and not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    db.delete(activity)
-    db.commit()
+    await db.delete(activity)
+    await db.commit()
+    invalidate_response_caches()
     return {"message": "Activity deleted successfully"}
 
 
 @router.get("/categories/", response_model=List[str], summary="Get activity categories")
-def get_activity_categories(db: Session = Depends(get_db)):
+async def get_activity_categories(
+    request: Request, session_factory=Depends(get_session_factory)
+):
     """
     Retrieve a list of all available activity categories.
 
@@ -174,6 +183,16 @@ def get_activity_categories(db: Session = Depends(get_db)):
     - environment
     - technology
     - business
+
+    The list is the same for every caller and is served from a short-lived
+    server-side cache that activity writes invalidate.
     """
-    categories = db.query(Activity.category).distinct().all()
-    return [category[0] for category in categories if category[0]]
+
+    async def render():
+        # Own session: the render is shared with concurrent requests and may
+        # outlive the session of the request that started it
+        async with session_factory() as db:
+            result = await db.execute(select(Activity.category).distinct())
+            return [category for category in result.scalars() if category]
+
+    return await categories_cache.serve(request, render)
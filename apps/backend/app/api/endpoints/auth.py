@@ -1,6 +1,8 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ...db.database import get_db
 from ...core.security import verify_password, create_access_token, get_password_hash
 from ...models.models import User
@@ -12,7 +14,7 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserSchema, summary="Register a new user")
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new user account.
 
@@ -28,18 +30,19 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     Returns the created user information (without password).
     """
     # Check if user already exists
-    db_user = (
-        db.query(User)
-        .filter((User.email == user.email) | (User.username == user.username))
-        .first()
+    result = await db.execute(
+        select(User).where(
+            (User.email == user.email) | (User.username == user.username)
+        )
     )
+    db_user = result.scalars().first()
     if db_user:
         raise HTTPException(
             status_code=400, detail="Email or username already registered"
         )
 
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+    # Create new user; bcrypt is slow on purpose, keep it off the event loop
+    hashed_password = await run_in_threadpool(get_password_hash, user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -48,13 +51,13 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         is_active=user.is_active,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
 @router.post("/login", response_model=Token, summary="Login user")
-def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """
     Authenticate user and return JWT access token.
 
@@ -71,8 +74,13 @@ def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
     The token should be included in the Authorization header as:
     `Authorization: Bearer <access_token>`
     """
-    user = db.query(User).filter(User.username == user_credentials.username).first()
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    result = await db.execute(
+        select(User).where(User.username == user_credentials.username)
+    )
+    user = result.scalars().first()
+    if not user or not await run_in_threadpool(
+        verify_password, user_credentials.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
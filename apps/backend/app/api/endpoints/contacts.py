@@ -80,7 +80,7 @@ class ContactResponse(BaseModel):
 
 
 @router.post("/", response_model=ContactResponse, summary="Submit contact form")
-def create_contact(contact_data: ContactCreate):
+async def create_contact(contact_data: ContactCreate):
     """
     Submit a new contact form (public endpoint).
 
@@ -113,7 +113,7 @@ def create_contact(contact_data: ContactCreate):
 
 
 @router.get("/types", response_model=List[str], summary="Get contact types")
-def get_contact_types():
+async def get_contact_types():
     """
     Get available contact form types.
 
@@ -1,23 +1,88 @@
 from typing import List, Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from ...db.database import get_db
 from ...api.deps import get_current_active_user
 from ...models.models import User, Activity, ActivitySuggestion
 from ...schemas.schemas import ActivitySuggestion as ActivitySuggestionSchema
 from ...core.config import settings
+from ...services.ai_client import ai_client
+from ...services.prompt_builder import completion_budget, count_tokens, pack_activities
+from ...services.suggestion_store import insert_suggestions, supports_returning
 
 
 router = APIRouter()
 
+# Upper bound of the "3-5 activities" asked for in the prompt
+MAX_RECOMMENDATIONS = 5
+
+
+async def store_suggestions(
+    db: AsyncSession, user_id: int, rows: List[dict]
+) -> List[ActivitySuggestion]:
+    """
+    Store the suggestions not made to the user yet, in a fixed number of
+    queries whatever the number of rows on databases supporting RETURNING.
+
+    Returns:
+        The stored suggestions, with their activities loaded
+    """
+    if not rows:
+        return []
+
+    result = await db.execute(
+        select(ActivitySuggestion.activity_id).where(
+            ActivitySuggestion.user_id == user_id,
+            ActivitySuggestion.activity_id.in_([row["activity_id"] for row in rows]),
+        )
+    )
+    existing = set(result.scalars())
+    new_rows = {}
+    for row in rows:
+        if row["activity_id"] not in existing:
+            new_rows.setdefault(row["activity_id"], row)
+    if not new_rows:
+        return []
+
+    # Concurrent requests may store the same suggestions: the insert skips
+    # them, and only the rows it wrote are returned
+    if supports_returning(db):
+        result = await db.execute(
+            insert_suggestions(db, list(new_rows.values())).returning(
+                ActivitySuggestion.id
+            )
+        )
+        stored_ids = list(result.scalars())
+    else:
+        # Without RETURNING, the rows this call wrote can only be told apart
+        # from concurrent ones by inserting them one at a time (SQLite)
+        stored_ids = []
+        for row in new_rows.values():
+            result = await db.execute(insert_suggestions(db, [row]))
+            if result.rowcount:
+                stored_ids.append(result.lastrowid)
+    await db.commit()
+
+    result = await db.execute(
+        select(ActivitySuggestion)
+        .options(joinedload(ActivitySuggestion.activity))
+        .where(ActivitySuggestion.id.in_(stored_ids))
+        .order_by(ActivitySuggestion.id)
+    )
+    return result.scalars().all()
+
 
 @router.get(
     "/",
     response_model=List[ActivitySuggestionSchema],
     summary="Get user activity suggestions",
 )
-def get_user_suggestions(
-    current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+async def get_user_suggestions(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get personalized activity suggestions for the current user.
@@ -32,14 +97,14 @@ def get_user_suggestions(
     Each suggestion includes the recommended activity details and
     the reason why it was suggested.
     """
-    suggestions = (
-        db.query(ActivitySuggestion)
-        .filter(ActivitySuggestion.user_id == current_user.id)
+    result = await db.execute(
+        select(ActivitySuggestion)
+        .options(joinedload(ActivitySuggestion.activity))
+        .where(ActivitySuggestion.user_id == current_user.id)
         .order_by(ActivitySuggestion.created_at.desc())
         .limit(10)
-        .all()
     )
-    return suggestions
+    return result.scalars().all()
 
 
 @router.post(
@@ -47,12 +112,12 @@ def get_user_suggestions(
     response_model=List[ActivitySuggestionSchema],
     summary="Generate new AI suggestions",
 )
-def generate_ai_suggestions(
+async def generate_ai_suggestions(
     preferences: Optional[str] = Query(
         None, description="User preferences or interests to guide suggestions"
     ),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Generate new personalized activity suggestions using AI.
@@ -81,55 +146,42 @@ def generate_ai_suggestions(
     """
     if not settings.OPENAI_API_KEY:
         # Return simple suggestions based on available activities when OpenAI is not configured
-        available_activities = (
-            db.query(Activity)
-            .filter(
+        result = await db.execute(
+            select(Activity)
+            .where(
                 Activity.is_published == True, Activity.creator_id != current_user.id
             )
             .limit(3)
-            .all()
         )
+        available_activities = result.scalars().all()
 
-        suggestions = []
-        for activity in available_activities:
-            # Check if suggestion already exists
-            existing = (
-                db.query(ActivitySuggestion)
-                .filter(
-                    ActivitySuggestion.user_id == current_user.id,
-                    ActivitySuggestion.activity_id == activity.id,
-                )
-                .first()
-            )
-
-            if not existing:
-                suggestion = ActivitySuggestion(
-                    user_id=current_user.id,
-                    activity_id=activity.id,
-                    suggestion_reason="Recommended based on your profile and interests",
-                    ai_generated=False,
-                )
-                db.add(suggestion)
-                suggestions.append(suggestion)
-
-        db.commit()
-        for suggestion in suggestions:
-            db.refresh(suggestion)
-
-        return suggestions
+        return await store_suggestions(
+            db,
+            current_user.id,
+            [
+                {
+                    "user_id": current_user.id,
+                    "activity_id": activity.id,
+                    "suggestion_reason": "Recommended based on your profile and interests",
+                    "ai_generated": False,
+                }
+                for activity in available_activities
+            ],
+        )
 
     # Get user's existing activities to avoid suggestions
-    user_activities = (
-        db.query(Activity).filter(Activity.creator_id == current_user.id).all()
+    result = await db.execute(
+        select(Activity.title).where(Activity.creator_id == current_user.id)
     )
-    user_activity_titles = [activity.title for activity in user_activities]
+    user_activity_titles = list(result.scalars())
 
     # Get all available activities for suggestions
-    available_activities = (
-        db.query(Activity)
-        .filter(Activity.is_published == True, Activity.creator_id != current_user.id)
-        .all()
+    result = await db.execute(
+        select(Activity).where(
+            Activity.is_published == True, Activity.creator_id != current_user.id
+        )
     )
+    available_activities = result.scalars().all()
 
     if not available_activities:
         raise HTTPException(
@@ -137,33 +189,20 @@ def generate_ai_suggestions(
         )
 
     try:
-        # Import OpenAI here to avoid import errors when not available
-        import openai
-
-        openai.api_key = settings.OPENAI_API_KEY
-
         # Create prompt for OpenAI
         user_context = f"User: {current_user.full_name or current_user.username}"
         if user_activity_titles:
             user_context += f"\nUser has already created these activities: {', '.join(user_activity_titles)}"
 
-        activity_list = "\n".join(
-            [
-                f"- {activity.title} ({activity.category}, {activity.difficulty_level}): {activity.description[:100]}..."
-                for activity in available_activities[
-                    :20
-                ]  # Limit to first 20 activities
-            ]
-        )
-
         preferences_text = f"\nUser preferences: {preferences}" if preferences else ""
 
-        prompt = f"""
+        prompt_head = f"""
         {user_context}
         {preferences_text}
         
         Available activities for recommendation:
-        {activity_list}
+        """
+        prompt_tail = f"""
         
         Based on the user's profile and preferences, recommend 3-5 activities from the list above.
         For each recommendation, provide a brief reason why this activity would be suitable.
@@ -175,9 +214,16 @@ def generate_ai_suggestions(
         ]
         """
 
-        # Call OpenAI API
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
+        # List as many activities as fit the rest of the token budget
+        activity_list, _ = pack_activities(
+            available_activities,
+            settings.OPENAI_PROMPT_TOKEN_BUDGET
+            - count_tokens(prompt_head)
+            - count_tokens(prompt_tail),
+        )
+        prompt = prompt_head + activity_list + prompt_tail
+
+        ai_response = await ai_client.chat_completion(
             messages=[
                 {
                     "role": "system",
@@ -185,55 +231,35 @@ def generate_ai_suggestions(
                 },
                 {"role": "user", "content": prompt},
             ],
-            max_tokens=500,
+            max_tokens=completion_budget(MAX_RECOMMENDATIONS, 500),
             temperature=0.7,
         )
 
         # Parse OpenAI response
         import json
 
-        ai_response = response.choices[0].message.content
         recommendations = json.loads(ai_response)
 
-        # Create suggestions in database
-        suggestions = []
+        # Find the recommended activities by title, the first one listed
+        # winning on duplicate titles
+        activities_by_title = {
+            activity.title: activity for activity in reversed(available_activities)
+        }
+        rows = []
         for rec in recommendations:
-            # Find the activity by title
-            activity = next(
-                (a for a in available_activities if a.title == rec["activity_title"]),
-                None,
-            )
+            activity = activities_by_title.get(rec["activity_title"])
             if activity:
-                # Check if suggestion already exists
-                existing = (
-                    db.query(ActivitySuggestion)
-                    .filter(
-                        ActivitySuggestion.user_id == current_user.id,
-                        ActivitySuggestion.activity_id == activity.id,
-                    )
-                    .first()
+                rows.append(
+                    {
+                        "user_id": current_user.id,
+                        "activity_id": activity.id,
+                        "suggestion_reason": rec["reason"],
+                        "ai_generated": True,
+                    }
                 )
 
-                if not existing:
-                    suggestion = ActivitySuggestion(
-                        user_id=current_user.id,
-                        activity_id=activity.id,
-                        suggestion_reason=rec["reason"],
-                        ai_generated=True,
-                    )
-                    db.add(suggestion)
-                    suggestions.append(suggestion)
-
-        db.commit()
-
-        # Refresh suggestions to get relationships
-        for suggestion in suggestions:
-            db.refresh(suggestion)
-
-        return suggestions
+        return await store_suggestions(db, current_user.id, rows)
 
-    except ImportError:
-        raise HTTPException(status_code=500, detail="OpenAI integration not available")
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to generate AI suggestions: {str(e)}"
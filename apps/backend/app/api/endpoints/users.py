@@ -1,6 +1,7 @@
 from typing import List
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ...db.database import get_db
 from ...api.deps import get_current_active_user
 from ...models.models import User
@@ -11,7 +12,9 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=UserSchema, summary="Get current user profile")
-def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_profile(
+    current_user: User = Depends(get_current_active_user),
+):
     """
     Get the profile information for the currently authenticated user.
 
@@ -25,13 +28,13 @@ def get_current_user_profile(current_user: User = Depends(get_current_active_use
 
 
 @router.get("/", response_model=List[UserSchema], summary="List users")
-def get_users(
+async def get_users(
     skip: int = Query(0, ge=0, description="Number of users to skip"),
     limit: int = Query(
         100, ge=1, le=100, description="Maximum number of users to return"
     ),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     List users in the system.
@@ -50,5 +53,5 @@ def get_users(
     if not current_user.is_superuser:
         return [current_user]
 
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    result = await db.execute(select(User).offset(skip).limit(limit))
+    return result.scalars().all()
@@ -0,0 +1,103 @@
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from common.single_flight import SingleFlight
+from fastapi import Request, Response
+from monitoring.metrics import RESPONSE_CACHE_EVENTS
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    expires_at: float
+    stale_until: float
+
+
+class ResponseCache:
+    """
+    TTL cache of encoded JSON responses for one route.
+
+    Same policy as the API's ``services/response_cache.py``, on the same
+    ``SingleFlight``: when an entry expires one request rebuilds it while
+    concurrent requests are served the stale body (within ``stale_ttl``) or
+    wait for the rebuild. A cancelled request does not abort a rebuild the
+    others wait for. Past ``max_entries`` the oldest entries are evicted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+        max_entries: int = 1024,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = ttl if stale_ttl is None else stale_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, CachedResponse] = {}
+        self._flight = SingleFlight()
+        self._generation = 0
+        _caches.append(self)
+
+    async def serve(
+        self, request: Request, render: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """Serve a request from the cache, awaiting ``render`` on a miss."""
+        query = sorted(request.query_params.multi_items())
+        key = request.url.path + "?" + "&".join(f"{k}={v}" for k, v in query)
+        generation = self._generation
+        flight_key = (generation, key)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.expires_at:
+            result = "hit"
+        elif (
+            entry is not None
+            and now < entry.stale_until
+            and self._flight.in_flight(flight_key)
+        ):
+            result = "stale"
+        else:
+            result = "miss"
+            entry = await self._flight.do(
+                flight_key, lambda: self._fill(key, generation, render)
+            )
+
+        RESPONSE_CACHE_EVENTS.labels(cache=self.name, result=result).inc()
+        return Response(content=entry.body, media_type="application/json")
+
+    async def _fill(
+        self, key: str, generation: int, render: Callable[[], Awaitable[Any]]
+    ) -> CachedResponse:
+        body = json.dumps(await render()).encode()
+        now = time.monotonic()
+        entry = CachedResponse(
+            body=body,
+            expires_at=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+        )
+        # Not stored if an activity write invalidated the cache meanwhile
+        if generation == self._generation:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order: evict the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+        self._generation += 1
+
+
+_caches: List[ResponseCache] = []
+
+
+def invalidate_response_caches():
+    """Clear all response caches after an activity write."""
+    for cache in _caches:
+        cache.clear()
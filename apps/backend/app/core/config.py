@@ -2,6 +2,13 @@ from pydantic_settings import BaseSettings
 from typing import Optional
 
 
+# Database URL schemes and their asyncio drivers
+ASYNC_SCHEMES = {
+    "postgresql://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
 class Settings(BaseSettings):
     # API
     API_V1_STR: str = "/api/v1"
@@ -24,6 +31,16 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    OPENAI_PROMPT_TOKEN_BUDGET: int = 1200
+    OPENAI_TIMEOUT_SECONDS: float = 30.0  # Per call, retries included
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_MAX_CONCURRENCY: int = 8
+    OPENAI_MAX_CONNECTIONS: int = 20
+    OPENAI_MAX_RETRIES: int = 2
+
+    # Suggestions
+    SUGGESTION_BATCH_HOUR: Optional[int] = 3  # Local hour; None disables it
 
     # CORS
     ALLOWED_HOSTS: list[str] = ["*"]
@@ -37,5 +54,14 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def async_database_url(self) -> str:
+        """``database_url`` with the asyncio driver of its database."""
+        url = self.database_url
+        for scheme, async_scheme in ASYNC_SCHEMES.items():
+            if url.startswith(scheme):
+                return async_scheme + url[len(scheme) :]
+        return url
+
 
 settings = Settings()
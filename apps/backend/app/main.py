@@ -1,10 +1,15 @@
+import asyncio
 import json
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from .api.api import api_router
 from .core.config import settings
+from .db.database import engine
+from .services.ai_client import ai_client
+from .services.suggestion_batch import suggestion_batch_loop
 
 
 def load_custom_openapi():
@@ -19,6 +24,23 @@ def load_custom_openapi():
         return None
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    batch = None
+    if settings.SUGGESTION_BATCH_HOUR is not None:
+        # Nightly suggestion precompute
+        batch = asyncio.create_task(
+            suggestion_batch_loop(settings.SUGGESTION_BATCH_HOUR)
+        )
+    yield
+    if batch is not None:
+        batch.cancel()
+        await asyncio.gather(batch, return_exceptions=True)
+    # Close the pooled OpenAI and database connections
+    await ai_client.close()
+    await engine.dispose()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
@@ -27,6 +49,7 @@ def create_app() -> FastAPI:
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
         swagger_ui_parameters={
             "deepLinking": True,
             "displayRequestDuration": True,
@@ -106,7 +129,7 @@ def create_app() -> FastAPI:
     app.openapi = custom_openapi
 
     @app.get("/")
-    def root():
+    async def root():
         return {
             "message": "Welcome to LaVidaLuca Backend API",
             "version": settings.VERSION,
@@ -114,7 +137,7 @@ def create_app() -> FastAPI:
         }
 
     @app.get("/health")
-    def health_check():
+    async def health_check():
         return {"status": "healthy", "service": "lavidaluca-backend"}
 
     return app
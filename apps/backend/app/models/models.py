@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Text,
+    Boolean,
+    ForeignKey,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..db.database import Base
@@ -48,6 +57,12 @@ class Activity(Base):
 
 class ActivitySuggestion(Base):
     __tablename__ = "activity_suggestions"
+    __table_args__ = (
+        # One suggestion per user and activity; batch writes rely on it
+        UniqueConstraint(
+            "user_id", "activity_id", name="uq_activity_suggestions_user_activity"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -0,0 +1,16 @@
+from common.openai_client import AIServiceUnavailable, OpenAIClient
+
+from ..core.config import settings
+
+
+# Same client as the API, built from this stack's settings. No circuit
+# breaker: these endpoints check the API key and report failures themselves.
+ai_client = OpenAIClient(
+    api_key=settings.OPENAI_API_KEY,
+    model=settings.OPENAI_MODEL,
+    timeout_seconds=settings.OPENAI_TIMEOUT_SECONDS,
+    connect_timeout_seconds=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+    max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+    max_retries=settings.OPENAI_MAX_RETRIES,
+)
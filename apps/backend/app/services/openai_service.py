@@ -1,13 +1,9 @@
 from typing import Optional
-import openai
 from ..core.config import settings
+from .ai_client import ai_client
 
 
 class OpenAIService:
-    def __init__(self):
-        if settings.OPENAI_API_KEY:
-            openai.api_key = settings.OPENAI_API_KEY
-
     async def generate_activity_suggestions(
         self,
         user_profile: str,
@@ -47,8 +43,7 @@ class OpenAIService:
         """
 
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            content = await ai_client.chat_completion(
                 messages=[
                     {
                         "role": "system",
@@ -60,7 +55,7 @@ class OpenAIService:
                 temperature=0.7,
             )
 
-            return response.choices[0].message.content
+            return content
 
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
@@ -84,8 +79,7 @@ class OpenAIService:
         """
 
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            content = await ai_client.chat_completion(
                 messages=[
                     {
                         "role": "system",
@@ -97,7 +91,7 @@ class OpenAIService:
                 temperature=0.6,
             )
 
-            return response.choices[0].message.content.strip()
+            return content.strip()
 
         except Exception as e:
             return f"Failed to generate description: {str(e)}"
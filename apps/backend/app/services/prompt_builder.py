@@ -0,0 +1,56 @@
+from typing import List, Sequence, Tuple
+
+from common.prompt_fragments import FragmentCache
+from common.prompt_fragments import completion_budget as _completion_budget
+from common.prompt_fragments import count_tokens
+
+from ..models.models import Activity
+
+
+# Completion budget: one title and reason per suggestion
+RESPONSE_TOKENS_PER_SUGGESTION = 60
+
+
+def completion_budget(max_suggestions: int, limit: int) -> int:
+    """Get the ``max_tokens`` needed for a number of recommendations."""
+    return _completion_budget(max_suggestions, limit, RESPONSE_TOKENS_PER_SUGGESTION)
+
+
+_fragments = FragmentCache()
+
+
+def activity_fragment(activity: Activity) -> Tuple[str, int]:
+    """
+    Get the prompt line of an activity and its token count, cached per
+    activity ID and ``updated_at``.
+    """
+    updated_at = activity.updated_at.isoformat() if activity.updated_at else None
+
+    def render() -> str:
+        return (
+            f"- {activity.title} ({activity.category}, {activity.difficulty_level}): "
+            f"{(activity.description or '')[:100]}..."
+        )
+
+    return _fragments.get((activity.id, updated_at), render)
+
+
+def pack_activities(
+    activities: Sequence[Activity], token_budget: int
+) -> Tuple[str, List[Activity]]:
+    """
+    List activities, in order, until the token budget is spent.
+
+    Returns:
+        The activity lines, and the activities they list (at least one)
+    """
+    lines = []
+    packed = []
+    for activity in activities:
+        fragment, tokens = activity_fragment(activity)
+        if tokens > token_budget and packed:
+            break
+        token_budget -= tokens
+        packed.append(activity)
+        lines.append(fragment)
+    return "\n".join(lines), packed
@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import heapq
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db.database import SessionLocal
+from ..models.models import Activity, User
+from .suggestion_store import insert_suggestions
+
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+SUGGESTIONS_PER_USER = 5
+
+CATEGORY_POINTS = 2
+DIFFICULTY_POINTS = 1
+
+CATEGORY_REASON = "Matches the categories of activities you created"
+DIFFICULTY_REASON = "Matches the difficulty level you usually work at"
+DEFAULT_REASON = "Recently published activity"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    id: int
+    category: str
+    difficulty_level: Optional[str]
+    creator_id: Optional[int]
+
+
+@dataclass
+class AuthorProfile:
+    categories: set
+    difficulty_level: Optional[str]
+
+
+async def precompute_suggestions(
+    db: AsyncSession,
+    chunk_size: int = CHUNK_SIZE,
+    per_user: int = SUGGESTIONS_PER_USER,
+) -> int:
+    """
+    Precompute suggestions for every active user, without model calls.
+
+    Users are walked in chunks of ``chunk_size`` and each chunk is written
+    with one bulk ``INSERT ... ON CONFLICT DO NOTHING``: existing
+    suggestions are kept, so the batch can be rerun safely.
+
+    Returns:
+        Number of suggestions written
+    """
+    catalog = await _load_catalog(db)
+    if not catalog:
+        return 0
+
+    written = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(User.id)
+            .where(User.is_active == True, User.id > last_id)
+            .order_by(User.id)
+            .limit(chunk_size)
+        )
+        user_ids = list(result.scalars())
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        profiles = await _author_profiles(db, user_ids)
+        # Scoring a chunk against the whole catalog is CPU-bound: keep it off
+        # the event loop
+        rows = await asyncio.to_thread(
+            _score_chunk, user_ids, profiles, catalog, per_user
+        )
+        if rows:
+            result = await db.execute(insert_suggestions(db, rows))
+            written += max(result.rowcount, 0)
+        await db.commit()
+
+    return written
+
+
+async def _load_catalog(db: AsyncSession) -> List[CatalogEntry]:
+    """Load the published activities, most recent first."""
+    result = await db.execute(
+        select(
+            Activity.id,
+            Activity.category,
+            Activity.difficulty_level,
+            Activity.creator_id,
+        )
+        .where(Activity.is_published == True)
+        .order_by(Activity.created_at.desc(), Activity.id.desc())
+    )
+    return [CatalogEntry(*row) for row in result]
+
+
+async def _author_profiles(
+    db: AsyncSession, user_ids: List[int]
+) -> Dict[int, AuthorProfile]:
+    """Summarize what each user created."""
+    categories = defaultdict(set)
+    difficulties = defaultdict(Counter)
+    result = await db.execute(
+        select(Activity.creator_id, Activity.category, Activity.difficulty_level).where(
+            Activity.creator_id.in_(user_ids)
+        )
+    )
+    for creator_id, category, difficulty_level in result:
+        categories[creator_id].add(category)
+        if difficulty_level:
+            difficulties[creator_id][difficulty_level] += 1
+
+    return {
+        user_id: AuthorProfile(
+            categories=categories[user_id],
+            difficulty_level=(
+                difficulties[user_id].most_common(1)[0][0]
+                if difficulties[user_id]
+                else None
+            ),
+        )
+        for user_id in categories
+    }
+
+
+def _score_chunk(
+    user_ids: List[int],
+    profiles: Dict[int, AuthorProfile],
+    catalog: Sequence[CatalogEntry],
+    per_user: int,
+) -> List[dict]:
+    return [
+        row
+        for user_id in user_ids
+        for row in _score_user(user_id, profiles.get(user_id), catalog, per_user)
+    ]
+
+
+def _score_user(
+    user_id: int,
+    profile: Optional[AuthorProfile],
+    catalog: Sequence[CatalogEntry],
+    per_user: int,
+) -> List[dict]:
+    """
+    Pick a user's best activities, as suggestion rows.
+
+    Activities in the categories and at the difficulty of what the user
+    created rank first; ties keep catalog order, most recent first. The
+    user's own activities are never suggested.
+    """
+    scored = []
+    for position, entry in enumerate(catalog):
+        if entry.creator_id == user_id:
+            continue
+        points = 0
+        reasons = []
+        if profile is not None and entry.category in profile.categories:
+            points += CATEGORY_POINTS
+            reasons.append(CATEGORY_REASON)
+        if (
+            profile is not None
+            and profile.difficulty_level
+            and entry.difficulty_level == profile.difficulty_level
+        ):
+            points += DIFFICULTY_POINTS
+            reasons.append(DIFFICULTY_REASON)
+        scored.append((-points, position, entry, reasons))
+
+    # Only the best few are kept: no need to sort the whole catalog
+    best = heapq.nsmallest(per_user, scored, key=lambda item: item[:2])
+    return [
+        {
+            "user_id": user_id,
+            "activity_id": entry.id,
+            "suggestion_reason": "; ".join(reasons) or DEFAULT_REASON,
+            "ai_generated": False,
+        }
+        for _, _, entry, reasons in best
+    ]
+
+
+async def run_batch(
+    chunk_size: int = CHUNK_SIZE, per_user: int = SUGGESTIONS_PER_USER
+) -> int:
+    """Run the batch in its own session."""
+    async with SessionLocal() as db:
+        written = await precompute_suggestions(db, chunk_size, per_user)
+    logger.info(f"Precomputed {written} activity suggestions")
+    return written
+
+
+def seconds_until(hour: int, now: Optional[datetime] = None) -> float:
+    """Get the delay until the next occurrence of an hour of the day."""
+    now = now or datetime.now()
+    run_at = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return (run_at - now).total_seconds()
+
+
+async def suggestion_batch_loop(hour: int):
+    """Run the batch every day at an hour."""
+    while True:
+        await asyncio.sleep(seconds_until(hour))
+        try:
+            await run_batch()
+        except Exception as e:
+            logger.warning(f"Suggestion batch failed: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute activity suggestions")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--per-user", type=int, default=SUGGESTIONS_PER_USER)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_batch(args.chunk_size, args.per_user))
@@ -0,0 +1,27 @@
+from typing import List
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.models import ActivitySuggestion
+
+
+def insert_suggestions(db: AsyncSession, rows: List[dict]):
+    """
+    Build one bulk insert of suggestion rows that skips the (user, activity)
+    pairs already suggested, relying on their unique constraint.
+    """
+    if db.bind.dialect.name == "sqlite":
+        insert = sqlite.insert
+    else:
+        insert = postgresql.insert
+    return (
+        insert(ActivitySuggestion)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["user_id", "activity_id"])
+    )
+
+
+def supports_returning(db: AsyncSession) -> bool:
+    """Whether the database can return the rows an insert wrote."""
+    return db.bind.dialect.full_returning
@@ -1,62 +1,75 @@
+import asyncio
+
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-import tempfile
-import os
 
 from app.main import app
-from app.db.database import get_db, Base
+from app.db.database import get_db, get_session_factory, Base
+from app.core.cache import invalidate_response_caches
 
 
-# Use in-memory SQLite for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# Use a SQLite file for testing
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = sessionmaker(
+    engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
+@pytest.fixture(scope="session")
+def event_loop():
+    # The engine's connections belong to one loop for the whole session
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
 
 
-@pytest.fixture(scope="session", autouse=True)
-def setup_test_db():
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def setup_test_db():
     # Create tables
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
     yield
     # Drop tables
-    Base.metadata.drop_all(bind=engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_response_caches():
+    # Tests remove their data behind the API's back
+    invalidate_response_caches()
+    yield
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+@pytest_asyncio.fixture(scope="function")
+async def db_session():
+    session = TestingSessionLocal()
 
     # Override the dependency
     app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
     yield session
 
-    # Cleanup
-    session.close()
-    transaction.rollback()
-    connection.close()
+    # Cleanup: endpoints commit, so the rows are deleted rather than rolled back
+    await session.close()
+    async with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            await connection.execute(table.delete())
 
     # Remove override
     if get_db in app.dependency_overrides:
         del app.dependency_overrides[get_db]
+    app.dependency_overrides.pop(get_session_factory, None)
 
 
-@pytest.fixture(scope="function")
-def client(db_session):
-    with TestClient(app) as test_client:
+@pytest_asyncio.fixture(scope="function")
+async def client(db_session):
+    async with AsyncClient(app=app, base_url="http://test") as test_client:
         yield test_client
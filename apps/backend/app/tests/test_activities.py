@@ -1,12 +1,13 @@
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import User, Activity
 from app.core.security import get_password_hash, create_access_token
 
 
-@pytest.fixture
-def authenticated_user(db_session: Session):
+@pytest_asyncio.fixture
+async def authenticated_user(db_session: AsyncSession):
     password = "testpassword"
     hashed_password = get_password_hash(password)
     user = User(
@@ -16,8 +17,8 @@ def authenticated_user(db_session: Session):
         full_name="Test User",
     )
     db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+    await db_session.commit()
+    await db_session.refresh(user)
     return user
 
 
@@ -27,8 +28,8 @@ def auth_headers(authenticated_user):
     return {"Authorization": f"Bearer {token}"}
 
 
-@pytest.fixture
-def sample_activity(db_session: Session, authenticated_user):
+@pytest_asyncio.fixture
+async def sample_activity(db_session: AsyncSession, authenticated_user):
     activity = Activity(
         title="Test Activity",
         description="A test activity for farming",
@@ -42,34 +43,38 @@ def sample_activity(db_session: Session, authenticated_user):
         creator_id=authenticated_user.id,
     )
     db_session.add(activity)
-    db_session.commit()
-    db_session.refresh(activity)
+    await db_session.commit()
+    await db_session.refresh(activity)
     return activity
 
 
-def test_get_activities(client: TestClient, sample_activity):
-    response = client.get("/api/v1/activities/")
+@pytest.mark.asyncio
+async def test_get_activities(client: AsyncClient, sample_activity):
+    response = await client.get("/api/v1/activities/")
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 1
     assert data[0]["title"] == "Test Activity"
 
 
-def test_get_activity_by_id(client: TestClient, sample_activity):
-    response = client.get(f"/api/v1/activities/{sample_activity.id}")
+@pytest.mark.asyncio
+async def test_get_activity_by_id(client: AsyncClient, sample_activity):
+    response = await client.get(f"/api/v1/activities/{sample_activity.id}")
     assert response.status_code == 200
     data = response.json()
     assert data["title"] == sample_activity.title
     assert data["id"] == sample_activity.id
 
 
-def test_get_activity_not_found(client: TestClient):
-    response = client.get("/api/v1/activities/999")
+@pytest.mark.asyncio
+async def test_get_activity_not_found(client: AsyncClient):
+    response = await client.get("/api/v1/activities/999")
     assert response.status_code == 404
     assert "Activity not found" in response.json()["detail"]
 
 
-def test_create_activity(client: TestClient, auth_headers):
+@pytest.mark.asyncio
+async def test_create_activity(client: AsyncClient, auth_headers):
     activity_data = {
         "title": "New Activity",
         "description": "A new test activity",
@@ -81,7 +86,7 @@ def test_create_activity(client: TestClient, auth_headers):
         "learning_objectives": "Learn animal care",
         "is_published": True,
     }
-    response = client.post(
+    response = await client.post(
         "/api/v1/activities/", json=activity_data, headers=auth_headers
     )
     assert response.status_code == 200
@@ -90,18 +95,20 @@ def test_create_activity(client: TestClient, auth_headers):
     assert data["category"] == activity_data["category"]
 
 
-def test_create_activity_unauthorized(client: TestClient):
+@pytest.mark.asyncio
+async def test_create_activity_unauthorized(client: AsyncClient):
     activity_data = {"title": "Unauthorized Activity", "category": "Test"}
-    response = client.post("/api/v1/activities/", json=activity_data)
+    response = await client.post("/api/v1/activities/", json=activity_data)
     assert response.status_code == 403
 
 
-def test_update_activity(client: TestClient, sample_activity, auth_headers):
+@pytest.mark.asyncio
+async def test_update_activity(client: AsyncClient, sample_activity, auth_headers):
     update_data = {
         "title": "Updated Activity Title",
         "description": "Updated description",
     }
-    response = client.put(
+    response = await client.put(
         f"/api/v1/activities/{sample_activity.id}",
         json=update_data,
         headers=auth_headers,
@@ -112,7 +119,10 @@ def test_update_activity(client: TestClient, sample_activity, auth_headers):
     assert data["description"] == update_data["description"]
 
 
-def test_update_activity_not_owner(client: TestClient, sample_activity, db_session):
+@pytest.mark.asyncio
+async def test_update_activity_not_owner(
+    client: AsyncClient, sample_activity, db_session
+):
     # Create another user
     other_user = User(
         email="other@example.com",
@@ -120,48 +130,78 @@ def test_update_activity_not_owner(client: TestClient, sample_activity, db_sessi
         hashed_password=get_password_hash("password"),
     )
     db_session.add(other_user)
-    db_session.commit()
+    await db_session.commit()
 
     # Get token for other user
     token = create_access_token(subject=other_user.id)
     headers = {"Authorization": f"Bearer {token}"}
 
     update_data = {"title": "Unauthorized Update"}
-    response = client.put(
+    response = await client.put(
         f"/api/v1/activities/{sample_activity.id}", json=update_data, headers=headers
     )
     assert response.status_code == 403
 
 
-def test_delete_activity(client: TestClient, sample_activity, auth_headers):
-    response = client.delete(
+@pytest.mark.asyncio
+async def test_delete_activity(client: AsyncClient, sample_activity, auth_headers):
+    response = await client.delete(
         f"/api/v1/activities/{sample_activity.id}", headers=auth_headers
     )
     assert response.status_code == 200
     assert "deleted successfully" in response.json()["message"]
 
     # Verify activity is deleted
-    response = client.get(f"/api/v1/activities/{sample_activity.id}")
+    response = await client.get(f"/api/v1/activities/{sample_activity.id}")
     assert response.status_code == 404
 
 
-def test_get_activity_categories(client: TestClient, sample_activity):
-    response = client.get("/api/v1/activities/categories/")
+@pytest.mark.asyncio
+async def test_get_activity_categories(client: AsyncClient, sample_activity):
+    response = await client.get("/api/v1/activities/categories/")
     assert response.status_code == 200
     data = response.json()
     assert "Agriculture" in data
 
 
-def test_filter_activities_by_category(client: TestClient, sample_activity):
-    response = client.get("/api/v1/activities/?category=Agriculture")
+@pytest.mark.asyncio
+async def test_activity_categories_cached_until_write(
+    client: AsyncClient, sample_activity, auth_headers, db_session: AsyncSession
+):
+    assert (await client.get("/api/v1/activities/categories/")).json() == [
+        "Agriculture"
+    ]
+
+    # Rows written outside the API are not seen until the cache is invalidated
+    db_session.add(Activity(title="Hidden", category="Forestry", is_published=True))
+    await db_session.commit()
+    assert (await client.get("/api/v1/activities/categories/")).json() == [
+        "Agriculture"
+    ]
+
+    # Writes through the API invalidate the cache
+    response = await client.post(
+        "/api/v1/activities/",
+        json={"title": "Goat Care", "category": "Livestock"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = (await client.get("/api/v1/activities/categories/")).json()
+    assert sorted(data) == ["Agriculture", "Forestry", "Livestock"]
+
+
+@pytest.mark.asyncio
+async def test_filter_activities_by_category(client: AsyncClient, sample_activity):
+    response = await client.get("/api/v1/activities/?category=Agriculture")
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 1
     assert all(activity["category"] == "Agriculture" for activity in data)
 
 
-def test_filter_activities_by_difficulty(client: TestClient, sample_activity):
-    response = client.get("/api/v1/activities/?difficulty=beginner")
+@pytest.mark.asyncio
+async def test_filter_activities_by_difficulty(client: AsyncClient, sample_activity):
+    response = await client.get("/api/v1/activities/?difficulty=beginner")
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 1
@@ -1,18 +1,19 @@
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import User
 from app.core.security import get_password_hash, verify_password, create_access_token
 
 
-def test_register_user(client: TestClient):
+@pytest.mark.asyncio
+async def test_register_user(client: AsyncClient):
     user_data = {
         "email": "test@example.com",
         "username": "testuser",
         "password": "testpassword",
         "full_name": "Test User",
     }
-    response = client.post("/api/v1/auth/register", json=user_data)
+    response = await client.post("/api/v1/auth/register", json=user_data)
     assert response.status_code == 200
     data = response.json()
     assert data["email"] == user_data["email"]
@@ -21,23 +22,25 @@ def test_register_user(client: TestClient):
     assert "id" in data
 
 
-def test_register_duplicate_user(client: TestClient):
+@pytest.mark.asyncio
+async def test_register_duplicate_user(client: AsyncClient):
     user_data = {
         "email": "test@example.com",
         "username": "testuser",
         "password": "testpassword",
     }
     # Register first user
-    response = client.post("/api/v1/auth/register", json=user_data)
+    response = await client.post("/api/v1/auth/register", json=user_data)
     assert response.status_code == 200
 
     # Try to register same user again
-    response = client.post("/api/v1/auth/register", json=user_data)
+    response = await client.post("/api/v1/auth/register", json=user_data)
     assert response.status_code == 400
     assert "already registered" in response.json()["detail"]
 
 
-def test_login_user(client: TestClient, db_session: Session):
+@pytest.mark.asyncio
+async def test_login_user(client: AsyncClient, db_session: AsyncSession):
     # Create a user first
     password = "testpassword"
     hashed_password = get_password_hash(password)
@@ -48,20 +51,21 @@ def test_login_user(client: TestClient, db_session: Session):
         full_name="Test User",
     )
     db_session.add(user)
-    db_session.commit()
+    await db_session.commit()
 
     # Test login
     login_data = {"username": "testuser", "password": password}
-    response = client.post("/api/v1/auth/login", json=login_data)
+    response = await client.post("/api/v1/auth/login", json=login_data)
     assert response.status_code == 200
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
 
 
-def test_login_invalid_credentials(client: TestClient):
+@pytest.mark.asyncio
+async def test_login_invalid_credentials(client: AsyncClient):
     login_data = {"username": "nonexistent", "password": "wrongpassword"}
-    response = client.post("/api/v1/auth/login", json=login_data)
+    response = await client.post("/api/v1/auth/login", json=login_data)
     assert response.status_code == 401
     assert "Incorrect username or password" in response.json()["detail"]
 
@@ -0,0 +1,48 @@
+import json
+
+from starlette.requests import Request
+
+from app.core.cache import ResponseCache
+
+
+def make_request(path: str, query: str = "") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [],
+        }
+    )
+
+
+async def test_cache_serves_rendered_body_until_invalidated():
+    cache = ResponseCache("test_render", ttl=60)
+    calls = []
+
+    async def render():
+        calls.append(1)
+        return ["Agriculture"]
+
+    first = await cache.serve(make_request("/categories"), render)
+    second = await cache.serve(make_request("/categories"), render)
+
+    assert json.loads(first.body) == json.loads(second.body) == ["Agriculture"]
+    assert len(calls) == 1
+
+    cache.clear()
+    await cache.serve(make_request("/categories"), render)
+    assert len(calls) == 2
+
+
+async def test_cache_evicts_oldest_entries_past_max_entries():
+    cache = ResponseCache("test_eviction", ttl=60, max_entries=2)
+
+    async def render():
+        return []
+
+    for page in range(3):
+        await cache.serve(make_request("/categories", f"page={page}"), render)
+
+    assert list(cache._entries) == ["/categories?page=1", "/categories?page=2"]
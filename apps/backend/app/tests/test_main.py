@@ -1,9 +1,10 @@
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
 
-def test_root_endpoint(client: TestClient):
-    response = client.get("/")
+@pytest.mark.asyncio
+async def test_root_endpoint(client: AsyncClient):
+    response = await client.get("/")
     assert response.status_code == 200
     data = response.json()
     assert "message" in data
@@ -11,16 +12,18 @@ def test_root_endpoint(client: TestClient):
     assert data["message"] == "Welcome to LaVidaLuca Backend API"
 
 
-def test_health_check(client: TestClient):
-    response = client.get("/health")
+@pytest.mark.asyncio
+async def test_health_check(client: AsyncClient):
+    response = await client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
     assert data["service"] == "lavidaluca-backend"
 
 
-def test_openapi_docs(client: TestClient):
-    response = client.get("/api/v1/openapi.json")
+@pytest.mark.asyncio
+async def test_openapi_docs(client: AsyncClient):
+    response = await client.get("/api/v1/openapi.json")
     assert response.status_code == 200
     data = response.json()
     assert "openapi" in data
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import User, Activity, ActivitySuggestion
+from app.services.suggestion_batch import precompute_suggestions, seconds_until
+
+
+@pytest_asyncio.fixture
+async def users(db_session: AsyncSession):
+    users = [
+        User(
+            email=f"batch{i}@example.com",
+            username=f"batch{i}",
+            hashed_password="hashed",
+            is_active=i < 3,
+        )
+        for i in range(4)
+    ]
+    db_session.add_all(users)
+    await db_session.commit()
+    return users
+
+
+@pytest_asyncio.fixture
+async def catalog(db_session: AsyncSession, users):
+    activities = [
+        Activity(
+            title="Soil Basics",
+            category="Agriculture",
+            difficulty_level="beginner",
+            is_published=True,
+            creator_id=users[0].id,
+        ),
+        Activity(
+            title="Composting",
+            category="Agriculture",
+            difficulty_level="beginner",
+            is_published=True,
+            creator_id=users[1].id,
+        ),
+        Activity(
+            title="Pottery",
+            category="Crafts",
+            difficulty_level="advanced",
+            is_published=True,
+            creator_id=users[1].id,
+        ),
+        Activity(
+            title="Draft Activity",
+            category="Agriculture",
+            difficulty_level="beginner",
+            is_published=False,
+            creator_id=users[1].id,
+        ),
+    ]
+    db_session.add_all(activities)
+    await db_session.commit()
+    return activities
+
+
+async def suggestions_for(db_session: AsyncSession, user):
+    result = await db_session.execute(
+        select(ActivitySuggestion).where(ActivitySuggestion.user_id == user.id)
+    )
+    return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_precompute_suggestions(db_session: AsyncSession, users, catalog):
+    written = await precompute_suggestions(db_session, chunk_size=2, per_user=2)
+    assert written == 5  # batch1 created all but one
+
+    suggested = {s.activity_id for s in await suggestions_for(db_session, users[0])}
+    # Own and unpublished activities are never suggested
+    assert suggested == {catalog[1].id, catalog[2].id}
+    assert await suggestions_for(db_session, users[3]) == []
+
+    best = next(
+        s
+        for s in await suggestions_for(db_session, users[0])
+        if s.activity_id == catalog[1].id
+    )
+    assert "categories" in best.suggestion_reason
+    assert best.ai_generated is False
+
+
+@pytest.mark.asyncio
+async def test_precompute_suggestions_is_idempotent(
+    db_session: AsyncSession, users, catalog
+):
+    await precompute_suggestions(db_session, per_user=2)
+    assert await precompute_suggestions(db_session, per_user=2) == 0
+    result = await db_session.execute(select(ActivitySuggestion))
+    assert len(result.scalars().all()) == 5
+
+
+def test_seconds_until():
+    now = datetime(2024, 1, 1, 2, 30)
+    assert seconds_until(3, now) == 30 * 60
+    assert seconds_until(2, now) == 23.5 * 3600
@@ -0,0 +1,102 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import User, Activity, ActivitySuggestion
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.api.endpoints.suggestions import store_suggestions
+from app.tests.conftest import TestingSessionLocal
+
+
+@pytest_asyncio.fixture
+async def author(db_session: AsyncSession):
+    user = User(email="author@example.com", username="author", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+    return user
+
+
+@pytest_asyncio.fixture
+async def auth_headers(db_session: AsyncSession):
+    user = User(email="reader@example.com", username="reader", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    token = create_access_token(subject=user.id)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest_asyncio.fixture
+async def published_activities(db_session: AsyncSession, author):
+    activities = [
+        Activity(
+            title=f"Activity {i}",
+            category="Agriculture",
+            is_published=True,
+            creator_id=author.id,
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(activities)
+    await db_session.commit()
+    return activities
+
+
+@pytest.mark.asyncio
+async def test_generate_suggestions_without_openai(
+    client: AsyncClient, auth_headers, published_activities, monkeypatch
+):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", None)
+
+    response = await client.post("/api/v1/suggestions/generate", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert {s["activity_id"] for s in data} == {a.id for a in published_activities}
+    assert all(s["activity"]["title"].startswith("Activity") for s in data)
+    assert not any(s["ai_generated"] for s in data)
+
+    # Suggestions already made are not stored again
+    response = await client.post("/api/v1/suggestions/generate", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == []
+
+    response = await client.get("/api/v1/suggestions/", headers=auth_headers)
+    assert len(response.json()) == 3
+
+
+class ConcurrentSession:
+    """Session whose first query is followed by another request's insert."""
+
+    def __init__(self, session, concurrent_row):
+        self.session = session
+        self.concurrent_row = concurrent_row
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    async def execute(self, statement):
+        result = await self.session.execute(statement)
+        if self.concurrent_row is not None:
+            row, self.concurrent_row = self.concurrent_row, None
+            async with TestingSessionLocal() as other:
+                other.add(ActivitySuggestion(**row))
+                await other.commit()
+        return result
+
+
+@pytest.mark.asyncio
+async def test_store_suggestions_returns_only_its_own_rows(
+    db_session: AsyncSession, author, published_activities
+):
+    first, second, third = published_activities
+    rows = [
+        {"user_id": author.id, "activity_id": activity.id, "ai_generated": False}
+        for activity in published_activities
+    ]
+    # Another request stores the second suggestion while this one runs
+    session = ConcurrentSession(db_session, dict(rows[1], suggestion_reason="other"))
+
+    stored = await store_suggestions(session, author.id, rows)
+
+    assert [s.activity_id for s in stored] == [first.id, third.id]
@@ -3,14 +3,19 @@ Simple working FastAPI app for La Vida Luca.
 This version bypasses the complex import structure for now.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
+import hashlib
+import json
 import logging
 import os
 import time
 
+# Depends on FastAPI only, so it is shared without loading the API package
+from http_cache import etag_matches, make_etag, not_modified, set_etag
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -429,11 +434,38 @@ async def contact_health():
     return {"status": "healthy", "service": "contact"}
 
 
+ACTIVITY_CATEGORIES = {
+    "agri": "Agriculture",
+    "transfo": "Transformation",
+    "artisanat": "Artisanat",
+    "nature": "Environnement",
+    "social": "Animation",
+}
+
+# The catalog is static, so its fingerprint is computed once at import time
+ACTIVITIES_DIGEST = hashlib.sha256(
+    json.dumps([ACTIVITIES_DATA, ACTIVITY_CATEGORIES], sort_keys=True).encode()
+).hexdigest()
+
+
 @app.get("/api/v1/activities")
-async def get_activities(category: Optional[str] = None, search: Optional[str] = None):
+async def get_activities(
+    request: Request,
+    response: Response,
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+):
     """
     Get list of activities with optional filtering.
+
+    Responses carry an ETag; clients revalidating with If-None-Match get a
+    304 without a body while the catalog is unchanged.
     """
+    etag = make_etag("activities", ACTIVITIES_DIGEST, category, search)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     try:
         activities = ACTIVITIES_DATA.copy()
 
@@ -472,19 +504,16 @@ async def get_activities(category: Optional[str] = None, search: Optional[str] =
 
 
 @app.get("/api/v1/activities/categories")
-async def get_activity_categories():
+async def get_activity_categories(request: Request, response: Response):
     """Get list of activity categories."""
-    categories = {
-        "agri": "Agriculture",
-        "transfo": "Transformation",
-        "artisanat": "Artisanat",
-        "nature": "Environnement",
-        "social": "Animation",
-    }
+    etag = make_etag("categories", ACTIVITIES_DIGEST)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
 
     return {
         "success": True,
-        "data": categories,
+        "data": ACTIVITY_CATEGORIES,
         "message": "Categories retrieved successfully",
     }
 
@@ -4,7 +4,7 @@ JWT token handling for authentication.
 
 from datetime import datetime, timedelta
 from typing import Optional
-import jwt
+from jose import jwt
 from fastapi import HTTPException, status
 from ..config import settings
 from ..schemas.auth import TokenData
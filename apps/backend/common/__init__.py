@@ -0,0 +1,7 @@
+"""
+Helpers shared by the API and the ``app`` stack.
+
+Modules here only import the standard library and third-party packages, so
+each stack can import them without loading the other's configuration: the
+API as ``..common``, the ``app`` stack as ``common``.
+"""
@@ -0,0 +1,386 @@
+"""
+OpenAI client shared by both API stacks.
+
+One ``AsyncOpenAI`` client with a pooled HTTP connection, created on first
+use and closed on shutdown. Calls are capped by a semaphore so a burst of
+slow completions cannot exhaust the connection pool, each call has a total
+time budget, and transient failures (timeouts, connection errors, rate
+limits, 5xx) are retried with jittered exponential backoff within that
+budget. An optional circuit breaker around all calls makes callers fail
+fast while OpenAI is degraded.
+
+The module takes its configuration as arguments, so the API
+(``services.ai_client``) and the ``app`` stack (``app.services.ai_client``)
+each build their client from their own settings.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 4.0
+
+
+class AIServiceUnavailable(Exception):
+    """No OpenAI API key is configured."""
+
+
+class CallSlotTimeout(Exception):
+    """
+    No call slot freed up before the deadline.
+
+    The worker's own concurrency cap is saturated: nothing was sent, so the
+    circuit breaker does not count it as an OpenAI failure.
+    """
+
+
+class OpenAIClient:
+    """Pooled, bounded and retrying OpenAI chat client."""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        model: str,
+        timeout_seconds: float,
+        connect_timeout_seconds: float,
+        max_concurrency: int,
+        max_connections: int,
+        max_retries: int,
+        circuit=None,
+        on_request: Optional[Callable[[str, float, bool], None]] = None,
+    ):
+        """
+        Args:
+            api_key: OpenAI API key, calls are refused without one
+            model: Default model name
+            timeout_seconds: Default total seconds of a call, retries included
+            connect_timeout_seconds: Seconds to open a connection
+            max_concurrency: Calls in flight at once
+            max_connections: Size of the HTTP connection pool
+            max_retries: Retries of a transient failure
+            circuit: Circuit breaker guarding every call (``before_call``,
+                ``record`` and ``release``), or None
+            on_request: Called with the request type, duration and success
+                of each call, e.g. to record metrics
+        """
+        self.api_key = api_key
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.circuit = circuit
+        self.on_request = on_request
+        self._client: Optional[AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def available(self) -> bool:
+        """Whether an API key is configured for model calls."""
+        return bool(self.api_key)
+
+    def get_client(self) -> AsyncOpenAI:
+        """
+        Get the underlying client, creating it on first use.
+
+        Raises:
+            AIServiceUnavailable: If no API key is configured
+        """
+        if not self.available:
+            raise AIServiceUnavailable("OpenAI API key not configured")
+
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(
+                    self.timeout_seconds, connect=self.connect_timeout_seconds
+                ),
+            )
+            # Retries are handled by chat_completion, within the call budget
+            self._client = AsyncOpenAI(
+                api_key=self.api_key, max_retries=0, http_client=http_client
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def close(self):
+        """Close the client and its connections."""
+        client, self._client, self._semaphore = self._client, None, None
+        if client is not None:
+            await client.close()
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        request_type: str = "completion",
+    ) -> str:
+        """
+        Run a chat completion.
+
+        Args:
+            messages: Chat messages
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature
+            model: Model name (defaults to the client's model)
+            timeout: Total seconds for the call, retries included (defaults
+                to the client's timeout)
+            request_type: Label of the call passed to ``on_request``
+
+        Returns:
+            Content of the first choice
+
+        Raises:
+            AIServiceUnavailable: If no API key is configured
+            CircuitOpenError: If the circuit is open; nothing was sent
+            CallSlotTimeout: If no call slot freed up in time; nothing was sent
+            openai.OpenAIError: If the call failed, after retries
+        """
+        client = self.get_client()
+        semaphore = self._semaphore
+        started = time.monotonic()
+        deadline = started + (self.timeout_seconds if timeout is None else timeout)
+        params = {
+            "model": model or self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+
+        token = self._before_call()
+        outcome = None
+        try:
+            content = await self._complete(
+                client, semaphore, deadline, params, started, request_type
+            )
+            outcome = True
+            return content
+        except RETRYABLE_ERRORS:
+            outcome = False
+            raise
+        except CallSlotTimeout:
+            # Local backpressure: OpenAI was never reached
+            raise
+        except Exception:
+            # The API answered (bad request, auth...): not a degraded service
+            outcome = True
+            raise
+        finally:
+            self._after_call(token, outcome, time.monotonic() - started)
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        request_type: str = "completion",
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion.
+
+        Takes the same arguments as ``chat_completion``. Failures are only
+        retried until the first delta was yielded; the call slot is held
+        until the stream ends or the consumer stops iterating.
+
+        Yields:
+            Content deltas of the first choice
+        """
+        client = self.get_client()
+        semaphore = self._semaphore
+        started = time.monotonic()
+        deadline = started + (self.timeout_seconds if timeout is None else timeout)
+        params = {
+            "model": model or self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+        }
+
+        token = self._before_call()
+        outcome = None
+        first_delta_after = None
+        try:
+            async for delta in self._stream(
+                client, semaphore, deadline, params, started, request_type
+            ):
+                if first_delta_after is None:
+                    first_delta_after = time.monotonic() - started
+                yield delta
+            outcome = True
+        except RETRYABLE_ERRORS:
+            outcome = False
+            raise
+        except CallSlotTimeout:
+            raise
+        except Exception:
+            outcome = True
+            raise
+        finally:
+            if outcome is None and first_delta_after is not None:
+                # The consumer stopped early, after the model had answered
+                outcome = True
+            # Stream latency is the time to the first delta
+            latency = first_delta_after
+            if latency is None:
+                latency = time.monotonic() - started
+            self._after_call(token, outcome, latency)
+
+    def _before_call(self) -> Optional[object]:
+        if self.circuit is None:
+            return None
+        return self.circuit.before_call()
+
+    def _after_call(self, token: Optional[object], outcome: Optional[bool], latency):
+        if self.circuit is None:
+            return
+        if outcome is None:
+            self.circuit.release(token)
+        else:
+            self.circuit.record(outcome, latency, token)
+
+    def _record(self, request_type: str, started: float, success: bool):
+        if self.on_request is not None:
+            self.on_request(request_type, time.monotonic() - started, success)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retries of concurrent callers apart
+        return random.uniform(
+            0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+        )
+
+    async def _complete(
+        self,
+        client: AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+        deadline: float,
+        params: Dict,
+        started: float,
+        request_type: str,
+    ) -> str:
+        """Run a completion with retries and return its content."""
+        attempt = 0
+        while True:
+            try:
+                response = await self._create(client, semaphore, deadline, params)
+            except RETRYABLE_ERRORS as e:
+                delay = self._backoff(attempt)
+                attempt += 1
+                if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                    self._record(request_type, started, False)
+                    raise
+                logger.warning(
+                    f"OpenAI call failed ({e!r}), retry {attempt} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            except Exception:
+                self._record(request_type, started, False)
+                raise
+            else:
+                self._record(request_type, started, True)
+                return response.choices[0].message.content
+
+    async def _stream(
+        self,
+        client: AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+        deadline: float,
+        params: Dict,
+        started: float,
+        request_type: str,
+    ) -> AsyncIterator[str]:
+        """Stream a completion, retrying until the first delta."""
+        attempt = 0
+        while True:
+            await self._acquire(semaphore, deadline)
+            streamed = False
+            stream = None
+            try:
+                stream = await client.chat.completions.create(
+                    **params, timeout=max(deadline - time.monotonic(), 0.0)
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        streamed = True
+                        yield delta
+            except RETRYABLE_ERRORS as e:
+                delay = self._backoff(attempt)
+                attempt += 1
+                if (
+                    streamed
+                    or attempt > self.max_retries
+                    or time.monotonic() + delay >= deadline
+                ):
+                    self._record(request_type, started, False)
+                    raise
+                logger.warning(
+                    f"OpenAI stream failed ({e!r}), retry {attempt} in {delay:.2f}s"
+                )
+            except Exception:
+                self._record(request_type, started, False)
+                raise
+            else:
+                self._record(request_type, started, True)
+                return
+            finally:
+                if stream is not None:
+                    # Return the connection to the pool if the consumer
+                    # stopped early
+                    await stream.response.aclose()
+                semaphore.release()
+
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, semaphore: asyncio.Semaphore, deadline: float):
+        """
+        Wait for a call slot until the deadline.
+
+        Raises:
+            CallSlotTimeout: If no slot freed up in time
+        """
+        try:
+            await asyncio.wait_for(semaphore.acquire(), deadline - time.monotonic())
+        except asyncio.TimeoutError:
+            raise CallSlotTimeout("No OpenAI call slot available") from None
+
+    async def _create(
+        self,
+        client: AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+        deadline: float,
+        params: Dict,
+    ):
+        """Make one completion request, waiting for a slot, before the deadline."""
+        await self._acquire(semaphore, deadline)
+        try:
+            return await client.chat.completions.create(
+                **params, timeout=max(deadline - time.monotonic(), 0.0)
+            )
+        finally:
+            semaphore.release()
@@ -0,0 +1,92 @@
+"""
+Token counting and cached prompt fragments.
+
+Suggestion prompts list activities, one line each. A line is formatted once
+per activity version and kept with its token count, so building a prompt
+only concatenates cached fragments and sums their counts. The completion
+budget is derived from the number of suggestions asked for.
+
+Tokens are counted with ``tiktoken`` when it is installed, otherwise
+estimated from the text length.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # Optional: token counts are estimated without it
+    tiktoken = None
+
+
+CHARS_PER_TOKEN = 3.5  # Conservative for French text
+MAX_FRAGMENTS = 10000
+
+# Completion budget: the JSON array around the suggestions
+RESPONSE_BASE_TOKENS = 20
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of a text for the suggestion model."""
+    global _encoding
+
+    if tiktoken is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    return len(_encoding.encode(text))
+
+
+def completion_budget(
+    max_suggestions: int, limit: int, tokens_per_suggestion: int
+) -> int:
+    """Get the ``max_tokens`` needed for a number of suggestions."""
+    return min(limit, RESPONSE_BASE_TOKENS + tokens_per_suggestion * max_suggestions)
+
+
+class FragmentCache:
+    """Thread-safe LRU cache of prompt fragments and their token counts."""
+
+    def __init__(self, extra_tokens: int = 0, max_entries: int = MAX_FRAGMENTS):
+        """
+        Args:
+            extra_tokens: Tokens added to each fragment's count, e.g. for the
+                number the prompt puts before it
+            max_entries: Fragments kept before the least recently used ones
+                are evicted
+        """
+        self.extra_tokens = extra_tokens
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[str, int]]" = OrderedDict()
+
+    def get(self, key: Hashable, render: Callable[[], str]) -> Tuple[str, int]:
+        """
+        Get a fragment and its token count, rendering it on a miss.
+
+        Args:
+            key: Identity of the fragment, such as an activity ID and its
+                ``updated_at``, so that an edited activity is formatted again
+            render: Formats the fragment
+
+        Returns:
+            The fragment and its token count
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+
+        fragment = render()
+        entry = (fragment, count_tokens(fragment) + self.extra_tokens)
+
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
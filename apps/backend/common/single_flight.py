@@ -0,0 +1,55 @@
+"""
+Single-flight execution of coroutines.
+
+Concurrent callers asking for the same key share one in-flight computation
+instead of each running it, so an expiring cache entry under load costs one
+recompute rather than one per waiting request. The computation runs in its
+own task: a caller that is cancelled (client disconnect, timeout) stops
+waiting, but the computation carries on for the other callers.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Deduplicate concurrent computations by key."""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a computation for a key is running."""
+        return key in self._flights
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` unless a computation for the same key is already running,
+        in which case wait for that one and share its result.
+
+        Args:
+            key: Identity of the computation
+            fn: Coroutine factory computing the result
+
+        Returns:
+            Result of the (shared) computation
+
+        Raises:
+            Exception: Whatever the shared computation raised
+            asyncio.CancelledError: If this caller is cancelled
+        """
+        task = self._flights.get(key)
+        if task is None:
+            # The computation belongs to the flight, not to the caller that
+            # started it: cancelling any caller leaves it running for the others
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._land(key, done))
+        return await asyncio.shield(task)
+
+    def _land(self, key: Hashable, task: asyncio.Future):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            task.exception()
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
 
+    # Catalog snapshot (reloaded periodically so every worker sees writes)
+    CATALOG_REFRESH_INTERVAL_SECONDS: int = 300
+
     # JWT Authentication
     JWT_SECRET_KEY: str = "your-secret-key-change-in-production"
     JWT_ALGORITHM: str = "HS256"
@@ -31,7 +34,31 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-3.5-turbo"
-    OPENAI_MAX_TOKENS: int = 500
+    OPENAI_MAX_TOKENS: int = 500  # Upper bound of completion budgets
+    OPENAI_PROMPT_TOKEN_BUDGET: int = 1200
+    OPENAI_TIMEOUT_SECONDS: float = 30.0  # Per call, retries included
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_MAX_CONCURRENCY: int = 8  # Concurrent model calls per worker
+    OPENAI_MAX_CONNECTIONS: int = 20
+    OPENAI_MAX_RETRIES: int = 2
+
+    # Background suggestion jobs (POST /suggestions?mode=async)
+    SUGGESTION_JOB_WORKERS: int = 4
+    SUGGESTION_JOB_QUEUE_SIZE: int = 100
+    SUGGESTION_JOB_RESULT_TTL_SECONDS: int = 600
+
+    # Circuit breaker around OpenAI calls
+    AI_CIRCUIT_WINDOW: int = 20  # Recent calls the rates are computed over
+    AI_CIRCUIT_MIN_CALLS: int = 10
+    AI_CIRCUIT_ERROR_RATE: float = 0.5
+    AI_CIRCUIT_SLOW_CALL_SECONDS: float = 10.0
+    AI_CIRCUIT_SLOW_CALL_RATE: float = 0.5
+    AI_CIRCUIT_OPEN_SECONDS: float = 30.0
+
+    # Suggestion cache (the disk tier is disabled unless a path is set)
+    SUGGESTION_CACHE_TTL_SECONDS: int = 3600
+    SUGGESTION_CACHE_MAX_ENTRIES: int = 1024
+    SUGGESTION_CACHE_PATH: Optional[str] = None
 
     # Rate Limiting
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = 100
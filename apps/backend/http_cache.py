@@ -0,0 +1,58 @@
+"""
+HTTP conditional request helpers (ETag / If-None-Match).
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values a representation depends on.
+
+    Args:
+        parts: Values identifying the representation (IDs, timestamps,
+            content digests, normalized query parameters)
+
+    Returns:
+        Quoted entity tag
+    """
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    # If-None-Match uses the weak comparison function
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    """Build a 304 Not Modified response for an ETag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def set_etag(response: Response, etag: str, cache_control: str = "no-cache"):
+    """Attach an ETag to a response; no-cache makes clients revalidate it."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def query_key(request: Request) -> str:
+    """Normalize query parameters so equivalent requests share an ETag."""
+    return "&".join(
+        f"{key}={value}" for key, value in sorted(request.query_params.multi_items())
+    )
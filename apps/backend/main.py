@@ -6,15 +6,20 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
 
-from config import settings
-from database import database
-from routes import auth, users, activities, contacts, suggestions, guide
-from middleware import setup_middleware
-from exceptions import setup_exception_handlers
-from monitoring import (
+from .config import settings
+from .database import database
+from .routes import auth, users, activities, contacts, suggestions, guide
+from .middleware import setup_middleware
+from .exceptions import setup_exception_handlers
+from .services.catalog import refresh_catalog, catalog_refresh_loop
+from .services.similarity import ensure_similarities
+from .services.ai_client import ai_circuit, close_ai_client
+from .services.circuit_breaker import CircuitState
+from .monitoring import (
     init_sentry,
     setup_logging,
     context_logger,
@@ -59,12 +64,32 @@ async def lifespan(app: FastAPI):
         context_logger.warning(f"Database connection failed: {e}")
         context_logger.info("Starting API without database connection")
 
+    # Load the published catalog snapshot served by read endpoints
+    try:
+        await refresh_catalog()
+    except Exception as e:
+        context_logger.warning(f"Catalog snapshot load failed: {e}")
+        context_logger.info("Serving catalog reads from the database")
+    catalog_refresher = asyncio.create_task(
+        catalog_refresh_loop(settings.CATALOG_REFRESH_INTERVAL_SECONDS)
+    )
+
+    # Build the similar-activities index on the first start after its migration
+    similarity_builder = asyncio.create_task(ensure_similarities())
+
+    # Workers of the background suggestion jobs
+    suggestions.SUGGESTION_JOBS.start()
+
     # Update system metrics on startup
     update_system_metrics()
 
     yield
 
     # Cleanup
+    catalog_refresher.cancel()
+    similarity_builder.cancel()
+    await suggestions.SUGGESTION_JOBS.stop()
+    await close_ai_client()
     try:
         await database.disconnect()
         context_logger.info("Database disconnected")
@@ -124,9 +149,14 @@ def create_app() -> FastAPI:
             context_logger.error("Database health check failed", error=str(e))
             db_status = "unhealthy"
 
+        # AI features fall back to local results while the circuit is open
+        ai_status = ai_circuit.status()
+        healthy = db_status == "healthy" and ai_status["state"] != CircuitState.OPEN
+
         return {
-            "status": "healthy" if db_status == "healthy" else "degraded",
+            "status": "healthy" if healthy else "degraded",
             "database": db_status,
+            "ai": ai_status,
             "environment": settings.ENVIRONMENT,
         }
 
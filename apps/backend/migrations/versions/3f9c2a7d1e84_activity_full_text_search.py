@@ -0,0 +1,58 @@
+"""Activity full-text search
+
+Revision ID: 3f9c2a7d1e84
+Revises: 
+Create Date: 2026-10-16 09:12:31.482516
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "3f9c2a7d1e84"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('french_unaccent', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('french_unaccent', coalesce(summary, '')), 'B') || "
+    "setweight(to_tsvector('french_unaccent', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # French stemming on unaccented words, so "plantation" matches "planter"
+    # and "récolte" matches "recolte".
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE TEXT SEARCH CONFIGURATION french_unaccent (COPY = french)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION french_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem"
+    )
+
+    op.add_column(
+        "activities",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_activities_search_vector",
+        "activities",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activities_search_vector", table_name="activities")
+    op.drop_column("activities", "search_vector")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS french_unaccent")
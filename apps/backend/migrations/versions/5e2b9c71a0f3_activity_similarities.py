@@ -0,0 +1,52 @@
+"""Activity similarity table
+
+Revision ID: 5e2b9c71a0f3
+Revises: c27e9a5b0d41
+Create Date: 2026-10-16 14:02:19.408716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "5e2b9c71a0f3"
+down_revision = "c27e9a5b0d41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_similarities",
+        sa.Column("activity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("neighbour_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["activity_id"], ["activities.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["neighbour_id"], ["activities.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("activity_id", "neighbour_id"),
+    )
+    op.create_index(
+        "ix_activity_similarities_rank",
+        "activity_similarities",
+        ["activity_id", "rank"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_activity_similarities_neighbour_id",
+        "activity_similarities",
+        ["neighbour_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_activity_similarities_neighbour_id", table_name="activity_similarities"
+    )
+    op.drop_index("ix_activity_similarities_rank", table_name="activity_similarities")
+    op.drop_table("activity_similarities")
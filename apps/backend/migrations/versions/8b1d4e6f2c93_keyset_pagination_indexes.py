@@ -0,0 +1,37 @@
+"""Keyset pagination indexes
+
+Revision ID: 8b1d4e6f2c93
+Revises: 3f9c2a7d1e84
+Create Date: 2026-10-16 10:41:07.215903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8b1d4e6f2c93"
+down_revision = "3f9c2a7d1e84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_activities_listing",
+        "activities",
+        ["is_featured", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_contacts_created_at_id", "contacts", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_users_created_at_id", "users", ["created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_at_id", table_name="users")
+    op.drop_index("ix_contacts_created_at_id", table_name="contacts")
+    op.drop_index("ix_activities_listing", table_name="activities")
@@ -0,0 +1,35 @@
+"""Activity tag GIN indexes
+
+Revision ID: c27e9a5b0d41
+Revises: 8b1d4e6f2c93
+Create Date: 2026-10-16 11:26:52.738144
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c27e9a5b0d41"
+down_revision = "8b1d4e6f2c93"
+branch_labels = None
+depends_on = None
+
+
+TAG_COLUMNS = ["skill_tags", "season_tags", "keywords", "materials"]
+
+
+def upgrade() -> None:
+    for column in TAG_COLUMNS:
+        op.create_index(
+            f"ix_activities_{column}",
+            "activities",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+        )
+
+
+def downgrade() -> None:
+    for column in reversed(TAG_COLUMNS):
+        op.drop_index(f"ix_activities_{column}", table_name="activities")
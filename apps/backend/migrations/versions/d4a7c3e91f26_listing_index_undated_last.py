@@ -0,0 +1,40 @@
+"""Listing index with undated activities last
+
+Revision ID: d4a7c3e91f26
+Revises: 5e2b9c71a0f3
+Create Date: 2026-10-16 21:05:42.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d4a7c3e91f26"
+down_revision = "5e2b9c71a0f3"
+branch_labels = None
+depends_on = None
+
+
+# Same expression as models.activity.LISTED_AT_EXPRESSION
+LISTED_AT_EXPRESSION = "coalesce(created_at, '0001-01-01 00:00:00+00'::timestamptz)"
+
+
+def upgrade() -> None:
+    op.drop_index("ix_activities_listing", table_name="activities")
+    op.create_index(
+        "ix_activities_listing",
+        "activities",
+        ["is_featured", sa.text(LISTED_AT_EXPRESSION), "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activities_listing", table_name="activities")
+    op.create_index(
+        "ix_activities_listing",
+        "activities",
+        ["is_featured", "created_at", "id"],
+        unique=False,
+    )
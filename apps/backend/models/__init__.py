@@ -5,5 +5,6 @@ Database models for La Vida Luca.
 from .user import User
 from .activity import Activity
 from .contact import Contact
+from .similarity import ActivitySimilarity
 
-__all__ = ["User", "Activity", "Contact"]
+__all__ = ["User", "Activity", "Contact", "ActivitySimilarity"]
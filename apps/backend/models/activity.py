@@ -2,18 +2,59 @@
 Activity model for educational activities and learning experiences.
 """
 
-from sqlalchemy import Column, String, Text, Integer, Float, JSON, DateTime, Boolean
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    Integer,
+    Float,
+    JSON,
+    DateTime,
+    Boolean,
+    Computed,
+    Index,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 import uuid
 
 from ..database import Base
 
 
+# Text search configuration: French stemming over unaccented words, created
+# by the full-text search migration.
+SEARCH_CONFIG = "french_unaccent"
+
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(summary, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+
+# Listing date: undated activities sort as the oldest, like the catalog
+# snapshot's UNDATED sentinel. Keyset pagination compares it in a row value,
+# where a NULL would skip rows.
+UNDATED_SQL = "'0001-01-01 00:00:00+00'::timestamptz"
+LISTED_AT_EXPRESSION = f"coalesce(created_at, {UNDATED_SQL})"
+
+
 class Activity(Base):
     """Activity model for educational activities."""
 
     __tablename__ = "activities"
+    __table_args__ = (
+        Index("ix_activities_search_vector", "search_vector", postgresql_using="gin"),
+        # Listing order, used by keyset pagination
+        Index("ix_activities_listing", "is_featured", text(LISTED_AT_EXPRESSION), "id"),
+        # Tag filtering with @> and &&
+        Index("ix_activities_skill_tags", "skill_tags", postgresql_using="gin"),
+        Index("ix_activities_season_tags", "season_tags", postgresql_using="gin"),
+        Index("ix_activities_keywords", "keywords", postgresql_using="gin"),
+        Index("ix_activities_materials", "materials", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -56,10 +97,14 @@ class Activity(Base):
     # Search and categorization
     keywords = Column(ARRAY(String), default=list)
     season_tags = Column(ARRAY(String), default=list)  # spring, summer, autumn, winter
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+    )  # Maintained by Postgres, only used in WHERE/ORDER BY clauses
 
     # Additional data
     external_resources = Column(JSON, default=dict)  # Links, references
-    metadata = Column(JSON, default=dict)  # Flexible additional data
+    # "metadata" is reserved on declarative models
+    extra_metadata = Column("metadata", JSON, default=dict)  # Flexible additional data
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -96,7 +141,13 @@ class Activity(Base):
             "keywords": self.keywords or [],
             "season_tags": self.season_tags or [],
             "external_resources": self.external_resources or {},
-            "metadata": self.metadata or {},
+            "metadata": self.extra_metadata or {},
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+# Listing date as a column expression; same expression as the listing index
+LISTED_AT = func.coalesce(
+    Activity.created_at, literal_column(UNDATED_SQL, DateTime(timezone=True))
+)
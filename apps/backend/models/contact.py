@@ -2,7 +2,7 @@
 Contact model for managing contact requests and communications.
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, JSON, Integer
+from sqlalchemy import Column, String, Text, DateTime, Boolean, JSON, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.sql import func
 import uuid
@@ -14,6 +14,10 @@ class Contact(Base):
     """Contact model for contact form submissions and communications."""
 
     __tablename__ = "contacts"
+    __table_args__ = (
+        # Inbox order, used by keyset pagination
+        Index("ix_contacts_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -41,8 +45,9 @@ class Contact(Base):
     last_response_at = Column(DateTime(timezone=True))
 
     # Additional data
-    metadata = Column(
-        JSON, default=dict
+    # "metadata" is reserved on declarative models
+    extra_metadata = Column(
+        "metadata", JSON, default=dict
     )  # Flexible additional data like referrer, user agent, etc.
     tags = Column(ARRAY(String), default=list)  # Tags for categorization
 
@@ -76,7 +81,7 @@ class Contact(Base):
             "last_response_at": self.last_response_at.isoformat()
             if self.last_response_at
             else None,
-            "metadata": self.metadata or {},
+            "metadata": self.extra_metadata or {},
             "tags": self.tags or [],
             "consent_privacy": self.consent_privacy,
             "consent_marketing": self.consent_marketing,
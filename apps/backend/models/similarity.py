@@ -0,0 +1,39 @@
+"""
+Precomputed activity similarity model used by similar-activity suggestions.
+"""
+
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class ActivitySimilarity(Base):
+    """One of the top-K nearest neighbours of a published activity."""
+
+    __tablename__ = "activity_similarities"
+    __table_args__ = (
+        # Neighbour lookup in rank order
+        Index("ix_activity_similarities_rank", "activity_id", "rank", unique=True),
+        # Finds the lists an activity appears in when it changes
+        Index("ix_activity_similarities_neighbour_id", "neighbour_id"),
+    )
+
+    activity_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("activities.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    neighbour_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("activities.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    score = Column(Float, nullable=False)  # 0..1, higher is more similar
+    rank = Column(Integer, nullable=False)  # 1 = most similar
+
+    def __repr__(self):
+        return (
+            f"<ActivitySimilarity(activity_id={self.activity_id}, "
+            f"neighbour_id={self.neighbour_id}, score={self.score})>"
+        )
@@ -2,7 +2,7 @@
 User model for authentication and profile management.
 """
 
-from sqlalchemy import Column, String, DateTime, Boolean, JSON, Text
+from sqlalchemy import Column, String, DateTime, Boolean, JSON, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -14,6 +14,10 @@ class User(Base):
     """User model for authentication and profiles."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin listing order, used by keyset pagination
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
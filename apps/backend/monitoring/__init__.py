@@ -11,6 +11,11 @@ from .metrics import (
     ACTIVE_USERS,
     AI_REQUESTS,
     AI_LATENCY,
+    RESPONSE_CACHE_EVENTS,
+    SUGGESTION_CACHE_EVENTS,
+    SUGGESTION_CACHE_HIT_RATIO,
+    CIRCUIT_BREAKER_STATE,
+    CIRCUIT_BREAKER_TRANSITIONS,
     DATABASE_CONNECTIONS,
     MEMORY_USAGE,
     CPU_USAGE,
@@ -41,6 +46,11 @@ __all__ = [
     "ACTIVE_USERS",
     "AI_REQUESTS",
     "AI_LATENCY",
+    "RESPONSE_CACHE_EVENTS",
+    "SUGGESTION_CACHE_EVENTS",
+    "SUGGESTION_CACHE_HIT_RATIO",
+    "CIRCUIT_BREAKER_STATE",
+    "CIRCUIT_BREAKER_TRANSITIONS",
     "DATABASE_CONNECTIONS",
     "MEMORY_USAGE",
     "CPU_USAGE",
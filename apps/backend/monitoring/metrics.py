@@ -40,6 +40,35 @@ AI_LATENCY = Histogram(
     "ai_request_duration_seconds", "AI request latency in seconds", ["type"]
 )
 
+RESPONSE_CACHE_EVENTS = Counter(
+    "response_cache_events_total",
+    "Response cache lookups by outcome (hit, miss, stale)",
+    ["cache", "result"],
+)
+
+SUGGESTION_CACHE_EVENTS = Counter(
+    "suggestion_cache_lookups_total",
+    "Suggestion cache lookups by outcome (memory_hit, disk_hit, miss)",
+    ["result"],
+)
+
+SUGGESTION_CACHE_HIT_RATIO = Gauge(
+    "suggestion_cache_hit_ratio",
+    "Share of suggestion cache lookups served from the cache",
+)
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["circuit"],
+)
+
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state transitions",
+    ["circuit", "from_state", "to_state"],
+)
+
 DATABASE_CONNECTIONS = Gauge(
     "database_connections_active", "Number of active database connections"
 )
@@ -2,31 +2,178 @@
 Activity management routes for educational activities and learning experiences.
 """
 
+import logging
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    status,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import (
+    select,
+    func,
+    and_,
+    any_,
+    literal,
+    distinct,
+    literal_column,
+    true,
+    tuple_,
+    Float,
+)
 
-from ..database import get_db_session
+from ..database import get_db_session, AsyncSessionLocal
 from ..models.user import User
-from ..models.activity import Activity
+from ..models.activity import Activity, LISTED_AT, SEARCH_CONFIG
 from ..schemas.activity import (
     ActivityCreate,
     ActivityUpdate,
     ActivityResponse,
     ActivityListResponse,
+    ActivityBatchGetRequest,
+    ActivityBatchGetResponse,
     ActivitySearchFilters,
+    ActivityFacets,
+    ActivityImportFormat,
+    ActivityImportResult,
+    TagMatch,
+)
+from ..schemas.common import (
+    ApiResponse,
+    ExportFormat,
+    PaginationParams,
+    PaginatedResponse,
+    TotalMode,
+    encode_cursor,
 )
-from ..schemas.common import ApiResponse, PaginationParams, PaginatedResponse
-from ..auth.dependencies import get_current_active_user
+from ..auth.dependencies import get_current_active_user, require_admin
+from ..http_cache import make_etag, etag_matches, not_modified, set_etag, query_key
+from ..services.catalog import get_catalog, refresh_catalog, listing_key
+from ..services.response_cache import ResponseCache, invalidate_response_caches
+from ..services.similarity import update_similarities, rebuild_similarities
+from ..services.suggestion_cache import suggestion_cache
+from ..services.activity_import import import_activities, ActivityImportAborted
+from .export import stream_export
+from .pagination import fetch_page, parse_cursor, schema_columns
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
 
+# Listing order, all descending; id makes it total for keyset pagination
+LISTING_SORT_KEYS = (Activity.is_featured, LISTED_AT, Activity.id)
 
-router = APIRouter()
+# Columns of a listing row; descriptions, notes and JSON data are not loaded
+LIST_COLUMNS = schema_columns(Activity, ActivityListResponse)
+
+# Export columns: every field of Activity.to_dict(), in order
+EXPORT_COLUMNS = tuple(Activity().to_dict())
+
+
+async def _on_catalog_write(background_tasks: BackgroundTasks, *activity_ids):
+    """
+    Publish a new catalog snapshot after a committed activity write and drop
+    cached responses and suggestions. The similarity index of the written
+    activities is updated once the response is sent.
+    """
+    try:
+        await refresh_catalog()
+    except Exception as e:
+        # The write is committed; readers keep the previous snapshot until
+        # the next successful refresh.
+        logger.warning(f"Catalog refresh after write failed: {e}")
+
+    # Cleared once the new snapshot is published, so responses rendered from
+    # the old one during the refresh are not kept
+    invalidate_response_caches()
+    await suggestion_cache.clear()
+
+    if activity_ids:
+        background_tasks.add_task(_update_similarities, activity_ids)
+
+
+async def _update_similarities(activity_ids):
+    """Update the similarity index for written activities, off the request."""
+    try:
+        await update_similarities(activity_ids)
+    except Exception as e:
+        logger.warning(f"Similarity index update after write failed: {e}")
+        return
+
+    # Similar-activity responses cached since the write list old neighbours
+    invalidate_response_caches()
+
+
+def _keywords_query(keywords: str):
+    """Build the French full-text query for user-entered keywords."""
+    return func.websearch_to_tsquery(
+        literal_column(f"'{SEARCH_CONFIG}'::regconfig"), keywords
+    )
+
+
+def _tag_predicate(column, tags, tag_match: TagMatch):
+    """Match an array column against a list of tags."""
+    if tag_match == TagMatch.ANY:
+        return column.overlap(tags)
+    return column.contains(tags)
+
+
+def _apply_filters(query, filters: ActivitySearchFilters):
+    """Apply search filters to an activity query."""
+    if filters.category:
+        query = query.where(Activity.category == filters.category)
+
+    if filters.min_duration:
+        query = query.where(Activity.duration_min >= filters.min_duration)
+
+    if filters.max_duration:
+        query = query.where(Activity.duration_min <= filters.max_duration)
+
+    if filters.difficulty_level:
+        query = query.where(Activity.difficulty_level == filters.difficulty_level)
+
+    if filters.safety_level:
+        query = query.where(Activity.safety_level <= filters.safety_level)
+
+    if filters.location_type:
+        query = query.where(Activity.location_type == filters.location_type)
+
+    if filters.is_featured is not None:
+        query = query.where(Activity.is_featured == filters.is_featured)
+
+    # One @> (all) or && (any) predicate per array, served by its GIN index
+    if filters.skill_tags:
+        query = query.where(
+            _tag_predicate(Activity.skill_tags, filters.skill_tags, filters.tag_match)
+        )
+
+    if filters.season_tags:
+        query = query.where(
+            _tag_predicate(Activity.season_tags, filters.season_tags, filters.tag_match)
+        )
+
+    if filters.keywords:
+        # Served by the GIN index on the generated search_vector column
+        query = query.where(
+            Activity.search_vector.op("@@")(_keywords_query(filters.keywords))
+        )
+
+    return query
 
 
 @router.post("/", response_model=ApiResponse[ActivityResponse])
 async def create_activity(
     activity_data: ActivityCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db_session),
 ):
@@ -38,6 +185,7 @@ async def create_activity(
     db.add(new_activity)
     await db.commit()
     await db.refresh(new_activity)
+    await _on_catalog_write(background_tasks, new_activity.id)
 
     return ApiResponse(
         success=True,
@@ -46,108 +194,319 @@ async def create_activity(
     )
 
 
-@router.get("/", response_model=ApiResponse[PaginatedResponse[ActivityListResponse]])
-async def list_activities(
-    pagination: PaginationParams = Depends(),
-    filters: ActivitySearchFilters = Depends(),
-    db: AsyncSession = Depends(get_db_session),
+@router.post("/import", response_model=ApiResponse[ActivityImportResult])
+async def import_activity_catalog(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    format: Optional[ActivityImportFormat] = Query(
+        None, description="Upload format, guessed from the file extension if omitted"
+    ),
+    current_user: User = Depends(require_admin),
 ):
     """
-    List activities with optional filtering and pagination.
+    Bulk import activities from a CSV or JSON Lines file (admin only).
+
+    Valid rows are written in one transaction; invalid rows are skipped and
+    reported with their line number.
     """
-    # Build query with filters
-    query = select(Activity).where(Activity.is_published == True)
+    if format is None:
+        extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+        if extension == "csv":
+            format = ActivityImportFormat.CSV
+        elif extension in ("jsonl", "ndjson"):
+            format = ActivityImportFormat.JSONL
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown upload format, pass format=csv or format=jsonl",
+            )
 
-    if filters.category:
-        query = query.where(Activity.category == filters.category)
+    try:
+        result = await import_activities(file, format, current_user.id)
+    except ActivityImportAborted as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Import aborted, no activity was imported: {e}",
+        )
 
-    if filters.min_duration:
-        query = query.where(Activity.duration_min >= filters.min_duration)
+    if result.imported:
+        await _on_catalog_write(background_tasks)
+        # Too many new activities for incremental updates
+        background_tasks.add_task(rebuild_similarities)
 
-    if filters.max_duration:
-        query = query.where(Activity.duration_min <= filters.max_duration)
+    return ApiResponse(
+        success=True,
+        data=result,
+        message=f"{result.imported} activities imported, {result.failed} rejected",
+    )
 
-    if filters.difficulty_level:
-        query = query.where(Activity.difficulty_level == filters.difficulty_level)
 
-    if filters.safety_level:
-        query = query.where(Activity.safety_level <= filters.safety_level)
+@router.post("/batch-get", response_model=ApiResponse[ActivityBatchGetResponse])
+async def batch_get_activities(
+    batch: ActivityBatchGetRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    Get several activities by ID in one request.
 
-    if filters.location_type:
-        query = query.where(Activity.location_type == filters.location_type)
+    Activities are returned in the order of the requested IDs; IDs of unknown
+    or unpublished activities are listed in ``missing``.
+    """
+    ids = list(dict.fromkeys(batch.ids))  # Drop duplicates, keep order
+
+    catalog = get_catalog()
+    if catalog is not None:
+        found = {
+            activity_id: ActivityResponse.parse_obj(activity)
+            for activity_id in ids
+            if (activity := catalog.get(str(activity_id))) is not None
+        }
+    else:
+        result = await db.execute(
+            select(Activity).where(
+                Activity.id == any_(literal(ids, ARRAY(Activity.id.type))),
+                Activity.is_published == True,
+            )
+        )
+        found = {
+            activity.id: ActivityResponse.from_orm(activity)
+            for activity in result.scalars()
+        }
 
-    if filters.is_featured is not None:
-        query = query.where(Activity.is_featured == filters.is_featured)
+    return ApiResponse(
+        success=True,
+        data=ActivityBatchGetResponse(
+            items=[found[activity_id] for activity_id in ids if activity_id in found],
+            missing=[activity_id for activity_id in ids if activity_id not in found],
+        ),
+        message=f"{len(found)} of {len(ids)} activities retrieved",
+    )
 
-    if filters.skill_tags:
-        for tag in filters.skill_tags:
-            query = query.where(Activity.skill_tags.contains([tag]))
 
-    if filters.season_tags:
-        for tag in filters.season_tags:
-            query = query.where(Activity.season_tags.contains([tag]))
+@router.get("/", response_model=ApiResponse[PaginatedResponse[ActivityListResponse]])
+async def list_activities(
+    request: Request,
+    response: Response,
+    pagination: PaginationParams = Depends(),
+    filters: ActivitySearchFilters = Depends(),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    List activities with optional filtering and pagination.
 
-    if filters.keywords:
-        search_term = f"%{filters.keywords.lower()}%"
-        query = query.where(
-            or_(
-                Activity.title.ilike(search_term),
-                Activity.summary.ilike(search_term),
-                Activity.description.ilike(search_term),
+    Keyword searches use Postgres full-text search with French stemming and
+    are ranked by relevance; other listings are served from the catalog
+    snapshot.
+    """
+    catalog = get_catalog()
+    if catalog is not None and not filters.keywords:
+        etag = make_etag("activities", catalog.digest, query_key(request))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+
+        matches = catalog.search(filters)
+        if pagination.cursor:
+            after = tuple(parse_cursor(pagination.cursor, LISTING_SORT_KEYS))
+            start = next(
+                (i for i, a in enumerate(matches) if listing_key(a) < after),
+                len(matches),
             )
+        else:
+            start = pagination.offset
+        page = matches[start : start + pagination.size]
+
+        next_cursor = None
+        if page and start + pagination.size < len(matches):
+            next_cursor = encode_cursor(list(listing_key(page[-1])))
+
+        activity_responses = [
+            ActivityListResponse.parse_obj(activity) for activity in page
+        ]
+        total = None if pagination.total == TotalMode.NONE else len(matches)
+        paginated_data = PaginatedResponse.create(
+            activity_responses, total, pagination, next_cursor
+        )
+        return ApiResponse(
+            success=True,
+            data=paginated_data,
+            message="Activities retrieved successfully",
         )
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
-
-    # Get activities with pagination
-    activities_result = await db.execute(
-        query.offset(pagination.offset)
-        .limit(pagination.size)
-        .order_by(Activity.is_featured.desc(), Activity.created_at.desc())
+    # Build query with filters
+    query = _apply_filters(
+        select(*LIST_COLUMNS).where(Activity.is_published == True), filters
     )
-    activities = activities_result.scalars().all()
+
+    # Get a page of activities and its total, best full-text matches first
+    sort_keys = list(LISTING_SORT_KEYS)
+    if filters.keywords:
+        sort_keys.insert(
+            0,
+            func.ts_rank_cd(
+                Activity.search_vector,
+                _keywords_query(filters.keywords),
+                type_=Float,
+            ),
+        )
+
+    page = await fetch_page(db, query, pagination, sort_keys)
 
     activity_responses = [
-        ActivityListResponse.from_orm(activity) for activity in activities
+        ActivityListResponse.parse_obj(row._mapping) for row in page.rows
     ]
-    paginated_data = PaginatedResponse.create(activity_responses, total, pagination)
+    paginated_data = PaginatedResponse.create(
+        activity_responses, page.total, pagination, page.next_cursor
+    )
 
     return ApiResponse(
         success=True, data=paginated_data, message="Activities retrieved successfully"
     )
 
 
-@router.get("/{activity_id}", response_model=ApiResponse[ActivityResponse])
-async def get_activity(activity_id: str, db: AsyncSession = Depends(get_db_session)):
+@router.get("/facets", response_model=ApiResponse[ActivityFacets])
+async def get_activity_facets(
+    filters: ActivitySearchFilters = Depends(),
+    db: AsyncSession = Depends(get_db_session),
+):
     """
-    Get activity by ID.
+    Count filtered activities by category, difficulty, safety level, location
+    type and season tag.
     """
-    result = await db.execute(
-        select(Activity).where(
-            and_(Activity.id == activity_id, Activity.is_published == True)
+    catalog = get_catalog()
+    if catalog is not None and not filters.keywords:
+        return ApiResponse(
+            success=True,
+            data=catalog.facets(filters),
+            message="Activity facets retrieved successfully",
         )
-    )
-    activity = result.scalar_one_or_none()
 
-    if not activity:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found"
+    # One grouped statement: a grouping set per facet plus () for the total.
+    # Season tags are unnested, so activities are counted with DISTINCT.
+    season = (
+        func.unnest(Activity.season_tags)
+        .table_valued("tag")
+        .render_derived(name="season")
+        .lateral()
+    )
+    facet_columns = {
+        "category": Activity.category,
+        "difficulty_level": Activity.difficulty_level,
+        "safety_level": Activity.safety_level,
+        "location_type": Activity.location_type,
+        "season_tags": season.c.tag,
+    }
+    query = _apply_filters(
+        select(
+            *[column.label(name) for name, column in facet_columns.items()],
+            *[
+                func.grouping(column).label(f"grouping_{name}")
+                for name, column in facet_columns.items()
+            ],
+            func.count(distinct(Activity.id)).label("count"),
+        )
+        .select_from(Activity)
+        .outerjoin(season, true())
+        .where(Activity.is_published == True),
+        filters,
+    ).group_by(
+        func.grouping_sets(
+            *[tuple_(column) for column in facet_columns.values()], tuple_()
         )
+    )
+    result = await db.execute(query)
+
+    total = 0
+    counts = {name: {} for name in facet_columns}
+    for row in result.mappings():
+        grouped = [name for name in facet_columns if row[f"grouping_{name}"] == 0]
+        if not grouped:
+            total = row["count"]
+        elif row[grouped[0]] is not None:
+            counts[grouped[0]][row[grouped[0]]] = row["count"]
 
     return ApiResponse(
         success=True,
-        data=ActivityResponse.from_orm(activity),
-        message="Activity retrieved successfully",
+        data=ActivityFacets(total=total, **counts),
+        message="Activity facets retrieved successfully",
+    )
+
+
+@router.get("/export")
+async def export_activities(
+    format: ExportFormat = ExportFormat.NDJSON,
+    filters: ActivitySearchFilters = Depends(),
+    admin_user: User = Depends(require_admin),
+):
+    """
+    Export activities matching the filters as NDJSON or CSV (admin only).
+
+    Unpublished activities are included. Rows are streamed in listing order.
+    """
+    query = _apply_filters(select(Activity), filters).order_by(
+        *[key.desc() for key in LISTING_SORT_KEYS]
     )
+    return stream_export(query, Activity.to_dict, format, "activities", EXPORT_COLUMNS)
+
+
+# Activity detail is identical for every caller; writes clear it
+ACTIVITY_CACHE = ResponseCache("activity_detail", ttl=300)
+
+
+@router.get("/{activity_id}", response_model=ApiResponse[ActivityResponse])
+async def get_activity(
+    activity_id: str,
+    request: Request,
+):
+    """
+    Get activity by ID.
+    """
+
+    async def render():
+        catalog = get_catalog()
+        if catalog is not None:
+            activity = catalog.get(activity_id)
+            if not activity:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found"
+                )
+
+            return ApiResponse(
+                success=True,
+                data=ActivityResponse.parse_obj(activity),
+                message="Activity retrieved successfully",
+            )
+
+        # Own session: the render is shared with concurrent requests and may
+        # outlive the session of the request that started it
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Activity).where(
+                    and_(Activity.id == activity_id, Activity.is_published == True)
+                )
+            )
+            activity = result.scalar_one_or_none()
+
+            if not activity:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found"
+                )
+
+            return ApiResponse(
+                success=True,
+                data=ActivityResponse.from_orm(activity),
+                message="Activity retrieved successfully",
+            )
+
+    return await ACTIVITY_CACHE.serve(request, render)
 
 
 @router.put("/{activity_id}", response_model=ApiResponse[ActivityResponse])
 async def update_activity(
     activity_id: str,
     activity_update: ActivityUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db_session),
 ):
@@ -176,6 +535,7 @@ async def update_activity(
 
     await db.commit()
     await db.refresh(activity)
+    await _on_catalog_write(background_tasks, activity.id)
 
     return ApiResponse(
         success=True,
@@ -187,6 +547,7 @@ async def update_activity(
 @router.delete("/{activity_id}", response_model=ApiResponse[dict])
 async def delete_activity(
     activity_id: str,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db_session),
 ):
@@ -210,6 +571,7 @@ async def delete_activity(
 
     await db.delete(activity)
     await db.commit()
+    await _on_catalog_write(background_tasks, activity.id)
 
     return ApiResponse(
         success=True,
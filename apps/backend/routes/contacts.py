@@ -4,7 +4,7 @@ Contact management routes for contact form submissions and communications.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, or_
 
 from ..database import get_db_session
 from ..models.user import User
@@ -16,12 +16,56 @@ from ..schemas.contact import (
     ContactListResponse,
     ContactFilters,
 )
-from ..schemas.common import ApiResponse, PaginationParams, PaginatedResponse
+from ..schemas.common import (
+    ApiResponse,
+    ExportFormat,
+    PaginationParams,
+    PaginatedResponse,
+)
 from ..auth.dependencies import get_current_active_user, require_admin
+from .export import stream_export
+from .pagination import fetch_page, schema_columns
 
 
 router = APIRouter()
 
+# Columns of a listing row; messages and JSON metadata are not loaded
+LIST_COLUMNS = schema_columns(Contact, ContactListResponse)
+
+# Export columns: every field of Contact.to_dict(), in order
+EXPORT_COLUMNS = tuple(Contact().to_dict())
+
+
+def _apply_filters(query, filters: ContactFilters):
+    """Apply search filters to a contact query."""
+    if filters.contact_type:
+        query = query.where(Contact.contact_type == filters.contact_type)
+
+    if filters.status:
+        query = query.where(Contact.status == filters.status)
+
+    if filters.priority:
+        query = query.where(Contact.priority == filters.priority)
+
+    if filters.assigned_to:
+        query = query.where(Contact.assigned_to == filters.assigned_to)
+
+    if filters.is_responded is not None:
+        query = query.where(Contact.is_responded == filters.is_responded)
+
+    if filters.search:
+        search_term = f"%{filters.search.lower()}%"
+        query = query.where(
+            or_(
+                Contact.name.ilike(search_term),
+                Contact.email.ilike(search_term),
+                Contact.subject.ilike(search_term),
+                Contact.message.ilike(search_term),
+            )
+        )
+
+    return query
+
 
 @router.post("/", response_model=ApiResponse[ContactResponse])
 async def create_contact(
@@ -56,55 +100,38 @@ async def list_contacts(
     List contact requests with filtering (admin only).
     """
     # Build query with filters
-    query = select(Contact)
-
-    if filters.contact_type:
-        query = query.where(Contact.contact_type == filters.contact_type)
+    query = _apply_filters(select(*LIST_COLUMNS), filters)
 
-    if filters.status:
-        query = query.where(Contact.status == filters.status)
-
-    if filters.priority:
-        query = query.where(Contact.priority == filters.priority)
-
-    if filters.assigned_to:
-        query = query.where(Contact.assigned_to == filters.assigned_to)
+    # Get a page of contacts and its total
+    page = await fetch_page(db, query, pagination, [Contact.created_at, Contact.id])
 
-    if filters.is_responded is not None:
-        query = query.where(Contact.is_responded == filters.is_responded)
-
-    if filters.search:
-        search_term = f"%{filters.search.lower()}%"
-        query = query.where(
-            or_(
-                Contact.name.ilike(search_term),
-                Contact.email.ilike(search_term),
-                Contact.subject.ilike(search_term),
-                Contact.message.ilike(search_term),
-            )
-        )
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
-
-    # Get contacts with pagination
-    contacts_result = await db.execute(
-        query.offset(pagination.offset)
-        .limit(pagination.size)
-        .order_by(Contact.created_at.desc())
+    contact_responses = [
+        ContactListResponse.parse_obj(row._mapping) for row in page.rows
+    ]
+    paginated_data = PaginatedResponse.create(
+        contact_responses, page.total, pagination, page.next_cursor
     )
-    contacts = contacts_result.scalars().all()
-
-    contact_responses = [ContactListResponse.from_orm(contact) for contact in contacts]
-    paginated_data = PaginatedResponse.create(contact_responses, total, pagination)
 
     return ApiResponse(
         success=True, data=paginated_data, message="Contacts retrieved successfully"
     )
 
 
+@router.get("/export")
+async def export_contacts(
+    format: ExportFormat = ExportFormat.NDJSON,
+    filters: ContactFilters = Depends(),
+    admin_user: User = Depends(require_admin),
+):
+    """
+    Export contact requests matching the filters as NDJSON or CSV (admin only).
+    """
+    query = _apply_filters(select(Contact), filters).order_by(
+        Contact.created_at.desc(), Contact.id.desc()
+    )
+    return stream_export(query, Contact.to_dict, format, "contacts", EXPORT_COLUMNS)
+
+
 @router.get("/{contact_id}", response_model=ApiResponse[ContactResponse])
 async def get_contact(
     contact_id: str,
@@ -2,11 +2,17 @@
 Guide endpoint for AI-powered assistance with robust OpenAI client initialization.
 """
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional, Tuple
+import json
 import logging
-import os
-from config import settings
+import time
+from ..common.single_flight import SingleFlight
+from ..config import settings
+from ..services.ai_client import ai_available, ai_circuit, chat_completion, stream_chat_completion
+from ..services.circuit_breaker import CircuitState
+from ..services.suggestion_cache import normalize_text
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -22,30 +28,97 @@ class GuideResponse(BaseModel):
     confidence: Optional[float] = None
     sources: Optional[list[str]] = None
 
-def get_openai_client():
-    """Initialize OpenAI client at call time with error handling."""
-    api_key = os.environ.get('OPENAI_API_KEY')
-    if not api_key:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="OpenAI service unavailable: API key not configured"
-        )
-    
-    try:
-        # Import OpenAI only when needed to avoid boot crashes
-        from openai import OpenAI
-        return OpenAI(api_key=api_key)
-    except ImportError:
-        logger.error("OpenAI package not installed")
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="OpenAI service unavailable: package not installed"
+SYSTEM_PROMPT = """
+You are an expert guide for sustainable living, gardening, and permaculture practices. 
+Provide helpful, practical advice in French for questions about:
+- Sustainable living and ecological practices
+- Gardening, permaculture, and soil management
+- Local community initiatives and rural development
+- Environmental conservation and biodiversity
+
+Respond in a friendly, informative manner with specific, actionable advice.
+"""
+
+MODEL = "gpt-3.5-turbo"
+AI_CONFIDENCE = 0.8
+AI_SOURCES = ["OpenAI GPT-3.5-turbo", "La Vida Luca AI Assistant"]
+FALLBACK_CONFIDENCE = 0.3
+FALLBACK_SOURCES = ["La Vida Luca Fallback System"]
+
+def guide_messages(question: str) -> list[dict]:
+    """Build the chat messages for a guide question."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": question}
+    ]
+
+def fallback_answer(question: str) -> str:
+    """General advice returned when the model is unavailable."""
+    return f"""
+Merci pour votre question : \"{question}\"
+
+Je rencontre actuellement des difficultés techniques avec le service IA. 
+En attendant, voici quelques conseils généraux :
+
+Pour le jardinage et la permaculture :
+• Connaître son sol (pH, composition)
+• Choisir des plantes adaptées au climat local
+• Pratiquer la rotation des cultures
+• Utiliser le compost et la matière organique
+• Préserver la biodiversité
+
+Pour la vie durable :
+• Réduire, réutiliser, recycler
+• Privilégier les circuits courts
+• Économiser l'eau et l'énergie
+• Favoriser les transports doux
+
+N'hésitez pas à reposer votre question plus tard !
+"""
+
+# Identical questions asked together (e.g. a class following a projected
+# guide) share one model call, and answers are reused for a grace window
+GUIDE_FLIGHTS = SingleFlight()
+GRACE_SECONDS = 10.0
+_recent_answers: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+def guide_key(request: GuideRequest) -> Tuple[str, str]:
+    """Identify a question for coalescing."""
+    return normalize_text(request.question), normalize_text(request.context or "")
+
+async def ask_model(request: GuideRequest) -> str:
+    """Get the model's answer, sharing identical concurrent or recent calls."""
+    key = guide_key(request)
+    recent = _recent_answers.get(key)
+    if recent is not None and recent[0] > time.monotonic():
+        return recent[1]
+
+    async def complete() -> str:
+        answer = await chat_completion(
+            model=MODEL,
+            messages=guide_messages(request.question),
+            max_tokens=500,
+            temperature=0.7,
+            request_type="guide",
         )
-    except Exception as e:
-        logger.error(f"Failed to initialize OpenAI client: {str(e)}")
+        now = time.monotonic()
+        for stale in [k for k, (until, _) in _recent_answers.items() if until <= now]:
+            del _recent_answers[stale]
+        _recent_answers[key] = (now + GRACE_SECONDS, answer)
+        return answer
+
+    return await GUIDE_FLIGHTS.do(key, complete)
+
+def sse_event(event: str, data: dict) -> str:
+    """Encode a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def ensure_openai_available():
+    """Fail with 503 when no OpenAI API key is configured."""
+    if not ai_available():
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="OpenAI service unavailable: initialization failed"
+            detail="OpenAI service unavailable: API key not configured"
         )
 
 @router.post("/guide", response_model=GuideResponse)
@@ -60,85 +133,81 @@ async def get_guide(request: GuideRequest):
     - Environmental conservation
     """
     try:
-        # Initialize OpenAI client at call time
-        client = get_openai_client()
+        ensure_openai_available()
         
-        # Prepare the system prompt
-        system_prompt = """
-You are an expert guide for sustainable living, gardening, and permaculture practices. 
-Provide helpful, practical advice in French for questions about:
-- Sustainable living and ecological practices
-- Gardening, permaculture, and soil management
-- Local community initiatives and rural development
-- Environmental conservation and biodiversity
-
-Respond in a friendly, informative manner with specific, actionable advice.
-"""
-        
-        # Make OpenAI API call
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": request.question}
-            ],
-            max_tokens=500,
-            temperature=0.7
-        )
-        
-        answer = response.choices[0].message.content
+        # Make OpenAI API call on the shared async client, coalesced with
+        # identical questions
+        answer = await ask_model(request)
         
         return GuideResponse(
             answer=answer,
-            confidence=0.8,
-            sources=["OpenAI GPT-3.5-turbo", "La Vida Luca AI Assistant"]
+            confidence=AI_CONFIDENCE,
+            sources=AI_SOURCES
         )
         
     except HTTPException:
-        # Re-raise HTTP exceptions (like 503 from get_openai_client)
+        # Re-raise HTTP exceptions (like 503 from ensure_openai_available)
         raise
     except Exception as e:
         logger.error(f"Error in guide endpoint: {str(e)}")
         # Fall back to basic response if OpenAI fails
-        fallback_answer = f"""
-Merci pour votre question : \"{request.question}\"
+        return GuideResponse(
+            answer=fallback_answer(request.question),
+            confidence=FALLBACK_CONFIDENCE,
+            sources=FALLBACK_SOURCES
+        )
 
-Je rencontre actuellement des difficultés techniques avec le service IA. 
-En attendant, voici quelques conseils généraux :
+@router.post("/guide/stream")
+async def stream_guide(request: GuideRequest):
+    """
+    Stream AI-powered guidance as Server-Sent Events.
 
-Pour le jardinage et la permaculture :
-• Connaître son sol (pH, composition)
-• Choisir des plantes adaptées au climat local
-• Pratiquer la rotation des cultures
-• Utiliser le compost et la matière organique
-• Préserver la biodiversité
+    Same question as ``POST /guide``, answered token by token:
+    - ``delta`` events carry ``{"content": ...}`` chunks of the answer
+    - ``fallback`` carries the whole fallback answer if the model fails; it
+      replaces any partial answer already received
+    - ``done`` ends the stream with ``confidence`` and ``sources``
+    """
+    ensure_openai_available()
 
-Pour la vie durable :
-• Réduire, réutiliser, recycler
-• Privilégier les circuits courts
-• Économiser l'eau et l'énergie
-• Favoriser les transports doux
+    async def events():
+        try:
+            async for delta in stream_chat_completion(
+                model=MODEL,
+                messages=guide_messages(request.question),
+                max_tokens=500,
+                temperature=0.7,
+                request_type="guide",
+            ):
+                yield sse_event("delta", {"content": delta})
+        except Exception as e:
+            logger.error(f"Error in guide stream: {str(e)}")
+            yield sse_event("fallback", {"content": fallback_answer(request.question)})
+            yield sse_event("done", {"confidence": FALLBACK_CONFIDENCE, "sources": FALLBACK_SOURCES})
+            return
 
-N'hésitez pas à reposer votre question plus tard !
-"""
-        
-        return GuideResponse(
-            answer=fallback_answer,
-            confidence=0.3,
-            sources=["La Vida Luca Fallback System"]
-        )
+        yield sse_event("done", {"confidence": AI_CONFIDENCE, "sources": AI_SOURCES})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/guide/health")
 async def guide_health():
     """Health check for guide service without external dependencies."""
-    api_key_configured = bool(os.environ.get('OPENAI_API_KEY'))
+    api_key_configured = ai_available()
+    circuit_state = ai_circuit.state
     
     return {
         "status": "healthy",
         "service": "guide",
         "timestamp": "2025-09-04T20:32:00Z",
         "api_key_configured": api_key_configured,
-        "openai_available": api_key_configured
+        "openai_available": api_key_configured and circuit_state != CircuitState.OPEN,
+        "circuit_state": circuit_state.value
     }
 
 @router.get("/health")
@@ -0,0 +1,208 @@
+"""
+Pagination helpers shared by the list routes.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from ..schemas.common import (
+    PaginationParams,
+    TotalMode,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class Page(NamedTuple):
+    """One page of a listing query."""
+
+    rows: List[Row]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a select statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_count(db: AsyncSession, query) -> int:
+    """Get the planner's row estimate for a query without running it."""
+    result = await db.execute(_Explain(query))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def schema_columns(model, schema) -> List[Any]:
+    """
+    Get the model columns a response schema is built from.
+
+    Listing queries select only these columns instead of whole entities, so
+    wide text and JSON columns are neither transferred nor hydrated, and the
+    rows map onto the schema without going through the identity map.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def parse_cursor(cursor: str, sort_keys: Sequence[Any]) -> List[Any]:
+    """
+    Decode a cursor into typed values for the given sort keys.
+
+    Raises:
+        HTTPException: If the cursor is malformed, holds values that do not
+            fit the sort keys or was issued for another sort order
+    """
+    try:
+        values = decode_cursor(cursor)
+        if len(values) != len(sort_keys):
+            raise ValueError("Cursor does not match the sort order")
+        return [_coerce(key, value) for key, value in zip(sort_keys, values)]
+    except (TypeError, ValueError, NotImplementedError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def _coerce(key: Any, value: Any) -> Any:
+    """
+    Convert a JSON cursor value back to the sort key's Python type.
+
+    Values are compared with the listing's own keys, in SQL and against the
+    catalog snapshot, so anything that would not compare cleanly is refused.
+
+    Raises:
+        ValueError: If the value does not fit the sort key
+    """
+    python_type = key.type.python_type
+    if value is None:
+        if not getattr(key, "nullable", False):
+            raise ValueError("Cursor value is missing")
+        return value
+
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError("Cursor date is not a string")
+        value = datetime.fromisoformat(value)
+        # Aware and naive datetimes do not compare
+        if getattr(key.type, "timezone", False) != (value.tzinfo is not None):
+            raise ValueError("Cursor date does not match the column's time zone")
+        return value
+    if python_type is uuid.UUID:
+        if not isinstance(value, str):
+            raise ValueError("Cursor ID is not a string")
+        return uuid.UUID(value)
+
+    # bool is an int: only boolean keys take booleans
+    if isinstance(value, bool) != (python_type is bool):
+        raise ValueError("Cursor value has the wrong type")
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, python_type):
+        raise ValueError("Cursor value has the wrong type")
+    return value
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query,
+    pagination: PaginationParams,
+    sort_keys: Sequence[Any],
+) -> Page:
+    """
+    Fetch one page of a query ordered by descending sort keys, with its total.
+
+    With a cursor, the page starts right after the row the cursor was issued
+    for, using a row-value comparison that an index on the sort keys can
+    serve, so deep pages cost the same as the first one. Without a cursor the
+    page/size offset is used. Either way a cursor for the next page is
+    returned when there are more rows.
+
+    In offset mode the exact total comes from ``count(*) OVER ()`` in the
+    page query itself, so the filter is evaluated once in one round trip.
+    A cursor hides the rows before it from the window, so cursor pages that
+    ask for an exact total run a separate count; ``total=estimate`` asks the
+    planner instead and ``total=none`` skips counting.
+
+    Args:
+        db: Database session
+        query: Filtered select statement, without ordering or limits
+        pagination: Pagination parameters
+        sort_keys: Columns the listing is ordered by, all descending, ending
+            with a unique column
+
+    Returns:
+        Rows of the page, the total and the cursor for the next page, if any
+    """
+    total = None
+    if pagination.total == TotalMode.ESTIMATE:
+        total = await estimate_count(db, query)
+    elif pagination.total == TotalMode.EXACT and pagination.cursor:
+        total = await _exact_count(db, query)
+
+    count_in_page = pagination.total == TotalMode.EXACT and not pagination.cursor
+    page_query = query
+    if pagination.cursor:
+        values = parse_cursor(pagination.cursor, sort_keys)
+        page_query = page_query.where(
+            tuple_(*sort_keys)
+            < tuple_(*[literal(v, type_=k.type) for k, v in zip(sort_keys, values)])
+        )
+    else:
+        page_query = page_query.offset(pagination.offset)
+
+    labels = [f"_sort_key_{i}" for i in range(len(sort_keys))]
+    page_query = page_query.add_columns(
+        *[key.label(name) for key, name in zip(sort_keys, labels)]
+    )
+    if count_in_page:
+        page_query = page_query.add_columns(func.count().over().label("_total_count"))
+    page_query = page_query.order_by(*[key.desc() for key in sort_keys]).limit(
+        pagination.size + 1
+    )
+
+    result = await db.execute(page_query)
+    rows = result.all()
+
+    if count_in_page:
+        if rows:
+            total = rows[0]._mapping["_total_count"]
+        elif pagination.offset == 0:
+            total = 0
+        else:
+            # Past the last page: the window had no rows to report on
+            total = await _exact_count(db, query)
+
+    next_cursor = None
+    if len(rows) > pagination.size:
+        rows = rows[: pagination.size]
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor([last[name] for name in labels])
+
+    return Page(rows, total, next_cursor)
+
+
+async def _exact_count(db: AsyncSession, query) -> int:
+    """Count the rows of a query."""
+    result = await db.execute(select(func.count()).select_from(query.subquery()))
+    return result.scalar()
@@ -3,31 +3,134 @@ AI-powered activity suggestions routes using OpenAI integration.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, literal_column, Float
 import openai
 
-from ..database import get_db_session
+from ..database import get_db_session, AsyncSessionLocal
 from ..models.user import User
-from ..models.activity import Activity
+from ..models.activity import Activity, SEARCH_CONFIG
+from ..models.similarity import ActivitySimilarity
 from ..schemas.common import ApiResponse
+from ..schemas.suggestion import SuggestionMode, SuggestionJobResponse
 from ..auth.dependencies import get_current_active_user
 from ..config import settings
 from ..services.openai_service import get_activity_suggestions, SuggestionRequest
+from ..services.catalog import get_catalog
+from ..services.retrieval import profile_query
+from ..services.response_cache import ResponseCache
+from ..services.job_queue import Job, JobQueue, QueueFullError
 
 
 router = APIRouter()
 
+# Activities loaded for suggestions when the catalog snapshot is unavailable:
+# the best full-text matches of the request, completed with featured and
+# recent activities
+FALLBACK_CATALOG_SIZE = 500
 
-@router.post("/", response_model=ApiResponse[List[dict]])
+# Background suggestion generation, started by the application lifespan
+SUGGESTION_JOBS = JobQueue(
+    "suggestions",
+    workers=settings.SUGGESTION_JOB_WORKERS,
+    max_queued=settings.SUGGESTION_JOB_QUEUE_SIZE,
+    result_ttl=settings.SUGGESTION_JOB_RESULT_TTL_SECONDS,
+)
+JOB_RETRY_AFTER_SECONDS = 5
+
+
+async def _generate_suggestions(
+    user_profile: dict, request: SuggestionRequest, db: AsyncSession
+) -> List[dict]:
+    """Generate suggestions from the catalog snapshot, or the database."""
+    # Get available activities; snapshots come with their retrieval and
+    # scoring indexes
+    catalog = get_catalog()
+    if catalog is not None:
+        available_activities = catalog.activities
+    else:
+        available_activities = await _load_candidates(
+            db, user_profile, request.request, FALLBACK_CATALOG_SIZE
+        )
+
+    # Generate suggestions using OpenAI
+    return await get_activity_suggestions(
+        user_profile=user_profile,
+        user_request=request.request,
+        available_activities=available_activities,
+        max_suggestions=request.max_suggestions,
+        catalog=catalog,
+    )
+
+
+async def _load_candidates(
+    db: AsyncSession, user_profile: dict, user_request: str, limit: int
+) -> List[dict]:
+    """
+    Load the published activities most relevant to a request.
+
+    Activities are ranked in the database by full-text relevance to the
+    request and the profile's skills and interests, so the best matches are
+    kept however large the catalog is; when fewer than ``limit`` match, the
+    list is completed with featured then recent activities.
+    """
+    activities = []
+    terms = profile_query(user_request, user_profile)
+    if terms:
+        # Any term may match: websearch syntax ORs them, served by the GIN
+        # index on the generated search_vector column
+        query = func.websearch_to_tsquery(
+            literal_column(f"'{SEARCH_CONFIG}'::regconfig"), " or ".join(terms)
+        )
+        result = await db.execute(
+            select(Activity)
+            .where(
+                Activity.is_published == True,
+                Activity.search_vector.op("@@")(query),
+            )
+            .order_by(
+                func.ts_rank_cd(Activity.search_vector, query, type_=Float).desc(),
+                Activity.id,
+            )
+            .limit(limit)
+        )
+        activities = list(result.scalars().all())
+
+    if len(activities) < limit:
+        fill = (
+            select(Activity)
+            .where(Activity.is_published == True)
+            .order_by(Activity.is_featured.desc(), Activity.created_at.desc())
+            .limit(limit - len(activities))
+        )
+        if activities:
+            fill = fill.where(Activity.id.notin_([a.id for a in activities]))
+        result = await db.execute(fill)
+        activities.extend(result.scalars().all())
+
+    return [activity.to_dict() for activity in activities]
+
+
+@router.post(
+    "/",
+    response_model=ApiResponse[List[dict]],
+    responses={202: {"model": ApiResponse[SuggestionJobResponse]}},
+)
 async def get_personalized_suggestions(
     request: SuggestionRequest,
+    http_request: Request,
+    mode: SuggestionMode = Query(SuggestionMode.SYNC),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db_session),
 ):
     """
     Get personalized activity suggestions using AI.
+
+    With ``mode=async`` the generation runs in a background job: the response
+    is ``202`` with the job, to poll at ``GET /jobs/{job_id}``.
     """
     if not settings.OPENAI_API_KEY:
         raise HTTPException(
@@ -35,24 +138,43 @@ async def get_personalized_suggestions(
             detail="AI suggestions service is not available",
         )
 
-    try:
-        # Get user's profile for personalization
-        user_profile = current_user.profile or {}
+    # Get user's profile for personalization
+    user_profile = current_user.profile or {}
+
+    if mode == SuggestionMode.ASYNC:
 
-        # Get available activities from database
-        activities_result = await db.execute(
-            select(Activity).where(Activity.is_published == True)
+        async def run():
+            # The job outlives the request and its session
+            async with AsyncSessionLocal() as session:
+                return await _generate_suggestions(user_profile, request, session)
+
+        try:
+            job = SUGGESTION_JOBS.submit(current_user.id, run)
+        except QueueFullError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many pending suggestion jobs, retry later",
+                headers={"Retry-After": str(JOB_RETRY_AFTER_SECONDS)},
+            )
+
+        body = ApiResponse(
+            success=True,
+            data=_job_response(job),
+            message="Suggestion job queued",
         )
-        activities = activities_result.scalars().all()
-
-        # Generate suggestions using OpenAI
-        suggestions = await get_activity_suggestions(
-            user_profile=user_profile,
-            user_request=request.request,
-            available_activities=[activity.to_dict() for activity in activities],
-            max_suggestions=request.max_suggestions,
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(body),
+            headers={
+                "Location": str(
+                    http_request.url_for("get_suggestion_job", job_id=job.id)
+                )
+            },
         )
 
+    try:
+        suggestions = await _generate_suggestions(user_profile, request, db)
+
         return ApiResponse(
             success=True, data=suggestions, message="Suggestions generated successfully"
         )
@@ -64,99 +186,190 @@ async def get_personalized_suggestions(
         )
 
 
-@router.get("/featured", response_model=ApiResponse[List[dict]])
-async def get_featured_suggestions(
-    limit: int = Query(5, ge=1, le=20), db: AsyncSession = Depends(get_db_session)
+@router.get("/jobs/{job_id}", response_model=ApiResponse[SuggestionJobResponse])
+async def get_suggestion_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
 ):
     """
-    Get featured activities as suggestions (no authentication required).
+    Get the state of a suggestion job, with the suggestions once it succeeded.
+
+    Finished jobs are kept for ``SUGGESTION_JOB_RESULT_TTL_SECONDS``.
     """
-    activities_result = await db.execute(
-        select(Activity)
-        .where(Activity.is_published == True, Activity.is_featured == True)
-        .limit(limit)
-        .order_by(Activity.created_at.desc())
-    )
-    activities = activities_result.scalars().all()
-
-    suggestions = []
-    for activity in activities:
-        suggestions.append(
-            {
-                "activity": activity.to_dict(),
-                "score": 1.0,  # Featured activities get max score
-                "reasons": [
-                    "Activité mise en avant",
-                    "Recommandée par l'équipe La Vida Luca",
-                ],
-            }
+    job = SUGGESTION_JOBS.get(job_id)
+    if job is None or job.owner != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Suggestion job not found",
         )
 
     return ApiResponse(
         success=True,
-        data=suggestions,
-        message="Featured suggestions retrieved successfully",
+        data=_job_response(job),
+        message="Suggestion job retrieved successfully",
+    )
+
+
+def _job_response(job: Job) -> SuggestionJobResponse:
+    return SuggestionJobResponse(
+        id=job.id,
+        status=job.status,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error,
     )
 
 
+# Anonymous catalog views, identical for every caller
+FEATURED_CACHE = ResponseCache("featured_suggestions", ttl=300)
+SIMILAR_CACHE = ResponseCache("similar_activities", ttl=300)
+
+
+@router.get("/featured", response_model=ApiResponse[List[dict]])
+async def get_featured_suggestions(
+    request: Request,
+    limit: int = Query(5, ge=1, le=20),
+):
+    """
+    Get featured activities as suggestions (no authentication required).
+    """
+
+    async def render():
+        catalog = get_catalog()
+        if catalog is not None:
+            activities = catalog.featured(limit)
+        else:
+            # Own session: the render is shared with concurrent requests and
+            # may outlive the session of the request that started it
+            async with AsyncSessionLocal() as db:
+                activities_result = await db.execute(
+                    select(Activity)
+                    .where(Activity.is_published == True, Activity.is_featured == True)
+                    .limit(limit)
+                    .order_by(Activity.created_at.desc())
+                )
+                activities = [
+                    activity.to_dict() for activity in activities_result.scalars().all()
+                ]
+
+        suggestions = []
+        for activity in activities:
+            suggestions.append(
+                {
+                    "activity": activity,
+                    "score": 1.0,  # Featured activities get max score
+                    "reasons": [
+                        "Activité mise en avant",
+                        "Recommandée par l'équipe La Vida Luca",
+                    ],
+                }
+            )
+
+        return ApiResponse(
+            success=True,
+            data=suggestions,
+            message="Featured suggestions retrieved successfully",
+        )
+
+    return await FEATURED_CACHE.serve(request, render)
+
+
 @router.get("/similar/{activity_id}", response_model=ApiResponse[List[dict]])
 async def get_similar_activities(
     activity_id: str,
+    request: Request,
     limit: int = Query(5, ge=1, le=10),
-    db: AsyncSession = Depends(get_db_session),
 ):
     """
-    Get activities similar to a specific activity.
+    Get activities similar to a specific activity, from the precomputed
+    similarity index.
     """
-    # Get the reference activity
-    result = await db.execute(
-        select(Activity).where(
-            Activity.id == activity_id, Activity.is_published == True
-        )
-    )
-    reference_activity = result.scalar_one_or_none()
 
-    if not reference_activity:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Activity not found"
-        )
+    async def render():
+        # Own session: the render is shared with concurrent requests and may
+        # outlive the session of the request that started it
+        async with AsyncSessionLocal() as db:
+            catalog = get_catalog()
+            if catalog is not None:
+                reference_activity = catalog.get(activity_id)
 
-    # Find similar activities based on category and tags
-    similar_result = await db.execute(
-        select(Activity)
-        .where(
-            Activity.is_published == True,
-            Activity.id != activity_id,
-            Activity.category == reference_activity.category,
-        )
-        .limit(limit)
-        .order_by(Activity.created_at.desc())
-    )
-    similar_activities = similar_result.scalars().all()
+                if not reference_activity:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Activity not found",
+                    )
 
-    suggestions = []
-    for activity in similar_activities:
-        # Calculate similarity score based on shared tags
-        shared_tags = set(activity.skill_tags or []) & set(
-            reference_activity.skill_tags or []
-        )
-        score = min(0.5 + (len(shared_tags) * 0.1), 1.0)
+                # Precomputed neighbours, in rank order
+                result = await db.execute(
+                    select(ActivitySimilarity.neighbour_id, ActivitySimilarity.score)
+                    .where(ActivitySimilarity.activity_id == reference_activity["id"])
+                    .order_by(ActivitySimilarity.rank)
+                    .limit(limit)
+                )
+                neighbours = [
+                    (catalog.get(str(neighbour_id)), score)
+                    for neighbour_id, score in result
+                ]
+            else:
+                result = await db.execute(
+                    select(Activity).where(
+                        Activity.id == activity_id, Activity.is_published == True
+                    )
+                )
+                reference = result.scalar_one_or_none()
+
+                if not reference:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Activity not found",
+                    )
+
+                result = await db.execute(
+                    select(Activity, ActivitySimilarity.score)
+                    .join(
+                        ActivitySimilarity,
+                        ActivitySimilarity.neighbour_id == Activity.id,
+                    )
+                    .where(
+                        ActivitySimilarity.activity_id == reference.id,
+                        Activity.is_published == True,
+                    )
+                    .order_by(ActivitySimilarity.rank)
+                    .limit(limit)
+                )
+                reference_activity = reference.to_dict()
+                neighbours = [(activity.to_dict(), score) for activity, score in result]
+
+        suggestions = []
+        for activity, score in neighbours:
+            if activity is None:
+                # Unpublished since the index was updated
+                continue
 
-        reasons = [f"Même catégorie: {activity.category}"]
-        if shared_tags:
-            reasons.append(
-                f"Compétences similaires: {', '.join(list(shared_tags)[:3])}"
+            reasons = []
+            if activity["category"] == reference_activity["category"]:
+                reasons.append(f"Même catégorie: {activity['category']}")
+
+            shared_tags = set(activity["skill_tags"]) & set(
+                reference_activity["skill_tags"]
             )
+            if shared_tags:
+                reasons.append(
+                    f"Compétences similaires: {', '.join(sorted(shared_tags)[:3])}"
+                )
 
-        suggestions.append(
-            {"activity": activity.to_dict(), "score": score, "reasons": reasons}
-        )
+            if activity["difficulty_level"] == reference_activity["difficulty_level"]:
+                reasons.append("Même niveau de difficulté")
 
-    # Sort by score descending
-    suggestions.sort(key=lambda x: x["score"], reverse=True)
+            suggestions.append(
+                {"activity": activity, "score": round(score, 2), "reasons": reasons}
+            )
 
-    return ApiResponse(
-        success=True,
-        data=suggestions,
-        message="Similar activities retrieved successfully",
-    )
+        return ApiResponse(
+            success=True,
+            data=suggestions,
+            message="Similar activities retrieved successfully",
+        )
+
+    return await SIMILAR_CACHE.serve(request, render)
@@ -2,15 +2,17 @@
 User management routes for profile and user operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from ..database import get_db_session
 from ..models.user import User
 from ..schemas.user import UserUpdate, UserResponse, UserListResponse
 from ..schemas.common import ApiResponse, PaginationParams, PaginatedResponse
 from ..auth.dependencies import get_current_active_user, require_admin
+from ..http_cache import make_etag, etag_matches, not_modified, set_etag
+from .pagination import fetch_page
 
 
 router = APIRouter()
@@ -18,11 +20,20 @@ router = APIRouter()
 
 @router.get("/me", response_model=ApiResponse[UserResponse])
 async def get_current_user_profile(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Get current user's profile information.
     """
+    etag = make_etag(
+        "user", current_user.id, current_user.updated_at, current_user.last_login
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control="private, no-cache")
+    set_etag(response, etag, cache_control="private, no-cache")
+
     return ApiResponse(
         success=True,
         data=UserResponse.from_orm(current_user),
@@ -90,21 +101,13 @@ async def list_users(
     """
     List all users (admin only).
     """
-    # Get total count
-    count_result = await db.execute(select(func.count(User.id)))
-    total = count_result.scalar()
-
-    # Get users with pagination
-    result = await db.execute(
-        select(User)
-        .offset(pagination.offset)
-        .limit(pagination.size)
-        .order_by(User.created_at.desc())
-    )
-    users = result.scalars().all()
+    # Get a page of users and its total
+    page = await fetch_page(db, select(User), pagination, [User.created_at, User.id])
 
-    user_responses = [UserListResponse.from_orm(user) for user in users]
-    paginated_data = PaginatedResponse.create(user_responses, total, pagination)
+    user_responses = [UserListResponse.from_orm(row[0]) for row in page.rows]
+    paginated_data = PaginatedResponse.create(
+        user_responses, page.total, pagination, page.next_cursor
+    )
 
     return ApiResponse(
         success=True, data=paginated_data, message="Users retrieved successfully"
@@ -6,6 +6,7 @@ from .auth import *
 from .user import *
 from .activity import *
 from .contact import *
+from .suggestion import *
 from .common import *
 
 __all__ = [
@@ -31,6 +32,9 @@ __all__ = [
     "ContactCreate",
     "ContactUpdate",
     "ContactResponse",
+    # Suggestion schemas
+    "SuggestionMode",
+    "SuggestionJobResponse",
     # Common schemas
     "ApiResponse",
     "ErrorResponse",
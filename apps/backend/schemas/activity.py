@@ -4,7 +4,7 @@ Activity schemas for educational activities and learning experiences.
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, Field, UUID4, validator
+from pydantic import AliasChoices, BaseModel, Field, UUID4, validator
 from enum import Enum
 
 
@@ -28,6 +28,13 @@ class LocationType(str, Enum):
     MIXED = "mixed"
 
 
+class TagMatch(str, Enum):
+    """How tag filters combine."""
+
+    ALL = "all"  # Activity has every requested tag
+    ANY = "any"  # Activity has at least one requested tag
+
+
 class ActivityBase(BaseModel):
     """Base activity schema."""
 
@@ -133,7 +140,9 @@ class ActivityResponse(BaseModel):
     keywords: List[str]
     season_tags: List[str]
     external_resources: Dict[str, Any]
-    metadata: Dict[str, Any]
+    metadata: Dict[str, Any] = Field(
+        validation_alias=AliasChoices("extra_metadata", "metadata")
+    )
     created_at: Optional[datetime]
     updated_at: Optional[datetime]
 
@@ -141,6 +150,19 @@ class ActivityResponse(BaseModel):
         from_attributes = True
 
 
+class ActivityBatchGetRequest(BaseModel):
+    """IDs of the activities to fetch in one request."""
+
+    ids: List[UUID4] = Field(..., min_length=1, max_length=100)
+
+
+class ActivityBatchGetResponse(BaseModel):
+    """Activities found for a batch of IDs, in request order."""
+
+    items: List[ActivityResponse]
+    missing: List[UUID4]  # Unknown or unpublished IDs
+
+
 class ActivityListResponse(BaseModel):
     """Activity list response schema (minimal info for listings)."""
 
@@ -171,6 +193,7 @@ class ActivitySearchFilters(BaseModel):
     keywords: Optional[str] = None
     location_type: Optional[LocationType] = None
     season_tags: Optional[List[str]] = None
+    tag_match: TagMatch = TagMatch.ALL
     is_featured: Optional[bool] = None
 
     @validator("max_duration")
@@ -184,3 +207,37 @@ class ActivitySearchFilters(BaseModel):
             if v < values["min_duration"]:
                 raise ValueError("max_duration must be >= min_duration")
         return v
+
+
+class ActivityFacets(BaseModel):
+    """Activity counts per facet value for a filtered set of activities."""
+
+    total: int
+    category: Dict[str, int] = Field(default_factory=dict)
+    difficulty_level: Dict[int, int] = Field(default_factory=dict)
+    safety_level: Dict[int, int] = Field(default_factory=dict)
+    location_type: Dict[str, int] = Field(default_factory=dict)
+    season_tags: Dict[str, int] = Field(default_factory=dict)
+
+
+class ActivityImportFormat(str, Enum):
+    """Upload formats accepted by the bulk import."""
+
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+class ActivityImportRowError(BaseModel):
+    """A rejected row of a bulk import."""
+
+    row: int  # Line number in the upload (1-based)
+    error: str
+
+
+class ActivityImportResult(BaseModel):
+    """Outcome of a bulk import."""
+
+    imported: int
+    failed: int
+    errors: List[ActivityImportRowError]
+    errors_truncated: bool = False  # More rows failed than are listed
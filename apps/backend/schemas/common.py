@@ -2,6 +2,9 @@
 Common schemas for API responses and pagination.
 """
 
+import base64
+import json
+from enum import Enum
 from typing import Any, Optional, Generic, TypeVar
 from pydantic import BaseModel, Field
 
@@ -36,11 +39,45 @@ class ErrorResponse(BaseModel):
         }
 
 
+class TotalMode(str, Enum):
+    """How the total of a paginated listing is computed."""
+
+    EXACT = "exact"  # count(*) OVER () in the page query
+    ESTIMATE = "estimate"  # Postgres planner row estimate
+    NONE = "none"  # Skip counting
+
+
+class ExportFormat(str, Enum):
+    """Formats of the streaming export endpoints."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"  # Stopped with its worker, e.g. on shutdown
+
+
 class PaginationParams(BaseModel):
     """Pagination parameters."""
 
     page: int = Field(1, ge=1, description="Page number")
     size: int = Field(20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor from a previous page's next_cursor; "
+        "when set, it takes precedence over page",
+    )
+    total: TotalMode = Field(
+        TotalMode.EXACT,
+        description="exact, estimate (planner estimate) or none (no total)",
+    )
 
     @property
     def offset(self) -> int:
@@ -52,24 +89,62 @@ class PaginatedResponse(BaseModel, Generic[T]):
     """Paginated response format."""
 
     items: list[T]
-    total: int
+    total: Optional[int]
     page: int
     size: int
-    pages: int
+    pages: Optional[int]
+    next_cursor: Optional[str] = None
 
     @classmethod
-    def create(cls, items: list[T], total: int, pagination: PaginationParams):
+    def create(
+        cls,
+        items: list[T],
+        total: Optional[int],
+        pagination: PaginationParams,
+        next_cursor: Optional[str] = None,
+    ):
         """Create paginated response."""
-        pages = (total + pagination.size - 1) // pagination.size
+        pages = None
+        if total is not None:
+            pages = (total + pagination.size - 1) // pagination.size
         return cls(
             items=items,
             total=total,
             page=pagination.page,
             size=pagination.size,
             pages=pages,
+            next_cursor=next_cursor,
         )
 
 
+def encode_cursor(values: list) -> str:
+    """Encode the sort key of the last item of a page as an opaque cursor."""
+    payload = json.dumps(
+        [v.isoformat() if hasattr(v, "isoformat") else v for v in values],
+        default=str,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
 
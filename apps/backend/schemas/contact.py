@@ -4,7 +4,7 @@ Contact schemas for contact form submissions and communications.
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field, UUID4
+from pydantic import AliasChoices, BaseModel, EmailStr, Field, UUID4
 from enum import Enum
 
 
@@ -54,7 +54,9 @@ class ContactCreate(ContactBase):
 
     consent_privacy: bool = True
     consent_marketing: bool = False
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    extra_metadata: Optional[Dict[str, Any]] = Field(
+        default_factory=dict, alias="metadata"
+    )
 
     class Config:
         schema_extra = {
@@ -79,7 +81,7 @@ class ContactUpdate(BaseModel):
     priority: Optional[ContactPriority] = None
     assigned_to: Optional[UUID4] = None
     tags: Optional[List[str]] = None
-    metadata: Optional[Dict[str, Any]] = None
+    extra_metadata: Optional[Dict[str, Any]] = Field(None, alias="metadata")
 
 
 class ContactResponse(BaseModel):
@@ -99,7 +101,9 @@ class ContactResponse(BaseModel):
     is_responded: bool
     response_count: int
     last_response_at: Optional[datetime]
-    metadata: Dict[str, Any]
+    metadata: Dict[str, Any] = Field(
+        validation_alias=AliasChoices("extra_metadata", "metadata")
+    )
     tags: List[str]
     consent_privacy: bool
     consent_marketing: bool
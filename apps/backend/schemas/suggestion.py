@@ -0,0 +1,28 @@
+"""
+Suggestion schemas for asynchronous generation.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+from .common import JobStatus
+
+
+class SuggestionMode(str, Enum):
+    """How suggestions are generated."""
+
+    SYNC = "sync"  # In the request
+    ASYNC = "async"  # In a background job, polled by the client
+
+
+class SuggestionJobResponse(BaseModel):
+    """State of a suggestion job, with its result once finished."""
+
+    id: str
+    status: JobStatus
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    result: Optional[List[dict]] = None
+    error: Optional[str] = None
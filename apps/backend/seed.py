@@ -263,7 +263,7 @@ async def create_sample_contacts(session: AsyncSession):
             status="new",
             priority="normal",
             consent_privacy=True,
-            metadata={"source": "website", "referrer": "google"},
+            extra_metadata={"source": "website", "referrer": "google"},
         ),
         Contact(
             name="Sophie Martin",
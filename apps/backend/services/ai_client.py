@@ -0,0 +1,105 @@
+"""
+Shared OpenAI client of the API.
+
+Every model call of the worker goes through one ``OpenAIClient`` (see
+``common.openai_client``) built from the API settings: pooled connections, a
+cap on concurrent calls, a total time budget per call and jittered retries of
+transient failures. A circuit breaker around all calls makes callers fall
+back immediately while OpenAI is degraded, and every call is recorded in
+the AI request metrics.
+"""
+
+from typing import AsyncIterator, Dict, List, Optional
+
+from openai import AsyncOpenAI
+
+from ..common.openai_client import (
+    RETRYABLE_ERRORS,
+    AIServiceUnavailable,
+    CallSlotTimeout,
+    OpenAIClient,
+)
+from ..config import settings
+from ..monitoring.metrics import record_ai_request
+from .circuit_breaker import CircuitBreaker
+
+
+# Shared by every model call of the worker: while open, calls fail with
+# CircuitOpenError before any network access and callers serve their fallback
+ai_circuit = CircuitBreaker(
+    "openai",
+    window=settings.AI_CIRCUIT_WINDOW,
+    min_calls=settings.AI_CIRCUIT_MIN_CALLS,
+    error_rate=settings.AI_CIRCUIT_ERROR_RATE,
+    slow_call_seconds=settings.AI_CIRCUIT_SLOW_CALL_SECONDS,
+    slow_call_rate=settings.AI_CIRCUIT_SLOW_CALL_RATE,
+    open_seconds=settings.AI_CIRCUIT_OPEN_SECONDS,
+)
+
+_client = OpenAIClient(
+    api_key=settings.OPENAI_API_KEY,
+    model=settings.OPENAI_MODEL,
+    timeout_seconds=settings.OPENAI_TIMEOUT_SECONDS,
+    connect_timeout_seconds=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+    max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+    max_retries=settings.OPENAI_MAX_RETRIES,
+    circuit=ai_circuit,
+    on_request=record_ai_request,
+)
+
+
+def ai_available() -> bool:
+    """Check whether an API key is configured for model calls."""
+    return _client.available
+
+
+def get_ai_client() -> AsyncOpenAI:
+    """
+    Get the shared client, creating it on first use.
+
+    Raises:
+        AIServiceUnavailable: If no API key is configured
+    """
+    return _client.get_client()
+
+
+async def close_ai_client():
+    """Close the shared client and its connections."""
+    await _client.close()
+
+
+async def chat_completion(
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: float = 0.7,
+    model: Optional[str] = None,
+    timeout: Optional[float] = None,
+    request_type: str = "completion",
+) -> str:
+    """
+    Run a chat completion on the shared client.
+
+    See ``OpenAIClient.chat_completion``.
+    """
+    return await _client.chat_completion(
+        messages, max_tokens, temperature, model, timeout, request_type
+    )
+
+
+def stream_chat_completion(
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    temperature: float = 0.7,
+    model: Optional[str] = None,
+    timeout: Optional[float] = None,
+    request_type: str = "completion",
+) -> AsyncIterator[str]:
+    """
+    Stream a chat completion on the shared client.
+
+    See ``OpenAIClient.stream_chat_completion``.
+    """
+    return _client.stream_chat_completion(
+        messages, max_tokens, temperature, model, timeout, request_type
+    )
@@ -0,0 +1,280 @@
+"""
+In-memory snapshot of the published activity catalog.
+
+The catalog changes a few times a day while it is read on every page view, so
+read endpoints serve it from a process-local, immutable snapshot instead of
+querying Postgres. The catalog is reloaded after every catalog write and
+periodically; when its content changed, a new snapshot is built as a whole
+and swapped atomically, with a new, monotonically increasing version number,
+together with the retrieval and scoring indexes built from it.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import logging
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+
+from ..database import AsyncSessionLocal
+from ..models.activity import Activity, LISTED_AT
+from ..schemas.activity import ActivityFacets, ActivitySearchFilters, TagMatch
+from .retrieval import RetrievalIndex
+from .scoring import ScoringIndex
+
+
+logger = logging.getLogger(__name__)
+
+# Scalar facets of ActivityFacets; season tags are counted separately
+FACETS = ("category", "difficulty_level", "safety_level", "location_type")
+
+# Listing sort key of activities without a creation date: after dated ones,
+# like LISTED_AT in SQL
+UNDATED = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def catalog_digest(activities: List[Dict[str, Any]]) -> str:
+    """Fingerprint activity dictionaries in listing order."""
+    digest = hashlib.sha256()
+    for activity in activities:
+        changed_at = activity["updated_at"] or activity["created_at"]
+        digest.update(f"{activity['id']}:{changed_at};".encode())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of the published catalog at a given version.
+
+    Activity entries are the dictionaries produced by ``Activity.to_dict()``
+    and are shared between requests: treat them as read-only.
+    """
+
+    version: int
+    digest: str  # Content fingerprint, identical across worker processes
+    activities: Tuple[Dict[str, Any], ...]  # is_featured desc, created_at desc
+    by_id: Mapping[str, Dict[str, Any]]
+    by_category: Mapping[str, Tuple[Dict[str, Any], ...]]  # created_at desc
+    retrieval: RetrievalIndex  # BM25 index of the activities
+    scoring: ScoringIndex  # Rule-based scoring index of the activities
+    loaded_at: float
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        activities: List[Dict[str, Any]],
+        digest: Optional[str] = None,
+    ) -> "CatalogSnapshot":
+        """
+        Build a snapshot from activity dictionaries in listing order.
+
+        The retrieval and scoring indexes are built here too, so a snapshot
+        is swapped in with its indexes. Building them is CPU-bound: run this
+        off the event loop.
+        """
+        by_category = defaultdict(list)
+        for activity in activities:
+            by_category[activity["category"]].append(activity)
+
+        activities = tuple(activities)
+        return cls(
+            version=version,
+            digest=digest or catalog_digest(activities),
+            activities=activities,
+            by_id=MappingProxyType({a["id"]: a for a in activities}),
+            by_category=MappingProxyType(
+                {
+                    category: tuple(
+                        sorted(
+                            items,
+                            key=lambda a: a["created_at"] or "",
+                            reverse=True,
+                        )
+                    )
+                    for category, items in by_category.items()
+                }
+            ),
+            retrieval=RetrievalIndex.build(activities),
+            scoring=ScoringIndex.build(activities),
+            loaded_at=time.time(),
+        )
+
+    def get(self, activity_id: str) -> Optional[Dict[str, Any]]:
+        """Get a published activity by ID."""
+        return self.by_id.get(activity_id.lower())
+
+    def featured(self, limit: int) -> List[Dict[str, Any]]:
+        """Get the most recent featured activities."""
+        featured = []
+        for activity in self.activities:
+            # Featured activities come first in listing order
+            if not activity["is_featured"] or len(featured) >= limit:
+                break
+            featured.append(activity)
+        return featured
+
+    def facets(self, filters: ActivitySearchFilters) -> ActivityFacets:
+        """Count the filtered activities per facet value."""
+        matches = self.search(filters)
+        counters = {facet: Counter() for facet in FACETS}
+        season_tags = Counter()
+        for activity in matches:
+            for facet in FACETS:
+                if activity[facet] is not None:
+                    counters[facet][activity[facet]] += 1
+            # An activity counts once per distinct season tag
+            season_tags.update(set(activity["season_tags"]))
+
+        return ActivityFacets(
+            total=len(matches),
+            season_tags=dict(season_tags),
+            **{facet: dict(counter) for facet, counter in counters.items()},
+        )
+
+    def search(self, filters: ActivitySearchFilters) -> List[Dict[str, Any]]:
+        """Filter the catalog with the same semantics as the SQL listing.
+
+        Keyword filters need French stemming and relevance ranking from
+        Postgres full-text search, so callers send those queries to the
+        database and ``filters.keywords`` is ignored here.
+        """
+        return [activity for activity in self.activities if _matches(activity, filters)]
+
+
+def listing_key(activity: Dict[str, Any]) -> Tuple[bool, datetime, uuid.UUID]:
+    """Get the listing sort key of an activity, matching the SQL ordering."""
+    created_at = activity["created_at"]
+    return (
+        activity["is_featured"],
+        datetime.fromisoformat(created_at) if created_at else UNDATED,
+        uuid.UUID(activity["id"]),
+    )
+
+
+def _tags_match(tags: List[str], wanted: List[str], tag_match: TagMatch) -> bool:
+    """Match activity tags like the SQL @> (all) and && (any) operators."""
+    if tag_match == TagMatch.ANY:
+        return not set(wanted).isdisjoint(tags)
+    return set(wanted) <= set(tags)
+
+
+def _matches(activity: Dict[str, Any], filters: ActivitySearchFilters) -> bool:
+    """Check whether an activity matches the search filters."""
+    if filters.category and activity["category"] != filters.category.value:
+        return False
+
+    if filters.min_duration and activity["duration_min"] < filters.min_duration:
+        return False
+
+    if filters.max_duration and activity["duration_min"] > filters.max_duration:
+        return False
+
+    if (
+        filters.difficulty_level
+        and activity["difficulty_level"] != filters.difficulty_level
+    ):
+        return False
+
+    if filters.safety_level and (
+        activity["safety_level"] is None
+        or activity["safety_level"] > filters.safety_level
+    ):
+        return False
+
+    if (
+        filters.location_type
+        and activity["location_type"] != filters.location_type.value
+    ):
+        return False
+
+    if (
+        filters.is_featured is not None
+        and activity["is_featured"] != filters.is_featured
+    ):
+        return False
+
+    if filters.skill_tags and not _tags_match(
+        activity["skill_tags"], filters.skill_tags, filters.tag_match
+    ):
+        return False
+
+    if filters.season_tags and not _tags_match(
+        activity["season_tags"], filters.season_tags, filters.tag_match
+    ):
+        return False
+
+    return True
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_versions = itertools.count(1)
+_refresh_lock = asyncio.Lock()
+
+
+def get_catalog() -> Optional[CatalogSnapshot]:
+    """Get the current catalog snapshot, or None if it has not been loaded."""
+    return _snapshot
+
+
+async def refresh_catalog() -> CatalogSnapshot:
+    """
+    Reload the published catalog and atomically swap in a new snapshot.
+
+    Refreshes are serialized so that a refresh started after a commit always
+    publishes a snapshot that includes that commit. When the catalog did not
+    change, the current snapshot is kept, with its version.
+
+    Returns:
+        The current snapshot
+    """
+    global _snapshot
+
+    async with _refresh_lock:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Activity)
+                .where(Activity.is_published == True)
+                .order_by(
+                    Activity.is_featured.desc(),
+                    LISTED_AT.desc(),
+                    Activity.id.desc(),
+                )
+            )
+            activities = [activity.to_dict() for activity in result.scalars().all()]
+
+        digest = catalog_digest(activities)
+        if _snapshot is not None and _snapshot.digest == digest:
+            return _snapshot
+
+        _snapshot = await asyncio.to_thread(
+            CatalogSnapshot.build, next(_versions), activities, digest
+        )
+
+    logger.info(
+        f"Catalog snapshot v{_snapshot.version} loaded "
+        f"({len(_snapshot.activities)} activities)"
+    )
+    return _snapshot
+
+
+async def catalog_refresh_loop(interval: float):
+    """
+    Periodically reload the catalog.
+
+    Writes only refresh the snapshot of the worker that handled them, so other
+    worker processes pick up changes on the next tick.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_catalog()
+        except Exception as e:
+            logger.warning(f"Periodic catalog refresh failed: {e}")
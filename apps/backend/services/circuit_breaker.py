@@ -0,0 +1,187 @@
+"""
+Circuit breaker for calls to degraded dependencies.
+
+The breaker watches the outcome and latency of the last calls. While
+closed, calls go through; when too many of them failed or were slow it
+opens, and callers fail immediately so they can serve their local fallback
+without waiting on the network. After a cool-down it lets a single probe
+call through (half-open): a healthy probe closes the circuit, a failed or
+slow one opens it again. Only the probe holder can settle the half-open
+state; outcomes of calls reserved before the circuit opened are ignored.
+"""
+
+import asyncio
+import enum
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ..monitoring.metrics import CIRCUIT_BREAKER_STATE, CIRCUIT_BREAKER_TRANSITIONS
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+# Gauge values of each state
+STATE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+
+class CircuitOpenError(Exception):
+    """The circuit is open: the call was not attempted."""
+
+
+class CircuitBreaker:
+    """Error-rate and latency circuit breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        window: int,
+        min_calls: int,
+        error_rate: float,
+        slow_call_seconds: float,
+        slow_call_rate: float,
+        open_seconds: float,
+    ):
+        """
+        Args:
+            name: Circuit name, used as the metrics label
+            window: Number of recent calls the rates are computed over
+            min_calls: Calls needed in the window before the circuit may open
+            error_rate: Share of failed calls that opens the circuit
+            slow_call_seconds: Duration above which a call counts as slow
+            slow_call_rate: Share of slow calls that opens the circuit
+            open_seconds: Time the circuit stays open before a probe call
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (ok, slow)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probe: Optional[object] = None
+        self._cool_down_timer: Optional[asyncio.TimerHandle] = None
+        CIRCUIT_BREAKER_STATE.labels(circuit=name).set(STATE_VALUES[self._state])
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once cooled down."""
+        self._cool_down()
+        return self._state
+
+    def before_call(self) -> Optional[object]:
+        """
+        Reserve a call.
+
+        Returns:
+            Token of the call, to pass to ``record`` or ``release``
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its
+                probe call already in flight
+        """
+        state = self.state
+        if state == CircuitState.OPEN:
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        if state == CircuitState.HALF_OPEN:
+            if self._probe is not None:
+                raise CircuitOpenError(f"Circuit {self.name} is probing")
+            self._probe = object()
+            return self._probe
+        return None
+
+    def record(self, success: bool, duration: float, token: Optional[object] = None):
+        """Record the outcome of a call reserved with ``before_call``."""
+        slow = duration >= self.slow_call_seconds
+
+        if token is not None and token is self._probe:
+            self._probe = None
+            self._calls.clear()
+            if success and not slow:
+                self._transition(CircuitState.CLOSED)
+            else:
+                self._open()
+            return
+
+        if self._state != CircuitState.CLOSED:
+            # Reserved before the circuit opened: its outcome is stale
+            return
+
+        self._calls.append((success, slow))
+        if len(self._calls) >= self.min_calls:
+            failures = sum(1 for ok, _ in self._calls if not ok)
+            slow_calls = sum(1 for _, is_slow in self._calls if is_slow)
+            if failures >= self.error_rate * len(
+                self._calls
+            ) or slow_calls >= self.slow_call_rate * len(self._calls):
+                self._calls.clear()
+                self._open()
+
+    def release(self, token: Optional[object] = None):
+        """Give back a reserved call whose outcome is unknown."""
+        if token is not None and token is self._probe:
+            self._probe = None
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the circuit for health checks."""
+        calls = len(self._calls)
+        return {
+            "state": self.state.value,
+            "recent_calls": calls,
+            "error_rate": (
+                round(sum(1 for ok, _ in self._calls if not ok) / calls, 2)
+                if calls
+                else 0.0
+            ),
+            "slow_call_rate": (
+                round(sum(1 for _, slow in self._calls if slow) / calls, 2)
+                if calls
+                else 0.0
+            ),
+        }
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._transition(CircuitState.OPEN)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to time the cool-down: the next read moves on
+            return
+        self._cool_down_timer = loop.call_later(
+            self.open_seconds, self._transition, CircuitState.HALF_OPEN
+        )
+
+    def _cool_down(self):
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.open_seconds
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+
+    def _transition(self, state: CircuitState):
+        if state == self._state:
+            return
+        if self._cool_down_timer is not None:
+            self._cool_down_timer.cancel()
+            self._cool_down_timer = None
+        logger.warning(f"Circuit {self.name}: {self._state.value} -> {state.value}")
+        CIRCUIT_BREAKER_TRANSITIONS.labels(
+            circuit=self.name, from_state=self._state.value, to_state=state.value
+        ).inc()
+        CIRCUIT_BREAKER_STATE.labels(circuit=self.name).set(STATE_VALUES[state])
+        self._state = state
@@ -0,0 +1,143 @@
+"""
+In-process background jobs.
+
+A bounded queue feeds a fixed pool of worker tasks started by the
+application lifespan. Submitting to a full queue fails immediately so the
+route can push back on the client instead of piling up work, and finished
+jobs are kept for a TTL for clients to poll. Jobs live in the worker process
+that accepted them.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..schemas.common import JobStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """The job queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """A submitted unit of work and its outcome."""
+
+    owner: Any
+    run: Callable[[], Awaitable[Any]]
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: JobStatus = JobStatus.QUEUED
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    result: Any = None
+    error: Optional[str] = None
+    expires_at: Optional[float] = None  # Monotonic time, set once finished
+
+
+class JobQueue:
+    """Bounded queue of jobs run by a pool of worker tasks."""
+
+    def __init__(self, name: str, workers: int, max_queued: int, result_ttl: float):
+        """
+        Args:
+            name: Queue name, used in logs
+            workers: Number of jobs run concurrently
+            max_queued: Jobs waiting for a worker before submissions fail
+            result_ttl: Seconds a finished job is kept for polling
+        """
+        self.name = name
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self._queue: "asyncio.Queue[Job]" = asyncio.Queue(maxsize=max_queued)
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker tasks."""
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"{self.name}-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Cancel the worker tasks; queued and running jobs are cancelled."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.status = JobStatus.CANCELLED
+            self._finish(job)
+            self._queue.task_done()
+
+    def submit(self, owner: Any, run: Callable[[], Awaitable[Any]]) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            owner: Identifies who may read the job
+            run: Coroutine function producing the job result
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If the queue is at capacity
+        """
+        self._expire()
+        job = Job(owner=owner, run=run)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"{self.name} queue is full") from None
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job, or None if unknown or expired."""
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            job.status = JobStatus.RUNNING
+            try:
+                job.result = await job.run()
+                job.status = JobStatus.SUCCEEDED
+            except asyncio.CancelledError:
+                # Pollers see a final status instead of a job running forever
+                job.error = "Job cancelled"
+                job.status = JobStatus.CANCELLED
+                raise
+            except Exception as e:
+                logger.warning(f"{self.name} job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = JobStatus.FAILED
+            finally:
+                self._finish(job)
+                self._queue.task_done()
+
+    def _finish(self, job: Job):
+        job.run = None  # Release the captured request state
+        job.finished_at = datetime.now(timezone.utc)
+        job.expires_at = time.monotonic() + self.result_ttl
+
+    def _expire(self):
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.expires_at is not None and job.expires_at <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -3,11 +3,21 @@ OpenAI integration service for generating activity suggestions.
 """
 
 import json
-import openai
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from pydantic import BaseModel, Field
 
 from ..config import settings
+from .ai_client import chat_completion
+from .catalog import CatalogSnapshot
+from .prompt_builder import build_suggestion_prompt, completion_budget
+from .retrieval import RetrievalIndex, profile_query
+from .scoring import ScoringIndex
+from .suggestion_cache import suggestion_cache, suggestion_key
+
+
+# Ranked activities offered to the prompt builder, which keeps as many as fit
+# the token budget
+PROMPT_CANDIDATES = 40
 
 
 class SuggestionRequest(BaseModel):
@@ -25,8 +35,9 @@ class SuggestionRequest(BaseModel):
 async def get_activity_suggestions(
     user_profile: Dict[str, Any],
     user_request: str,
-    available_activities: List[Dict[str, Any]],
+    available_activities: Sequence[Dict[str, Any]],
     max_suggestions: int = 5,
+    catalog: Optional[CatalogSnapshot] = None,
 ) -> List[Dict[str, Any]]:
     """
     Generate personalized activity suggestions using OpenAI.
@@ -36,22 +47,39 @@ async def get_activity_suggestions(
         user_request: User's specific request
         available_activities: List of available activities
         max_suggestions: Maximum number of suggestions to return
+        catalog: Catalog snapshot the activities come from; its retrieval
+            and scoring indexes are used, and model responses are only
+            cached when it is given
 
     Returns:
         List of activity suggestions with scores and reasons
     """
-    # Set up OpenAI client
-    openai.api_key = settings.OPENAI_API_KEY
+    cache_key = None
+    if catalog is not None:
+        cache_key = suggestion_key(
+            user_profile, user_request, max_suggestions, catalog.digest
+        )
+        cached = await suggestion_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Pre-rank the catalog locally so the prompt lists relevant activities
+    candidates = _prompt_candidates(
+        user_profile, user_request, available_activities, PROMPT_CANDIDATES, catalog
+    )
 
     # Prepare the prompt
-    prompt = _build_suggestion_prompt(
-        user_profile, user_request, available_activities, max_suggestions
+    prompt, candidates = build_suggestion_prompt(
+        user_profile,
+        user_request,
+        candidates,
+        max_suggestions,
+        settings.OPENAI_PROMPT_TOKEN_BUDGET,
     )
 
     try:
         # Call OpenAI API
-        response = await openai.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        content = await chat_completion(
             messages=[
                 {
                     "role": "system",
@@ -59,75 +87,61 @@ async def get_activity_suggestions(
                 },
                 {"role": "user", "content": prompt},
             ],
-            max_tokens=settings.OPENAI_MAX_TOKENS,
+            max_tokens=completion_budget(max_suggestions, settings.OPENAI_MAX_TOKENS),
             temperature=0.7,
+            request_type="suggestions",
         )
 
         # Parse the response
-        content = response.choices[0].message.content
-        suggestions = _parse_openai_response(content, available_activities)
+        suggestions = _parse_openai_response(content, candidates)[:max_suggestions]
 
-        return suggestions[:max_suggestions]
+        # Fallback results are cheap and should not hide a recovered API
+        if cache_key is not None and suggestions:
+            await suggestion_cache.set(cache_key, suggestions)
+
+        return suggestions
 
     except Exception as e:
         # Fallback to simple matching if OpenAI fails
         return _fallback_suggestions(
-            user_profile, user_request, available_activities, max_suggestions
+            user_profile, user_request, available_activities, max_suggestions, catalog
         )
 
 
-def _build_suggestion_prompt(
+def _prompt_candidates(
     user_profile: Dict[str, Any],
     user_request: str,
-    available_activities: List[Dict[str, Any]],
-    max_suggestions: int,
-) -> str:
-    """Build the prompt for OpenAI."""
-
-    # Extract user info
-    skills = user_profile.get("skills", [])
-    interests = user_profile.get("interests", [])
-    experience_level = user_profile.get("experience_level", "beginner")
-    location = user_profile.get("location", "")
-
-    # Create activity summaries
-    activity_summaries = []
-    for i, activity in enumerate(available_activities):
-        summary = f"{i+1}. {activity['title']} (Catégorie: {activity['category']}, Durée: {activity['duration_min']}min, Niveau: {activity.get('difficulty_level', 1)}/5)"
-        if activity.get("skill_tags"):
-            summary += f" - Compétences: {', '.join(activity['skill_tags'][:3])}"
-        activity_summaries.append(summary)
-
-    prompt = f"""
-Demande de l'utilisateur: "{user_request}"
-
-Profil de l'utilisateur:
-- Compétences: {', '.join(skills) if skills else 'Non spécifiées'}
-- Centres d'intérêt: {', '.join(interests) if interests else 'Non spécifiés'}
-- Niveau d'expérience: {experience_level}
-- Localisation: {location if location else 'Non spécifiée'}
-
-Activités disponibles:
-{chr(10).join(activity_summaries[:20])}  # Limit to first 20 activities
-
-Veuillez recommander jusqu'à {max_suggestions} activités les plus pertinentes pour cet utilisateur.
-
-Pour chaque recommandation, fournissez:
-1. Le numéro de l'activité (de la liste ci-dessus)
-2. Un score de pertinence (0.0 à 1.0)
-3. 2-3 raisons courtes expliquant pourquoi cette activité est recommandée
-
-Format de réponse JSON attendu:
-[
-  {{
-    "activity_index": 1,
-    "score": 0.85,
-    "reasons": ["Raison 1", "Raison 2"]
-  }}
-]
-"""
+    available_activities: Sequence[Dict[str, Any]],
+    limit: int,
+    catalog: Optional[CatalogSnapshot] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Pick the activities to list in the prompt.
 
-    return prompt
+    Activities are ranked with BM25 against the request and the profile's
+    skills and interests; when fewer than ``limit`` match, the list is
+    completed with the best rule-based matches for the profile.
+    """
+    query = profile_query(user_request, user_profile)
+    if catalog is not None:
+        retrieval = catalog.retrieval
+    else:
+        retrieval = RetrievalIndex.build(available_activities)
+    positions = retrieval.search(query, limit)
+    candidates = [available_activities[i] for i in positions]
+
+    if len(candidates) < limit:
+        chosen = {activity["id"] for activity in candidates}
+        ranked = _scoring_index(available_activities, catalog).top(
+            user_profile, limit + len(candidates)
+        )
+        for suggestion in ranked:
+            if len(candidates) >= limit:
+                break
+            if suggestion["activity"]["id"] not in chosen:
+                candidates.append(suggestion["activity"])
+
+    return candidates
 
 
 def _parse_openai_response(
@@ -169,64 +183,26 @@ def _parse_openai_response(
 def _fallback_suggestions(
     user_profile: Dict[str, Any],
     user_request: str,
-    available_activities: List[Dict[str, Any]],
+    available_activities: Sequence[Dict[str, Any]],
     max_suggestions: int,
+    catalog: Optional[CatalogSnapshot] = None,
 ) -> List[Dict[str, Any]]:
     """
     Fallback suggestion algorithm when OpenAI is not available.
+
+    Scores every activity with the vectorized rule engine, using the catalog
+    snapshot's scoring index when the activities come from one.
     """
-    suggestions = []
-    user_skills = set(user_profile.get("skills", []))
-    user_interests = set(user_profile.get("interests", []))
-    user_experience = user_profile.get("experience_level", "beginner")
-
-    # Simple scoring based on matching
-    for activity in available_activities:
-        score = 0.3  # Base score
-        reasons = []
-
-        # Match skills
-        activity_skills = set(activity.get("skill_tags", []))
-        skill_overlap = user_skills & activity_skills
-        if skill_overlap:
-            score += 0.3
-            reasons.append(
-                f"Compétences correspondantes: {', '.join(list(skill_overlap)[:2])}"
-            )
-
-        # Match interests with keywords/category
-        activity_keywords = set(
-            activity.get("keywords", []) + [activity.get("category", "")]
-        )
-        interest_overlap = user_interests & activity_keywords
-        if interest_overlap:
-            score += 0.2
-            reasons.append("Correspond à vos centres d'intérêt")
-
-        # Experience level matching
-        activity_difficulty = activity.get("difficulty_level", 1)
-        if user_experience == "beginner" and activity_difficulty <= 2:
-            score += 0.1
-            reasons.append("Adapté aux débutants")
-        elif user_experience == "intermediate" and 2 <= activity_difficulty <= 4:
-            score += 0.1
-            reasons.append("Niveau intermédiaire")
-        elif user_experience == "advanced" and activity_difficulty >= 3:
-            score += 0.1
-            reasons.append("Niveau avancé")
-
-        # Featured activities get bonus
-        if activity.get("is_featured"):
-            score += 0.1
-            reasons.append("Activité recommandée")
-
-        if not reasons:
-            reasons = ["Activité populaire"]
-
-        suggestions.append(
-            {"activity": activity, "score": min(score, 1.0), "reasons": reasons}
-        )
+    return _scoring_index(available_activities, catalog).top(
+        user_profile, max_suggestions
+    )
+
 
-    # Sort by score and return top suggestions
-    suggestions.sort(key=lambda x: x["score"], reverse=True)
-    return suggestions[:max_suggestions]
+def _scoring_index(
+    available_activities: Sequence[Dict[str, Any]],
+    catalog: Optional[CatalogSnapshot],
+) -> ScoringIndex:
+    """Get the snapshot's scoring index, or encode a database candidate list."""
+    if catalog is not None:
+        return catalog.scoring
+    return ScoringIndex.build(available_activities)
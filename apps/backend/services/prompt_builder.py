@@ -0,0 +1,128 @@
+"""
+Token-budgeted suggestion prompts.
+
+Each activity's line in the prompt comes from a ``FragmentCache`` (see
+``common.prompt_fragments``), formatted once per activity version and kept
+with its token count. Ranked candidates are packed in order until the prompt
+token budget is spent, and the completion budget is derived from the number
+of suggestions asked for.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ..common.prompt_fragments import FragmentCache
+from ..common.prompt_fragments import completion_budget as _completion_budget
+from ..common.prompt_fragments import count_tokens
+
+
+NUMBER_TOKENS = 2  # "12. " before each activity line
+
+# Completion budget: one object with 2-3 short reasons per suggestion
+RESPONSE_TOKENS_PER_SUGGESTION = 70
+
+PROMPT_HEADER = """
+Demande de l'utilisateur: "{user_request}"
+
+Profil de l'utilisateur:
+- Compétences: {skills}
+- Centres d'intérêt: {interests}
+- Niveau d'expérience: {experience_level}
+- Localisation: {location}
+
+Activités disponibles:
+"""
+
+PROMPT_FOOTER = """
+Veuillez recommander jusqu'à {max_suggestions} activités les plus pertinentes pour cet utilisateur.
+
+Pour chaque recommandation, fournissez:
+1. Le numéro de l'activité (de la liste ci-dessus)
+2. Un score de pertinence (0.0 à 1.0)
+3. 2-3 raisons courtes expliquant pourquoi cette activité est recommandée
+
+Format de réponse JSON attendu:
+[
+  {{
+    "activity_index": 1,
+    "score": 0.85,
+    "reasons": ["Raison 1", "Raison 2"]
+  }}
+]
+"""
+
+
+def completion_budget(max_suggestions: int, limit: int) -> int:
+    """Get the ``max_tokens`` needed for a number of suggestions."""
+    return _completion_budget(max_suggestions, limit, RESPONSE_TOKENS_PER_SUGGESTION)
+
+
+_fragments = FragmentCache(extra_tokens=NUMBER_TOKENS)
+
+
+def activity_fragment(activity: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Get the prompt line of an activity and its token count.
+
+    Fragments are cached by activity ID and ``updated_at``, so an edited
+    activity is formatted again.
+    """
+
+    def render() -> str:
+        fragment = (
+            f"{activity['title']} (Catégorie: {activity['category']}, "
+            f"Durée: {activity['duration_min']}min, "
+            f"Niveau: {activity.get('difficulty_level', 1)}/5)"
+        )
+        if activity.get("skill_tags"):
+            fragment += f" - Compétences: {', '.join(activity['skill_tags'][:3])}"
+        return fragment
+
+    return _fragments.get((activity["id"], activity.get("updated_at")), render)
+
+
+def build_suggestion_prompt(
+    user_profile: Dict[str, Any],
+    user_request: str,
+    candidates: Sequence[Dict[str, Any]],
+    max_suggestions: int,
+    token_budget: int,
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Build the suggestion prompt within a token budget.
+
+    Args:
+        user_profile: User's profile information
+        user_request: User's specific request
+        candidates: Activities to offer the model, best first
+        max_suggestions: Maximum number of suggestions to ask for
+        token_budget: Maximum number of prompt tokens
+
+    Returns:
+        The prompt, and the activities it lists in the order they are
+        numbered (at least one, even over budget)
+    """
+    skills = user_profile.get("skills", [])
+    interests = user_profile.get("interests", [])
+    location = user_profile.get("location", "")
+
+    header = PROMPT_HEADER.format(
+        user_request=user_request,
+        skills=", ".join(skills) if skills else "Non spécifiées",
+        interests=", ".join(interests) if interests else "Non spécifiés",
+        experience_level=user_profile.get("experience_level", "beginner"),
+        location=location if location else "Non spécifiée",
+    )
+    footer = PROMPT_FOOTER.format(max_suggestions=max_suggestions)
+    remaining = token_budget - count_tokens(header) - count_tokens(footer)
+
+    lines = []
+    packed = []
+    for activity in candidates:
+        fragment, tokens = activity_fragment(activity)
+        if tokens > remaining and packed:
+            break
+        remaining -= tokens
+        packed.append(activity)
+        lines.append(f"{len(packed)}. {fragment}")
+
+    return header + "\n".join(lines) + "\n" + footer, packed
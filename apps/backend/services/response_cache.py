@@ -0,0 +1,147 @@
+"""
+Server-side cache of encoded responses for anonymous GET endpoints.
+
+Public catalog endpoints return the same bytes to every anonymous caller, so
+their JSON body is encoded once and kept per path and normalized query for a
+per-route TTL. Recomputes are single-flight: when an entry expires under load
+one request rebuilds it while concurrent requests are served the stale body
+(within the stale window) or wait for the rebuild instead of all hitting the
+database. Activity writes clear every cache.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from ..common.single_flight import SingleFlight
+from ..http_cache import make_etag, etag_matches, not_modified, query_key
+from ..monitoring.metrics import RESPONSE_CACHE_EVENTS
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Encoded response body with its validity window."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+    stale_until: float
+
+
+class ResponseCache:
+    """TTL cache of encoded JSON responses for one route."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+        max_entries: int = 1024,
+    ):
+        """
+        Args:
+            name: Cache name, used as the metrics label
+            ttl: Seconds an entry is served as fresh
+            stale_ttl: Seconds after expiry an entry may still be served while
+                another request recomputes it (defaults to ``ttl``)
+            max_entries: Entries kept before the oldest ones are evicted
+        """
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = ttl if stale_ttl is None else stale_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, CachedResponse] = {}
+        self._flight = SingleFlight()
+        # Bumped on invalidation so in-flight recomputes do not store bodies
+        # rendered from data older than the write
+        self._generation = 0
+        _caches.append(self)
+
+    async def serve(
+        self, request: Request, render: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """
+        Serve a request from the cache, rendering the payload on a miss.
+
+        Exceptions raised by ``render`` (such as 404s) propagate and are not
+        cached.
+
+        Args:
+            request: Incoming request; its path and query form the cache key
+            render: Coroutine factory returning the response payload
+
+        Returns:
+            JSON response with an ETag, or 304 if the client's copy is current
+        """
+        key = f"{request.url.path}?{query_key(request)}"
+        generation = self._generation
+        flight_key = (generation, key)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.expires_at:
+            result = "hit"
+        elif (
+            entry is not None
+            and now < entry.stale_until
+            and self._flight.in_flight(flight_key)
+        ):
+            result = "stale"
+        else:
+            result = "miss"
+            entry = await self._flight.do(
+                flight_key, lambda: self._fill(key, generation, render)
+            )
+
+        RESPONSE_CACHE_EVENTS.labels(cache=self.name, result=result).inc()
+
+        if etag_matches(request, entry.etag):
+            return not_modified(entry.etag)
+        return Response(
+            content=entry.body,
+            media_type="application/json",
+            headers={"ETag": entry.etag, "Cache-Control": "no-cache"},
+        )
+
+    async def _fill(
+        self, key: str, generation: int, render: Callable[[], Awaitable[Any]]
+    ) -> CachedResponse:
+        """Render, encode and store the response for a key."""
+        payload = await render()
+        body = JSONResponse(content=jsonable_encoder(payload)).body
+
+        now = time.monotonic()
+        entry = CachedResponse(
+            body=body,
+            etag=make_etag(hashlib.sha256(body).hexdigest()),
+            expires_at=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+        )
+
+        if generation == self._generation:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order: evict the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = entry
+
+        return entry
+
+    def clear(self):
+        """Drop every entry of this cache."""
+        self._entries.clear()
+        self._generation += 1
+
+
+_caches: List[ResponseCache] = []
+
+
+def invalidate_response_caches():
+    """Clear all response caches after a catalog write."""
+    for cache in _caches:
+        cache.clear()
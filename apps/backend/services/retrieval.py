@@ -0,0 +1,127 @@
+"""
+In-process BM25 retrieval over the activity catalog.
+
+Suggestion prompts can only list a few activities, so the candidates are
+pre-ranked locally against the user's request and profile before the prompt
+is built. The index covers titles, summaries, keywords and skill tags, is
+built with each catalog snapshot and needs no network access.
+"""
+
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term repetitions per field, so title and tag matches weigh more
+FIELD_WEIGHTS = {
+    "title": 3,
+    "summary": 1,
+    "keywords": 2,
+    "skill_tags": 2,
+}
+
+STOP_WORDS = frozenset(
+    """
+    au aux avec ce ces dans de des du elle en et eux il je la le les leur lui
+    ma mais me meme mes moi mon ne nos notre nous on ou par pas pour qu que qui
+    sa se ses son sur ta te tes toi ton tu un une vos votre vous c d j l m n s
+    t y est sont suis veux voudrais aimerais faire activite activites
+    the a an and or of to in for with on is are i want would like
+    """.split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip accents and split text into indexable terms."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [
+        token
+        for token in _TOKEN.findall(text)
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def _document_terms(activity: Dict[str, Any]) -> List[str]:
+    """Get the weighted terms of an activity."""
+    terms = []
+    for field, weight in FIELD_WEIGHTS.items():
+        value = activity.get(field) or ""
+        if isinstance(value, list):
+            value = " ".join(value)
+        terms.extend(tokenize(value) * weight)
+    return terms
+
+
+@dataclass(frozen=True)
+class RetrievalIndex:
+    """BM25 inverted index of a catalog."""
+
+    activities: Sequence[Dict[str, Any]]
+    postings: Dict[str, np.ndarray]  # Term -> activity positions
+    weights: Dict[str, np.ndarray]  # Term -> BM25 weight per posting
+
+    @classmethod
+    def build(cls, activities: Sequence[Dict[str, Any]]) -> "RetrievalIndex":
+        """Index activity dictionaries."""
+        documents = [_document_terms(activity) for activity in activities]
+        lengths = np.array([len(terms) for terms in documents], dtype=np.float64)
+        average_length = lengths.mean() if len(documents) else 0.0
+        average_length = average_length or 1.0
+
+        frequencies: Dict[str, Dict[int, int]] = {}
+        for position, terms in enumerate(documents):
+            for term in terms:
+                counts = frequencies.setdefault(term, {})
+                counts[position] = counts.get(position, 0) + 1
+
+        postings = {}
+        weights = {}
+        size = len(documents)
+        for term, counts in frequencies.items():
+            positions = np.fromiter(counts, dtype=np.int32, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            idf = math.log(1 + (size - len(counts) + 0.5) / (len(counts) + 0.5))
+            norm = K1 * (1 - B + B * lengths[positions] / average_length)
+            postings[term] = positions
+            weights[term] = idf * tf * (K1 + 1) / (tf + norm)
+
+        return cls(activities=activities, postings=postings, weights=weights)
+
+    def search(self, query_terms: Iterable[str], limit: int) -> List[int]:
+        """
+        Rank activities against query terms.
+
+        Returns:
+            Positions of up to ``limit`` matching activities, best first
+        """
+        scores = np.zeros(len(self.activities), dtype=np.float64)
+        for term in set(query_terms):
+            positions = self.postings.get(term)
+            if positions is not None:
+                scores[positions] += self.weights[term]
+
+        matching = np.flatnonzero(scores)
+        if len(matching) > limit:
+            matching = matching[np.argpartition(-scores[matching], limit - 1)[:limit]]
+            matching.sort()
+        # Stable sort keeps catalog order between equal scores
+        return matching[np.argsort(-scores[matching], kind="stable")].tolist()
+
+
+def profile_query(user_request: str, user_profile: Dict[str, Any]) -> List[str]:
+    """Build query terms from a request and the user's skills and interests."""
+    parts = [user_request]
+    parts.extend(user_profile.get("skills", []))
+    parts.extend(user_profile.get("interests", []))
+    return tokenize(" ".join(str(part) for part in parts))
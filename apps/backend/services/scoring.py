@@ -0,0 +1,209 @@
+"""
+Vectorized rule-based scoring of activities against a user profile.
+
+This is the engine behind fallback suggestions, which serve users whenever
+OpenAI is slow or unavailable. The catalog is encoded once into NumPy arrays
+(category codes, difficulty levels, featured flags and sparse tag matrices),
+then a profile is scored against every activity with array operations and
+the best ones are picked with ``argpartition``. Reason strings are only built
+for the activities that are returned.
+
+Scores follow the original rules: 0.3 base, +0.3 for a shared skill, +0.2 for
+an interest matching a keyword or the category, +0.1 for a difficulty that
+suits the experience level and +0.1 for featured activities, capped at 1.0.
+Ties keep catalog order.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+
+BASE_POINTS = 3
+SKILL_POINTS = 3
+INTEREST_POINTS = 2
+EXPERIENCE_POINTS = 1
+FEATURED_POINTS = 1
+MAX_POINTS = 10  # Scores are points / 10
+
+# Difficulty range suiting each experience level, with its reason
+EXPERIENCE_LEVELS = {
+    "beginner": (1, 2, "Adapté aux débutants"),
+    "intermediate": (2, 4, "Niveau intermédiaire"),
+    "advanced": (3, 5, "Niveau avancé"),
+}
+
+
+@dataclass(frozen=True)
+class TagMatrix:
+    """
+    Sparse activity x tag incidence matrix in compressed sparse column form.
+
+    The activities having tag ``j`` are
+    ``indices[indptr[j]:indptr[j + 1]]``, so matching a handful of profile
+    tags only touches the postings of those tags.
+    """
+
+    vocabulary: Dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    @classmethod
+    def build(cls, rows: Iterable[Iterable[str]]) -> "TagMatrix":
+        """Build the matrix from the tags of each activity."""
+        postings: Dict[str, List[int]] = {}
+        for row, tags in enumerate(rows):
+            for tag in set(tags):
+                postings.setdefault(tag, []).append(row)
+
+        vocabulary = {tag: column for column, tag in enumerate(postings)}
+        lengths = np.fromiter(map(len, postings.values()), dtype=np.int64)
+        indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.fromiter(
+            (row for members in postings.values() for row in members),
+            dtype=np.int32,
+            count=int(indptr[-1]),
+        )
+        return cls(vocabulary=vocabulary, indptr=indptr, indices=indices)
+
+    def any_of(self, tags: Iterable[str], size: int) -> np.ndarray:
+        """Get a mask of the activities having at least one of the tags."""
+        mask = np.zeros(size, dtype=bool)
+        for tag in tags:
+            column = self.vocabulary.get(tag)
+            if column is not None:
+                mask[self.indices[self.indptr[column] : self.indptr[column + 1]]] = True
+        return mask
+
+
+@dataclass(frozen=True)
+class ScoringIndex:
+    """Array encoding of a catalog for profile scoring."""
+
+    activities: Sequence[Dict[str, Any]]
+    category_codes: np.ndarray
+    categories: Dict[str, int]
+    difficulty: np.ndarray
+    featured: np.ndarray
+    skills: TagMatrix
+    keywords: TagMatrix
+
+    @classmethod
+    def build(cls, activities: Sequence[Dict[str, Any]]) -> "ScoringIndex":
+        """Encode activity dictionaries into arrays."""
+        categories: Dict[str, int] = {}
+        category_codes = np.fromiter(
+            (
+                categories.setdefault(a.get("category", ""), len(categories))
+                for a in activities
+            ),
+            dtype=np.int32,
+            count=len(activities),
+        )
+        return cls(
+            activities=activities,
+            category_codes=category_codes,
+            categories=categories,
+            difficulty=np.fromiter(
+                (a.get("difficulty_level") or 1 for a in activities),
+                dtype=np.int8,
+                count=len(activities),
+            ),
+            featured=np.fromiter(
+                (bool(a.get("is_featured")) for a in activities),
+                dtype=bool,
+                count=len(activities),
+            ),
+            skills=TagMatrix.build(a.get("skill_tags") or [] for a in activities),
+            keywords=TagMatrix.build(a.get("keywords") or [] for a in activities),
+        )
+
+    def score(self, user_profile: Dict[str, Any]) -> Tuple[np.ndarray, ...]:
+        """
+        Score every activity against a profile.
+
+        Returns:
+            Points per activity (score x 10) and the masks of the matched
+            rules: skills, interests, experience level
+        """
+        size = len(self.activities)
+        skills = set(user_profile.get("skills", []))
+        interests = set(user_profile.get("interests", []))
+
+        skill_match = self.skills.any_of(skills, size)
+
+        interest_codes = [self.categories[i] for i in interests if i in self.categories]
+        interest_match = self.keywords.any_of(interests, size)
+        if interest_codes:
+            interest_match |= np.isin(self.category_codes, interest_codes)
+
+        level = EXPERIENCE_LEVELS.get(user_profile.get("experience_level", "beginner"))
+        if level:
+            low, high, _ = level
+            experience_match = (self.difficulty >= low) & (self.difficulty <= high)
+        else:
+            experience_match = np.zeros(size, dtype=bool)
+
+        points = (
+            BASE_POINTS
+            + SKILL_POINTS * skill_match
+            + INTEREST_POINTS * interest_match
+            + EXPERIENCE_POINTS * experience_match
+            + FEATURED_POINTS * self.featured
+        ).astype(np.int64)
+        np.minimum(points, MAX_POINTS, out=points)
+        return points, skill_match, interest_match, experience_match
+
+    def top(self, user_profile: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the best-scoring activities for a profile, with their reasons.
+
+        Args:
+            user_profile: User's profile information
+            limit: Maximum number of suggestions
+
+        Returns:
+            Suggestions sorted by descending score
+        """
+        size = len(self.activities)
+        limit = min(limit, size)
+        if limit <= 0:
+            return []
+
+        points, skill_match, interest_match, experience_match = self.score(user_profile)
+
+        # Unique sort keys: points first, then earlier catalog position
+        keys = points * size + (size - 1 - np.arange(size, dtype=np.int64))
+        winners = np.argpartition(-keys, limit - 1)[:limit]
+        winners = winners[np.argsort(-keys[winners])]
+
+        user_skills = set(user_profile.get("skills", []))
+        level = EXPERIENCE_LEVELS.get(user_profile.get("experience_level", "beginner"))
+
+        suggestions = []
+        for i in winners.tolist():
+            activity = self.activities[i]
+            reasons = []
+            if skill_match[i]:
+                shared = sorted(user_skills & set(activity.get("skill_tags") or []))
+                reasons.append(f"Compétences correspondantes: {', '.join(shared[:2])}")
+            if interest_match[i]:
+                reasons.append("Correspond à vos centres d'intérêt")
+            if experience_match[i]:
+                reasons.append(level[2])
+            if self.featured[i]:
+                reasons.append("Activité recommandée")
+            if not reasons:
+                reasons = ["Activité populaire"]
+
+            suggestions.append(
+                {
+                    "activity": activity,
+                    "score": int(points[i]) / MAX_POINTS,
+                    "reasons": reasons,
+                }
+            )
+
+        return suggestions
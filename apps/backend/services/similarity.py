@@ -0,0 +1,319 @@
+"""
+Precomputed top-K similar activities.
+
+Similarity combines a weighted Jaccard index over the tag arrays with
+difficulty and duration proximity. Each published activity keeps its
+``TOP_K`` nearest neighbours in the ``activity_similarities`` table, so the
+similar-activities endpoint is a single indexed lookup.
+
+The score is symmetric, which keeps writes incremental: when an activity
+changes, only its own list, the lists it appears in and the lists it now
+qualifies for are rewritten. Activities come from the catalog snapshot.
+"""
+
+import asyncio
+import heapq
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import AsyncSessionLocal
+from ..models.similarity import ActivitySimilarity
+from .catalog import get_catalog
+
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 10
+BATCH_SIZE = 500  # Activities per IN list or rebuild step
+
+# Weights sum to 1, so scores fall between 0 and 1
+TAG_WEIGHTS = {
+    "skill_tags": 0.35,
+    "keywords": 0.2,
+    "season_tags": 0.1,
+    "materials": 0.1,
+}
+DIFFICULTY_WEIGHT = 0.15
+DURATION_WEIGHT = 0.1
+MAX_DIFFICULTY_GAP = 4  # Difficulty levels range from 1 to 5
+
+Neighbours = List[Tuple[float, uuid.UUID]]  # (score, neighbour ID), best first
+
+
+@dataclass(frozen=True)
+class ActivityFeatures:
+    """The parts of an activity that similarity is computed from."""
+
+    id: uuid.UUID
+    tags: Dict[str, FrozenSet[str]]
+    difficulty_level: int
+    duration_min: int
+
+    @classmethod
+    def from_dict(cls, activity: Dict[str, Any]) -> "ActivityFeatures":
+        """Extract features from an ``Activity.to_dict()`` dictionary."""
+        return cls(
+            id=uuid.UUID(activity["id"]),
+            tags={
+                field: frozenset(tag.lower() for tag in activity[field])
+                for field in TAG_WEIGHTS
+            },
+            difficulty_level=activity["difficulty_level"] or 1,
+            duration_min=activity["duration_min"],
+        )
+
+
+def similarity(a: ActivityFeatures, b: ActivityFeatures) -> float:
+    """Score how similar two activities are, from 0 to 1."""
+    score = 0.0
+    for field, weight in TAG_WEIGHTS.items():
+        union = len(a.tags[field] | b.tags[field])
+        if union:
+            score += weight * len(a.tags[field] & b.tags[field]) / union
+
+    gap = abs(a.difficulty_level - b.difficulty_level)
+    score += DIFFICULTY_WEIGHT * max(0.0, 1 - gap / MAX_DIFFICULTY_GAP)
+
+    shortest, longest = sorted((a.duration_min, b.duration_min))
+    if longest > 0:
+        score += DURATION_WEIGHT * shortest / longest
+
+    return round(score, 6)
+
+
+def top_neighbours(
+    target: ActivityFeatures, candidates: Iterable[ActivityFeatures]
+) -> Neighbours:
+    """Find the ``TOP_K`` activities most similar to a target."""
+    return _best(
+        (similarity(target, candidate), candidate.id)
+        for candidate in candidates
+        if candidate.id != target.id
+    )
+
+
+def _best(scored: Iterable[Tuple[float, uuid.UUID]]) -> Neighbours:
+    """Keep the best ``TOP_K`` entries; ties go to the smaller ID."""
+    return heapq.nsmallest(TOP_K, scored, key=lambda entry: (-entry[0], entry[1]))
+
+
+_update_lock = asyncio.Lock()
+
+
+async def update_similarities(activity_ids: Iterable[Any]):
+    """
+    Update the neighbour lists after activities were written.
+
+    Must run after the catalog snapshot was refreshed. Activities missing
+    from the snapshot (deleted or unpublished) are removed from the index.
+
+    Args:
+        activity_ids: IDs of the created, updated or deleted activities
+    """
+    catalog = get_catalog()
+    if catalog is None:
+        return
+
+    features = {
+        uuid.UUID(a["id"]): ActivityFeatures.from_dict(a) for a in catalog.activities
+    }
+
+    async with _update_lock, AsyncSessionLocal() as session:
+        for activity_id in {uuid.UUID(str(i)) for i in activity_ids}:
+            if activity_id in features:
+                await _update_activity(session, features, features[activity_id])
+            else:
+                await _remove_activity(session, features, activity_id)
+        await session.commit()
+
+
+async def _update_activity(
+    session: AsyncSession,
+    features: Dict[uuid.UUID, ActivityFeatures],
+    target: ActivityFeatures,
+):
+    """Rewrite the lists affected by a created or updated activity."""
+    scores = {
+        other.id: similarity(target, other)
+        for other in features.values()
+        if other.id != target.id
+    }
+    await _write_lists(session, {target.id: _best((s, i) for i, s in scores.items())})
+
+    # Lists that contain the activity: its score may have dropped below
+    # activities outside the list, so they are recomputed from scratch
+    containing = await _lists_containing(session, target.id)
+    await _write_lists(
+        session,
+        {
+            owner: top_neighbours(features[owner], features.values())
+            for owner in containing
+            if owner in features
+        },
+    )
+
+    # Lists the activity may now enter: only the lists that are not full or
+    # whose lowest score it reaches are loaded and merged
+    bounds = await _list_bounds(session)
+    candidates = []
+    for owner, score in scores.items():
+        size, lowest = bounds.get(owner, (0, 0.0))
+        if owner not in containing and (size < TOP_K or score >= lowest):
+            candidates.append(owner)
+    current = await _load_lists(session, candidates)
+    merged = {}
+    for owner in candidates:
+        neighbours = current.get(owner, [])
+        if len(neighbours) < TOP_K or scores[owner] >= neighbours[-1][0]:
+            merged[owner] = _best(neighbours + [(scores[owner], target.id)])
+    await _write_lists(session, merged)
+
+
+async def _remove_activity(
+    session: AsyncSession,
+    features: Dict[uuid.UUID, ActivityFeatures],
+    activity_id: uuid.UUID,
+):
+    """Drop a deleted or unpublished activity from the index."""
+    containing = await _lists_containing(session, activity_id)
+    # Deleting the activity already removed it from other lists through the
+    # foreign key cascade: find those by their missing entries instead
+    containing |= await _incomplete_lists(session, min(TOP_K, len(features) - 1))
+    await session.execute(
+        delete(ActivitySimilarity).where(ActivitySimilarity.activity_id == activity_id)
+    )
+    await _write_lists(
+        session,
+        {
+            owner: top_neighbours(features[owner], features.values())
+            for owner in containing
+            if owner in features
+        },
+    )
+
+
+async def _lists_containing(session: AsyncSession, activity_id: uuid.UUID):
+    """Get the activities that have an activity among their neighbours."""
+    result = await session.execute(
+        select(ActivitySimilarity.activity_id).where(
+            ActivitySimilarity.neighbour_id == activity_id
+        )
+    )
+    return set(result.scalars())
+
+
+async def _incomplete_lists(session: AsyncSession, size: int):
+    """Get the activities with fewer than ``size`` neighbours."""
+    result = await session.execute(
+        select(ActivitySimilarity.activity_id)
+        .group_by(ActivitySimilarity.activity_id)
+        .having(func.count() < size)
+    )
+    return set(result.scalars())
+
+
+async def _list_bounds(session: AsyncSession) -> Dict[uuid.UUID, Tuple[int, float]]:
+    """Get the size and lowest score of every neighbour list."""
+    result = await session.execute(
+        select(
+            ActivitySimilarity.activity_id,
+            func.count(),
+            func.min(ActivitySimilarity.score),
+        ).group_by(ActivitySimilarity.activity_id)
+    )
+    return {owner: (size, lowest) for owner, size, lowest in result}
+
+
+def _batches(items: List[Any], size: int = BATCH_SIZE) -> Iterable[List[Any]]:
+    """Split items so IN lists stay under the driver's parameter limit."""
+    return (items[start : start + size] for start in range(0, len(items), size))
+
+
+async def _load_lists(
+    session: AsyncSession, activity_ids: List[uuid.UUID]
+) -> Dict[uuid.UUID, Neighbours]:
+    """Load the current neighbour lists of some activities."""
+    lists = {}
+    if not activity_ids:
+        return lists
+
+    for batch in _batches(activity_ids):
+        result = await session.execute(
+            select(
+                ActivitySimilarity.activity_id,
+                ActivitySimilarity.score,
+                ActivitySimilarity.neighbour_id,
+            )
+            .where(ActivitySimilarity.activity_id.in_(batch))
+            .order_by(ActivitySimilarity.activity_id, ActivitySimilarity.rank)
+        )
+        for owner, score, neighbour_id in result:
+            lists.setdefault(owner, []).append((score, neighbour_id))
+    return lists
+
+
+async def _write_lists(session: AsyncSession, lists: Dict[uuid.UUID, Neighbours]):
+    """Replace the neighbour lists of some activities."""
+    if not lists:
+        return
+
+    for batch in _batches(list(lists)):
+        await session.execute(
+            delete(ActivitySimilarity).where(ActivitySimilarity.activity_id.in_(batch))
+        )
+    rows = [
+        {
+            "activity_id": owner,
+            "neighbour_id": neighbour_id,
+            "score": score,
+            "rank": rank,
+        }
+        for owner, neighbours in lists.items()
+        for rank, (score, neighbour_id) in enumerate(neighbours, start=1)
+    ]
+    if rows:
+        await session.execute(insert(ActivitySimilarity), rows)
+
+
+def _score_batch(
+    targets: List[ActivityFeatures], features: List[ActivityFeatures]
+) -> Dict[uuid.UUID, Neighbours]:
+    """Compute the neighbour lists of some activities."""
+    return {target.id: top_neighbours(target, features) for target in targets}
+
+
+async def rebuild_similarities():
+    """Recompute every neighbour list from the current catalog snapshot."""
+    catalog = get_catalog()
+    if catalog is None:
+        return
+
+    features = [ActivityFeatures.from_dict(a) for a in catalog.activities]
+    async with _update_lock, AsyncSessionLocal() as session:
+        await session.execute(delete(ActivitySimilarity))
+        for batch in _batches(features):
+            # Scoring is CPU-bound and quadratic: run it off the event loop
+            lists = await asyncio.to_thread(_score_batch, batch, features)
+            await _write_lists(session, lists)
+        await session.commit()
+
+    logger.info(f"Similarity index rebuilt ({len(features)} activities)")
+
+
+async def ensure_similarities():
+    """Build the similarity index if it is empty, e.g. after the migration."""
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(func.count()).select_from(ActivitySimilarity)
+            )
+            if result.scalar():
+                return
+        await rebuild_similarities()
+    except Exception as e:
+        logger.warning(f"Similarity index build failed: {e}")
@@ -0,0 +1,215 @@
+"""
+Cache of OpenAI activity suggestions.
+
+Suggestion requests from users with the same skills, interests, experience
+level and location asking the same thing get the same answer for a given
+catalog, so model responses are kept under a hash of every input of the
+prompt: the normalized profile fields and request text, the catalog digest,
+and the model and prompt budget settings. Entries live in
+an in-process LRU and, when ``SUGGESTION_CACHE_PATH`` is set, in a SQLite
+file shared by the workers of a host. Both tiers expire entries after a TTL
+and are cleared after catalog writes; workers that only see a write through
+their periodic refresh get a new digest, so their old entries are never
+served again and age out of the LRU.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from ..monitoring.metrics import SUGGESTION_CACHE_EVENTS, SUGGESTION_CACHE_HIT_RATIO
+
+
+logger = logging.getLogger(__name__)
+
+Suggestions = List[Dict[str, Any]]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize free text so trivially different requests share a key."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip(" .!?")
+
+
+def suggestion_key(
+    user_profile: Dict[str, Any],
+    user_request: str,
+    max_suggestions: int,
+    catalog_version: str,
+) -> str:
+    """
+    Build the cache key of a suggestion request.
+
+    Args:
+        user_profile: User's profile information
+        user_request: User's specific request
+        max_suggestions: Maximum number of suggestions requested
+        catalog_version: Digest of the catalog the suggestions come from
+
+    Returns:
+        Hex digest identifying the request
+    """
+    normalized = {
+        "skills": sorted({normalize_text(s) for s in user_profile.get("skills", [])}),
+        "interests": sorted(
+            {normalize_text(i) for i in user_profile.get("interests", [])}
+        ),
+        "experience_level": user_profile.get("experience_level", "beginner"),
+        "location": normalize_text(user_profile.get("location") or ""),
+        "request": normalize_text(user_request),
+        "max_suggestions": max_suggestions,
+        "catalog": catalog_version,
+        # Settings that change the prompt or the model answering it
+        "model": settings.OPENAI_MODEL,
+        "prompt_token_budget": settings.OPENAI_PROMPT_TOKEN_BUDGET,
+    }
+    encoded = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class SuggestionCache:
+    """Two-tier TTL cache of suggestion lists."""
+
+    def __init__(self, ttl: float, max_entries: int, path: Optional[str] = None):
+        """
+        Args:
+            ttl: Seconds an entry is served
+            max_entries: Entries kept in memory before the least recently
+                used ones are evicted
+            path: SQLite file of the disk tier, disabled when None
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[str, Tuple[float, Suggestions]]" = OrderedDict()
+        self._hits = 0
+        self._lookups = 0
+        self._schema_ready = False
+
+    async def get(self, key: str) -> Optional[Suggestions]:
+        """Get cached suggestions, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, suggestions = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(key)
+                self._record("memory_hit")
+                return suggestions
+            del self._entries[key]
+
+        if self.path is not None:
+            try:
+                row = await asyncio.to_thread(self._disk_get, key)
+            except sqlite3.Error as e:
+                logger.warning(f"Suggestion cache read failed: {e}")
+                row = None
+            if row is not None:
+                expires_at, suggestions = row
+                self._remember(key, expires_at, suggestions)
+                self._record("disk_hit")
+                return suggestions
+
+        self._record("miss")
+        return None
+
+    async def set(self, key: str, suggestions: Suggestions):
+        """Store suggestions in both tiers."""
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, suggestions)
+
+        if self.path is not None:
+            try:
+                await asyncio.to_thread(self._disk_set, key, expires_at, suggestions)
+            except sqlite3.Error as e:
+                logger.warning(f"Suggestion cache write failed: {e}")
+
+    async def clear(self):
+        """Drop every entry, e.g. after the catalog changed."""
+        self._entries.clear()
+
+        if self.path is not None:
+            try:
+                await asyncio.to_thread(self._disk_clear)
+            except sqlite3.Error as e:
+                logger.warning(f"Suggestion cache clear failed: {e}")
+
+    def _remember(self, key: str, expires_at: float, suggestions: Suggestions):
+        self._entries[key] = (expires_at, suggestions)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _record(self, result: str):
+        self._lookups += 1
+        if result != "miss":
+            self._hits += 1
+        SUGGESTION_CACHE_EVENTS.labels(result=result).inc()
+        SUGGESTION_CACHE_HIT_RATIO.set(self._hits / self._lookups)
+
+    # Disk tier, run in worker threads: one short-lived connection per call
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5)
+        if not self._schema_ready:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS suggestions ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, body TEXT NOT NULL)"
+            )
+            connection.commit()
+            self._schema_ready = True
+        return connection
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, Suggestions]]:
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT expires_at, body FROM suggestions "
+                "WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _disk_set(self, key: str, expires_at: float, suggestions: Suggestions):
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO suggestions (key, expires_at, body) "
+                    "VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(suggestions, default=str)),
+                )
+                # Keep the file bounded by dropping expired entries
+                connection.execute(
+                    "DELETE FROM suggestions WHERE expires_at <= ?", (time.time(),)
+                )
+        finally:
+            connection.close()
+
+    def _disk_clear(self):
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM suggestions")
+        finally:
+            connection.close()
+
+
+suggestion_cache = SuggestionCache(
+    ttl=settings.SUGGESTION_CACHE_TTL_SECONDS,
+    max_entries=settings.SUGGESTION_CACHE_MAX_ENTRIES,
+    path=settings.SUGGESTION_CACHE_PATH,
+)
@@ -64,9 +64,9 @@ echo ""
 echo "✅ Setup complete!"
 echo ""
 echo "To start the development server:"
-echo "  cd apps/backend"
-echo "  source venv/bin/activate"
-echo "  uvicorn main:app --reload --host 0.0.0.0 --port 8000"
+echo "  cd apps"
+echo "  source backend/venv/bin/activate"
+echo "  PYTHONPATH=backend uvicorn backend.main:app --reload --host 0.0.0.0 --port 8000"
 echo ""
 echo "API Documentation will be available at:"
 echo "  http://localhost:8000/docs"
@@ -9,7 +9,11 @@ import os
 from httpx import AsyncClient
 
 # Add the backend directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+# The API modules use package-relative imports: make them importable as
+# the "backend" package
+sys.path.insert(1, os.path.dirname(BACKEND_DIR))
 
 from app_simple import app
 
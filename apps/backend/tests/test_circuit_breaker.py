@@ -0,0 +1,148 @@
+"""
+Tests for the circuit breaker.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.monitoring.metrics import CIRCUIT_BREAKER_STATE
+from backend.services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    STATE_VALUES,
+)
+
+
+def _breaker(name, open_seconds=60.0):
+    return CircuitBreaker(
+        name,
+        window=4,
+        min_calls=4,
+        error_rate=0.5,
+        slow_call_seconds=1.0,
+        slow_call_rate=0.5,
+        open_seconds=open_seconds,
+    )
+
+
+def _gauge(name):
+    return CIRCUIT_BREAKER_STATE.labels(circuit=name)._value.get()
+
+
+def _trip(breaker):
+    for _ in range(4):
+        breaker.record(False, 0.1, breaker.before_call())
+
+
+def _cool_down(breaker):
+    breaker._opened_at -= breaker.open_seconds
+
+
+def test_stays_closed_below_min_calls_and_rates():
+    breaker = _breaker("closed")
+    for _ in range(3):
+        breaker.record(False, 0.1, breaker.before_call())
+
+    # Three failures, but fewer calls than the window needs
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker = _breaker("closed")
+    breaker.record(False, 0.1, breaker.before_call())
+    for _ in range(3):
+        breaker.record(True, 0.1, breaker.before_call())
+
+    # One failure in a window of four: below the error rate
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_opens_on_error_rate_and_rejects_calls():
+    breaker = _breaker("errors")
+    _trip(breaker)
+
+    assert breaker.state == CircuitState.OPEN
+    assert _gauge("errors") == STATE_VALUES[CircuitState.OPEN]
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_opens_on_slow_call_rate():
+    breaker = _breaker("slow")
+    for _ in range(4):
+        breaker.record(True, 2.0, breaker.before_call())
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_half_open_lets_a_single_probe_through():
+    breaker = _breaker("probe")
+    _trip(breaker)
+    _cool_down(breaker)
+
+    probe = breaker.before_call()
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert probe is not None
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_healthy_probe_closes_and_failed_probe_reopens():
+    breaker = _breaker("settle")
+    _trip(breaker)
+    _cool_down(breaker)
+    breaker.record(False, 0.1, breaker.before_call())
+
+    assert breaker.state == CircuitState.OPEN
+
+    _cool_down(breaker)
+    breaker.record(True, 0.1, breaker.before_call())
+
+    assert breaker.state == CircuitState.CLOSED
+    assert _gauge("settle") == STATE_VALUES[CircuitState.CLOSED]
+
+
+def test_only_the_probe_holder_settles_half_open():
+    breaker = _breaker("holder")
+    stale = breaker.before_call()
+    _trip(breaker)
+    _cool_down(breaker)
+    probe = breaker.before_call()
+
+    # A call reserved before the circuit opened finishes during the probe
+    breaker.record(True, 0.1, stale)
+    breaker.release(stale)
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.release(probe)
+
+    assert breaker.before_call() is not None
+
+
+@pytest.mark.asyncio
+async def test_gauge_follows_the_cool_down_without_reads():
+    breaker = _breaker("timer", open_seconds=0.01)
+    _trip(breaker)
+
+    assert _gauge("timer") == STATE_VALUES[CircuitState.OPEN]
+
+    await asyncio.sleep(0.05)
+
+    assert _gauge("timer") == STATE_VALUES[CircuitState.HALF_OPEN]
+
+
+def test_status_reports_rates():
+    breaker = _breaker("status")
+    breaker.record(False, 0.1, breaker.before_call())
+    breaker.record(True, 2.0, breaker.before_call())
+
+    assert breaker.status() == {
+        "state": "closed",
+        "recent_calls": 2,
+        "error_rate": 0.5,
+        "slow_call_rate": 0.5,
+    }
@@ -0,0 +1,97 @@
+"""
+Tests for keyset pagination cursors.
+"""
+
+import base64
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from backend.models.activity import Activity
+from backend.routes.activities import LISTING_SORT_KEYS
+from backend.routes.pagination import parse_cursor
+from backend.schemas.common import decode_cursor, encode_cursor
+from backend.services.catalog import UNDATED
+
+
+SORT_KEYS = (Activity.is_featured, Activity.created_at, Activity.id)
+
+CREATED_AT = datetime(2024, 3, 1, 8, 30, tzinfo=timezone.utc)
+ACTIVITY_ID = uuid.UUID("6f1c2d3e-4b5a-4c7d-8e9f-0a1b2c3d4e5f")
+
+
+def _raw_cursor(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor([True, CREATED_AT, str(ACTIVITY_ID)])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == [True, CREATED_AT.isoformat(), str(ACTIVITY_ID)]
+
+
+def test_parse_cursor_restores_sort_key_types():
+    cursor = encode_cursor([False, CREATED_AT, ACTIVITY_ID])
+
+    assert parse_cursor(cursor, SORT_KEYS) == [False, CREATED_AT, ACTIVITY_ID]
+
+
+def test_parse_cursor_keeps_null_values():
+    cursor = encode_cursor([False, None, ACTIVITY_ID])
+
+    assert parse_cursor(cursor, SORT_KEYS) == [False, None, ACTIVITY_ID]
+
+
+def test_listing_cursor_of_an_undated_activity_uses_the_sentinel():
+    # The catalog snapshot and the SQL listing both sort undated activities
+    # as UNDATED, so cursors from either path resume the same listing
+    cursor = encode_cursor([True, UNDATED, ACTIVITY_ID])
+
+    assert parse_cursor(cursor, LISTING_SORT_KEYS) == [True, UNDATED, ACTIVITY_ID]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        _raw_cursor("{not json"),
+        _raw_cursor('{"is_featured": true}'),
+    ],
+)
+def test_decode_cursor_rejects_malformed_cursors(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        # Issued for another sort order
+        encode_cursor([True, CREATED_AT]),
+        # Tampered values
+        _raw_cursor(f'[true, "yesterday", "{ACTIVITY_ID}"]'),
+        _raw_cursor(f'[true, "{CREATED_AT.isoformat()}", "not-a-uuid"]'),
+        _raw_cursor(f'[true, 12, "{ACTIVITY_ID}"]'),
+        _raw_cursor(f'[true, "2024-03-01T08:30:00", "{ACTIVITY_ID}"]'),
+        _raw_cursor(f'["yes", "{CREATED_AT.isoformat()}", "{ACTIVITY_ID}"]'),
+        _raw_cursor(f'[true, "{CREATED_AT.isoformat()}", 12]'),
+        _raw_cursor(f'[true, "{CREATED_AT.isoformat()}", null]'),
+    ],
+)
+def test_parse_cursor_rejects_invalid_cursors(cursor):
+    with pytest.raises(HTTPException) as error:
+        parse_cursor(cursor, SORT_KEYS)
+
+    assert error.value.status_code == 400
+
+
+def test_listing_cursor_rejects_a_missing_date():
+    # Listings sort on created_at coalesced to UNDATED: never NULL
+    with pytest.raises(HTTPException) as error:
+        parse_cursor(encode_cursor([True, None, ACTIVITY_ID]), LISTING_SORT_KEYS)
+
+    assert error.value.status_code == 400
@@ -0,0 +1,91 @@
+"""
+Tests for the guide routes.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from backend.routes import guide
+
+
+@pytest.fixture
+def guide_app(monkeypatch):
+    monkeypatch.setattr(guide, "ai_available", lambda: True)
+    monkeypatch.setattr(guide, "_recent_answers", {})
+    app = FastAPI()
+    app.include_router(guide.router)
+    return app
+
+
+@pytest.fixture
+async def guide_client(guide_app):
+    async with AsyncClient(app=guide_app, base_url="http://test") as ac:
+        yield ac
+
+
+async def test_health_endpoints(guide_client):
+    response = await guide_client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+    response = await guide_client.get("/guide/health")
+    assert response.status_code == 200
+    assert response.json()["circuit_state"] == guide.ai_circuit.state.value
+
+
+async def test_guide_needs_an_api_key(guide_client, monkeypatch):
+    monkeypatch.setattr(guide, "ai_available", lambda: False)
+
+    response = await guide_client.post("/guide", json={"question": "Compost ?"})
+
+    assert response.status_code == 503
+
+
+async def test_identical_questions_share_one_model_call(guide_client, monkeypatch):
+    calls = []
+
+    async def chat_completion(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.05)
+        return "Mélangez vert et brun."
+
+    monkeypatch.setattr(guide, "chat_completion", chat_completion)
+
+    responses = await asyncio.gather(
+        guide_client.post("/guide", json={"question": "Compost ?"}),
+        guide_client.post("/guide", json={"question": "  compost ? "}),
+    )
+
+    assert len(calls) == 1
+    assert [r.json()["answer"] for r in responses] == ["Mélangez vert et brun."] * 2
+    assert responses[0].json()["confidence"] == guide.AI_CONFIDENCE
+
+
+async def test_guide_falls_back_when_the_model_fails(guide_client, monkeypatch):
+    async def chat_completion(**kwargs):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(guide, "chat_completion", chat_completion)
+
+    response = await guide_client.post("/guide", json={"question": "Compost ?"})
+
+    assert response.status_code == 200
+    assert response.json()["confidence"] == guide.FALLBACK_CONFIDENCE
+    assert response.json()["sources"] == guide.FALLBACK_SOURCES
+
+
+async def test_stream_sends_deltas_then_done(guide_client, monkeypatch):
+    async def stream_chat_completion(**kwargs):
+        yield "Mélangez "
+        yield "vert et brun."
+
+    monkeypatch.setattr(guide, "stream_chat_completion", stream_chat_completion)
+
+    response = await guide_client.post("/guide/stream", json={"question": "Compost ?"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n")[0] for block in response.text.strip().split("\n\n")]
+    assert events == ["event: delta", "event: delta", "event: done"]
@@ -0,0 +1,83 @@
+"""
+Tests for ETag revalidation helpers and the simple app's cached endpoints.
+"""
+
+import pytest
+from starlette.requests import Request
+
+from backend.http_cache import etag_matches, make_etag, not_modified
+
+
+def make_request(if_none_match: str = None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_etag_depends_on_every_part():
+    assert make_etag("activities", "digest", "agri") == make_etag(
+        "activities", "digest", "agri"
+    )
+    assert make_etag("activities", "digest", "agri") != make_etag(
+        "activities", "digest", "nature"
+    )
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag("categories")
+
+    assert etag_matches(make_request(etag), etag)
+    assert etag_matches(make_request(f'"stale", W/{etag}'), etag)
+    assert etag_matches(make_request("*"), etag)
+    assert not etag_matches(make_request('"stale"'), etag)
+    assert not etag_matches(make_request(), etag)
+
+
+def test_not_modified_has_no_body():
+    response = not_modified('"abc"')
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.body == b""
+
+
+@pytest.mark.asyncio
+async def test_activities_endpoint_etag_revalidation(client):
+    """Test that an unchanged activity list is revalidated with a 304."""
+    response = await client.get("/api/v1/activities?category=agri")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+
+    response = await client.get(
+        "/api/v1/activities?category=agri", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # Another query is another representation
+    response = await client.get(
+        "/api/v1/activities?category=nature", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_activities_categories_endpoint_etag_revalidation(client):
+    """Test ETag revalidation of the categories endpoint."""
+    etag = (await client.get("/api/v1/activities/categories")).headers["etag"]
+
+    response = await client.get(
+        "/api/v1/activities/categories", headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+
+    response = await client.get(
+        "/api/v1/activities/categories", headers={"If-None-Match": '"stale"'}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["agri"] == "Agriculture"
@@ -0,0 +1,134 @@
+"""
+Tests for the in-process job queue.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.schemas.common import JobStatus
+from backend.services.job_queue import JobQueue, QueueFullError
+
+
+async def _wait_finished(queue, job):
+    for _ in range(100):
+        if queue.get(job.id).finished_at is not None:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Job did not finish")
+
+
+@pytest.mark.asyncio
+async def test_job_runs_and_keeps_its_result():
+    queue = JobQueue("test", workers=1, max_queued=5, result_ttl=60)
+    queue.start()
+    try:
+
+        async def run():
+            return ["suggestion"]
+
+        job = queue.submit("user", run)
+
+        assert job.status == JobStatus.QUEUED
+
+        await _wait_finished(queue, job)
+        finished = queue.get(job.id)
+
+        assert finished.status == JobStatus.SUCCEEDED
+        assert finished.result == ["suggestion"]
+        assert finished.owner == "user"
+        assert finished.run is None
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_its_error():
+    queue = JobQueue("test", workers=1, max_queued=5, result_ttl=60)
+    queue.start()
+    try:
+
+        async def run():
+            raise RuntimeError("model unavailable")
+
+        job = queue.submit("user", run)
+        await _wait_finished(queue, job)
+        finished = queue.get(job.id)
+
+        assert finished.status == JobStatus.FAILED
+        assert finished.error == "model unavailable"
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_stopping_the_queue_cancels_running_and_queued_jobs():
+    queue = JobQueue("test", workers=1, max_queued=5, result_ttl=60)
+    queue.start()
+    started = asyncio.Event()
+
+    async def run():
+        started.set()
+        await asyncio.sleep(60)
+
+    running = queue.submit("user", run)
+    queued = queue.submit("user", run)
+    await started.wait()
+
+    await queue.stop()
+
+    for job in (running, queued):
+        finished = queue.get(job.id)
+        assert finished.status == JobStatus.CANCELLED
+        assert finished.finished_at is not None
+        assert finished.run is None
+
+
+@pytest.mark.asyncio
+async def test_submit_fails_when_the_queue_is_full():
+    # No workers: submitted jobs stay queued
+    queue = JobQueue("test", workers=0, max_queued=2, result_ttl=60)
+
+    async def run():
+        return None
+
+    queue.submit("user", run)
+    queue.submit("user", run)
+
+    with pytest.raises(QueueFullError):
+        queue.submit("user", run)
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_expire_after_their_ttl():
+    queue = JobQueue("test", workers=1, max_queued=5, result_ttl=0.05)
+    queue.start()
+    try:
+
+        async def run():
+            return "done"
+
+        job = queue.submit("user", run)
+        await _wait_finished(queue, job)
+
+        assert queue.get(job.id) is not None
+
+        await asyncio.sleep(0.1)
+
+        assert queue.get(job.id) is None
+    finally:
+        await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_unfinished_jobs_do_not_expire():
+    queue = JobQueue("test", workers=0, max_queued=5, result_ttl=0)
+
+    async def run():
+        return None
+
+    job = queue.submit("user", run)
+    await asyncio.sleep(0.01)
+
+    assert queue.get(job.id) is job
+    assert queue.get("unknown") is None
@@ -0,0 +1,45 @@
+"""
+Tests for cached prompt fragments and token budgets.
+"""
+
+from backend.common.prompt_fragments import (
+    FragmentCache,
+    completion_budget,
+    count_tokens,
+)
+
+
+def test_fragment_is_rendered_once_per_key():
+    cache = FragmentCache(extra_tokens=2)
+    calls = []
+
+    def render():
+        calls.append(1)
+        return "Potager bio (Catégorie: agriculture)"
+
+    first = cache.get(("a", "2024-03-01"), render)
+    second = cache.get(("a", "2024-03-01"), render)
+
+    assert first == second
+    assert first[1] == count_tokens(first[0]) + 2
+    assert len(calls) == 1
+
+    # An edited activity has a new key and is formatted again
+    cache.get(("a", "2024-03-02"), render)
+    assert len(calls) == 2
+
+
+def test_least_recently_used_fragments_are_evicted():
+    cache = FragmentCache(max_entries=2)
+    cache.get("a", lambda: "a")
+    cache.get("b", lambda: "b")
+    cache.get("a", lambda: "a")
+    cache.get("c", lambda: "c")
+
+    assert cache.get("a", lambda: "again") == ("a", count_tokens("a"))
+    assert cache.get("b", lambda: "again")[0] == "again"
+
+
+def test_completion_budget_grows_with_suggestions_up_to_the_limit():
+    assert completion_budget(1, 1000, 70) < completion_budget(5, 1000, 70)
+    assert completion_budget(50, 1000, 70) == 1000
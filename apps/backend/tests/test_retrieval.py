@@ -0,0 +1,96 @@
+"""
+Tests for BM25 retrieval over the catalog.
+"""
+
+from backend.services.catalog import CatalogSnapshot
+from backend.services.retrieval import RetrievalIndex, profile_query, tokenize
+
+
+def _activity(activity_id, title, summary="", skill_tags=()):
+    return {
+        "id": activity_id,
+        "title": title,
+        "summary": summary,
+        "keywords": "",
+        "skill_tags": list(skill_tags),
+    }
+
+
+CATALOG = (
+    _activity(1, "Atelier de soudure", "Souder des pièces métalliques"),
+    _activity(2, "Potager bio", "Semer et récolter au potager", ["jardinage"]),
+    _activity(3, "Visite de la ferme", "Découvrir le potager et les animaux"),
+    _activity(4, "Traite des vaches", "Soins aux animaux", ["elevage"]),
+)
+
+
+def test_tokenize_strips_accents_case_and_stop_words():
+    assert tokenize("Élevage des Chèvres à la FERME") == ["elevage", "chevres", "ferme"]
+
+
+def test_profile_query_combines_request_skills_and_interests():
+    profile = {"skills": ["Soudure"], "interests": ["Élevage"]}
+
+    assert profile_query("Atelier", profile) == [
+        "atelier",
+        "soudure",
+        "elevage",
+    ]
+
+
+def test_search_ranks_title_and_tag_matches_first():
+    index = RetrievalIndex.build(CATALOG)
+
+    # Both mention the potager; only activity 2 has it in its title
+    assert index.search(["potager"], 10) == [1, 2]
+
+
+def test_search_adds_up_scores_of_every_term():
+    index = RetrievalIndex.build(CATALOG)
+
+    assert index.search(["potager", "animaux"], 10)[0] == 2
+
+
+def test_search_skips_unknown_terms_and_non_matches():
+    index = RetrievalIndex.build(CATALOG)
+
+    assert index.search(["apiculture"], 10) == []
+    assert index.search(["soudure", "apiculture"], 10) == [0]
+
+
+def test_search_keeps_catalog_order_between_equal_scores():
+    catalog = (_activity(1, "Potager"), _activity(2, "Potager"))
+
+    assert RetrievalIndex.build(catalog).search(["potager"], 10) == [0, 1]
+
+
+def test_search_limit_keeps_the_best_matches():
+    index = RetrievalIndex.build(CATALOG)
+
+    assert index.search(["potager", "animaux"], 1) == [2]
+
+
+def test_empty_catalog():
+    assert RetrievalIndex.build(()).search(["potager"], 5) == []
+
+
+def test_catalog_snapshot_is_built_with_its_indexes():
+    activities = [
+        dict(
+            activity,
+            id=str(activity["id"]),
+            category="agriculture",
+            keywords=[],
+            difficulty_level=2,
+            is_featured=False,
+            created_at=None,
+            updated_at=None,
+        )
+        for activity in CATALOG
+    ]
+
+    snapshot = CatalogSnapshot.build(1, activities)
+
+    assert snapshot.retrieval.activities is snapshot.activities
+    assert snapshot.scoring.activities is snapshot.activities
+    assert snapshot.retrieval.search(["potager"], 5) == [1, 2]
@@ -0,0 +1,110 @@
+"""
+Tests for rule-based activity scoring.
+"""
+
+import pytest
+
+from backend.services.scoring import ScoringIndex, TagMatrix
+
+
+def _activity(
+    activity_id,
+    category="agriculture",
+    skill_tags=(),
+    keywords=(),
+    difficulty_level=3,
+    is_featured=False,
+):
+    return {
+        "id": activity_id,
+        "category": category,
+        "skill_tags": list(skill_tags),
+        "keywords": list(keywords),
+        "difficulty_level": difficulty_level,
+        "is_featured": is_featured,
+    }
+
+
+def test_tag_matrix_matches_any_tag():
+    matrix = TagMatrix.build([["a", "b"], ["b"], [], ["c"]])
+
+    assert matrix.any_of(["b"], 4).tolist() == [True, True, False, False]
+    assert matrix.any_of(["a", "c", "z"], 4).tolist() == [True, False, False, True]
+    assert not matrix.any_of([], 4).any()
+
+
+@pytest.mark.parametrize(
+    "activity, score",
+    [
+        (_activity("base"), 0.3),
+        (_activity("skill", skill_tags=["soudure"]), 0.6),
+        (_activity("keyword", keywords=["elevage"]), 0.5),
+        (_activity("category", category="elevage"), 0.5),
+        (_activity("level", difficulty_level=1), 0.4),
+        (_activity("featured", is_featured=True), 0.4),
+    ],
+)
+def test_each_rule_adds_its_points(activity, score):
+    profile = {
+        "skills": ["soudure"],
+        "interests": ["elevage"],
+        "experience_level": "beginner",
+    }
+
+    [suggestion] = ScoringIndex.build([activity]).top(profile, 1)
+
+    assert suggestion["score"] == pytest.approx(score)
+
+
+def test_score_is_capped_at_one():
+    activity = _activity(
+        "all",
+        category="elevage",
+        skill_tags=["soudure"],
+        keywords=["elevage"],
+        difficulty_level=1,
+        is_featured=True,
+    )
+    profile = {
+        "skills": ["soudure"],
+        "interests": ["elevage"],
+        "experience_level": "beginner",
+    }
+
+    [suggestion] = ScoringIndex.build([activity]).top(profile, 1)
+
+    assert suggestion["score"] == 1.0
+    assert suggestion["reasons"] == [
+        "Compétences correspondantes: soudure",
+        "Correspond à vos centres d'intérêt",
+        "Adapté aux débutants",
+        "Activité recommandée",
+    ]
+
+
+def test_top_sorts_by_score_then_catalog_order():
+    activities = [
+        _activity("first"),
+        _activity("skilled", skill_tags=["soudure"]),
+        _activity("second"),
+        _activity("featured", is_featured=True),
+    ]
+    index = ScoringIndex.build(activities)
+
+    top = index.top({"skills": ["soudure"], "experience_level": "expert"}, 3)
+
+    assert [s["activity"]["id"] for s in top] == ["skilled", "featured", "first"]
+
+
+def test_unmatched_activity_gets_a_default_reason():
+    [suggestion] = ScoringIndex.build([_activity("plain")]).top(
+        {"experience_level": "expert"}, 1
+    )
+
+    assert suggestion["reasons"] == ["Activité populaire"]
+
+
+def test_top_handles_small_and_empty_catalogs():
+    assert ScoringIndex.build([]).top({}, 5) == []
+    assert len(ScoringIndex.build([_activity("only")]).top({}, 5)) == 1
+    assert ScoringIndex.build([_activity("only")]).top({}, 0) == []
@@ -0,0 +1,115 @@
+"""
+Tests for activity similarity scoring.
+"""
+
+import uuid
+
+import pytest
+
+from backend.services.similarity import (
+    TOP_K,
+    ActivityFeatures,
+    _batches,
+    _score_batch,
+    similarity,
+    top_neighbours,
+)
+
+
+def _activity(number, skill_tags=(), difficulty_level=2, duration_min=60, **tags):
+    return {
+        "id": str(uuid.UUID(int=number)),
+        "skill_tags": list(skill_tags),
+        "keywords": tags.get("keywords", []),
+        "season_tags": tags.get("season_tags", []),
+        "materials": tags.get("materials", []),
+        "difficulty_level": difficulty_level,
+        "duration_min": duration_min,
+    }
+
+
+def _features(*args, **kwargs):
+    return ActivityFeatures.from_dict(_activity(*args, **kwargs))
+
+
+def test_identical_activities_score_one():
+    activity = _activity(
+        1,
+        ["Jardinage"],
+        keywords=["potager"],
+        season_tags=["printemps"],
+        materials=["bêche"],
+    )
+    features = ActivityFeatures.from_dict(activity)
+
+    assert similarity(features, features) == pytest.approx(1.0)
+
+
+def test_score_is_symmetric_and_bounded():
+    a = _features(1, ["jardinage", "compost"], difficulty_level=1, duration_min=30)
+    b = _features(2, ["compost"], difficulty_level=5, duration_min=120)
+
+    assert similarity(a, b) == similarity(b, a)
+    assert 0.0 <= similarity(a, b) <= 1.0
+
+
+def test_tags_are_compared_case_insensitively():
+    a = _features(1, ["Jardinage"])
+    b = _features(2, ["jardinage"])
+
+    # Skill tags, difficulty and duration match; the other tags are empty
+    assert similarity(a, b) == pytest.approx(0.35 + 0.15 + 0.1)
+
+
+def test_difficulty_and_duration_proximity():
+    base = _features(1, difficulty_level=1, duration_min=60)
+
+    assert similarity(base, _features(2, difficulty_level=2, duration_min=60)) > (
+        similarity(base, _features(3, difficulty_level=5, duration_min=60))
+    )
+    assert similarity(base, _features(4, difficulty_level=1, duration_min=50)) > (
+        similarity(base, _features(5, difficulty_level=1, duration_min=10))
+    )
+
+
+def test_missing_difficulty_counts_as_level_one():
+    assert _features(1, difficulty_level=None).difficulty_level == 1
+
+
+def test_top_neighbours_excludes_target_and_keeps_best_first():
+    target = _features(1, ["jardinage", "compost"])
+    close = _features(2, ["jardinage", "compost"])
+    partial = _features(3, ["jardinage"])
+    far = _features(4, ["soudure"], difficulty_level=5, duration_min=600)
+
+    neighbours = top_neighbours(target, [far, target, partial, close])
+
+    assert [neighbour_id for _, neighbour_id in neighbours] == [
+        close.id,
+        partial.id,
+        far.id,
+    ]
+
+
+def test_top_neighbours_keeps_top_k_with_ties_to_smaller_id():
+    target = _features(0, ["jardinage"])
+    candidates = [_features(n, ["jardinage"]) for n in range(TOP_K + 5, 0, -1)]
+
+    neighbours = top_neighbours(target, candidates)
+
+    assert len(neighbours) == TOP_K
+    assert [neighbour_id for _, neighbour_id in neighbours] == [
+        uuid.UUID(int=n) for n in range(1, TOP_K + 1)
+    ]
+
+
+def test_rebuild_batches_cover_every_activity_once():
+    features = [_features(n, ["jardinage"], duration_min=10 * n) for n in range(1, 8)]
+
+    lists = {}
+    for batch in _batches(features, size=3):
+        assert len(batch) <= 3
+        lists.update(_score_batch(batch, features))
+
+    assert list(lists) == [f.id for f in features]
+    assert lists[features[0].id] == top_neighbours(features[0], features)
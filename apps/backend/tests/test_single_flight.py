@@ -0,0 +1,102 @@
+"""
+Tests for single-flight execution.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.common.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_computation():
+    flights = SingleFlight()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    results = await asyncio.gather(*(flights.do("key", compute) for _ in range(10)))
+
+    assert results == ["answer"] * 10
+    assert calls == 1
+    assert not flights.in_flight("key")
+
+
+@pytest.mark.asyncio
+async def test_distinct_keys_run_separately():
+    flights = SingleFlight()
+
+    async def compute(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        flights.do("a", lambda: compute(1)), flights.do("b", lambda: compute(2))
+    )
+    assert results == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_failure_propagates_to_every_caller():
+    flights = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flights.do("key", compute) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+    # The failure is not cached: the next call computes again
+    async def recover():
+        return "ok"
+
+    assert await flights.do("key", recover) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_waiters():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def compute():
+        await release.wait()
+        return "answer"
+
+    leader = asyncio.create_task(flights.do("key", compute))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(flights.do("key", compute))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    release.set()
+
+    assert await waiter == "answer"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_computation_finishes_when_every_caller_is_cancelled():
+    flights = SingleFlight()
+    finished = asyncio.Event()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        finished.set()
+        return "answer"
+
+    caller = asyncio.create_task(flights.do("key", compute))
+    await asyncio.sleep(0)
+    caller.cancel()
+
+    await asyncio.wait_for(finished.wait(), 1)
+    await asyncio.sleep(0)
+    assert not flights.in_flight("key")
@@ -0,0 +1,89 @@
+"""
+Tests for the suggestion cache.
+"""
+
+import pytest
+
+from backend.services.suggestion_cache import SuggestionCache, suggestion_key
+
+
+PROFILE = {
+    "skills": ["Jardinage", "Soudure"],
+    "interests": ["Élevage"],
+    "experience_level": "beginner",
+    "location": "Bretagne",
+}
+
+
+def test_key_ignores_case_order_and_spacing():
+    shuffled = dict(PROFILE, skills=["soudure ", "JARDINAGE"])
+
+    assert suggestion_key(
+        PROFILE, "Une activité en extérieur !", 5, "v1"
+    ) == suggestion_key(shuffled, "une  activité en extérieur", 5, "v1")
+
+
+@pytest.mark.parametrize(
+    "profile, request_text, max_suggestions, catalog",
+    [
+        (dict(PROFILE, location="Occitanie"), "dehors", 5, "v1"),
+        (dict(PROFILE, experience_level="advanced"), "dehors", 5, "v1"),
+        (dict(PROFILE, interests=["Apiculture"]), "dehors", 5, "v1"),
+        (PROFILE, "dedans", 5, "v1"),
+        (PROFILE, "dehors", 3, "v1"),
+        (PROFILE, "dehors", 5, "v2"),
+    ],
+)
+def test_key_changes_with_every_prompt_input(
+    profile, request_text, max_suggestions, catalog
+):
+    assert suggestion_key(PROFILE, "dehors", 5, "v1") != suggestion_key(
+        profile, request_text, max_suggestions, catalog
+    )
+
+
+def test_missing_location_matches_empty_location():
+    without = {k: v for k, v in PROFILE.items() if k != "location"}
+
+    assert suggestion_key(without, "dehors", 5, "v1") == suggestion_key(
+        dict(PROFILE, location=None), "dehors", 5, "v1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_round_trip_and_expiry():
+    cache = SuggestionCache(ttl=60, max_entries=10)
+    await cache.set("key", [{"id": 1}])
+
+    assert await cache.get("key") == [{"id": 1}]
+
+    expired = SuggestionCache(ttl=-1, max_entries=10)
+    await expired.set("key", [{"id": 1}])
+
+    assert await expired.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    cache = SuggestionCache(ttl=60, max_entries=2)
+    await cache.set("a", [{"id": 1}])
+    await cache.set("b", [{"id": 2}])
+    await cache.get("a")
+    await cache.set("c", [{"id": 3}])
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == [{"id": 1}]
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_is_shared_and_cleared(tmp_path):
+    path = str(tmp_path / "suggestions.sqlite")
+    writer = SuggestionCache(ttl=60, max_entries=10, path=path)
+    reader = SuggestionCache(ttl=60, max_entries=10, path=path)
+    await writer.set("key", [{"id": 1}])
+
+    assert await reader.get("key") == [{"id": 1}]
+
+    await writer.clear()
+
+    assert await SuggestionCache(ttl=60, max_entries=10, path=path).get("key") is None